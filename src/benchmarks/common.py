@@ -0,0 +1,179 @@
+"""
+Shared helpers for the benchmark scripts: serving the fake Guacamole page,
+launching a headless browser, summarising timings and storing results as JSON.
+"""
+
+from datetime import datetime, timezone
+from functools import partial
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+import json
+import logging
+import math
+import platform
+import statistics
+import subprocess
+import threading
+
+LOGGER = logging.getLogger(__name__)
+
+BENCHMARK_DIR = Path(__file__).resolve().parent
+RESULTS_DIR = BENCHMARK_DIR / "results"
+FAKE_GUACAMOLE_PAGE = "fake_guacamole.html"
+
+# Upper edges (in milliseconds) of the latency histogram buckets. The last
+# bucket collects everything slower than the largest edge.
+HISTOGRAM_EDGES_MS = (0.1, 0.25, 0.5, 1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000)
+
+# Same window size as main.py (XGA halved, plus the Chrome header)
+SCREEN_WIDTH = 1024 // 2
+SCREEN_HEIGHT = 768 // 2
+CHROME_HEADER = 139
+
+
+class _QuietHandler(SimpleHTTPRequestHandler):
+    def log_message(self, format, *args):
+        LOGGER.debug(format, *args)
+
+
+def serve_directory(directory: Path = BENCHMARK_DIR) -> tuple[ThreadingHTTPServer, str]:
+    """Serve a directory over HTTP on a free localhost port.
+
+    Returns the server (call ``shutdown()`` when done) and its base URL.
+    """
+    handler = partial(_QuietHandler, directory=str(directory))
+    server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    host, port = server.server_address
+    return server, f"http://{host}:{port}"
+
+
+def launch_driver(
+    chromedriver: str | None = None, headless: bool = True, profile: str = "default"
+):
+    """Launch Chrome with the same window geometry that main.py uses."""
+    from selenium import webdriver
+    from selenium.webdriver.chrome.service import Service
+
+    from computer_use_demo.browser_profiles import chrome_options
+
+    options = chrome_options(
+        profile,
+        window_width=SCREEN_WIDTH,
+        window_height=SCREEN_HEIGHT + CHROME_HEADER,
+        headless=headless,
+    )
+
+    # Without an explicit chromedriver, Selenium Manager resolves a local one.
+    service = Service(chromedriver) if chromedriver else Service()
+    return webdriver.Chrome(service=service, options=options)
+
+
+def summarize(samples_s: list[float]) -> dict:
+    """Summarise a list of durations (in seconds) as millisecond statistics."""
+    samples_ms = sorted(sample * 1000 for sample in samples_s)
+    if not samples_ms:
+        return {"count": 0}
+
+    return {
+        "count": len(samples_ms),
+        "mean_ms": statistics.fmean(samples_ms),
+        "min_ms": samples_ms[0],
+        "p50_ms": percentile(samples_ms, 50),
+        "p90_ms": percentile(samples_ms, 90),
+        "p99_ms": percentile(samples_ms, 99),
+        "max_ms": samples_ms[-1],
+        "histogram": histogram(samples_ms),
+    }
+
+
+def percentile(sorted_samples: list[float], pct: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    rank = max(1, math.ceil(pct / 100 * len(sorted_samples)))
+    return sorted_samples[rank - 1]
+
+
+def histogram(samples_ms: list[float]) -> dict[str, int]:
+    """Bucket samples into the fixed HISTOGRAM_EDGES_MS buckets."""
+    labels = [f"<={edge}" for edge in HISTOGRAM_EDGES_MS] + [
+        f">{HISTOGRAM_EDGES_MS[-1]}"
+    ]
+    counts = dict.fromkeys(labels, 0)
+
+    for sample in samples_ms:
+        for edge, label in zip(HISTOGRAM_EDGES_MS, labels):
+            if sample <= edge:
+                counts[label] += 1
+                break
+        else:
+            counts[labels[-1]] += 1
+
+    return counts
+
+
+def git_revision() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=BENCHMARK_DIR,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_metadata(**extra) -> dict:
+    """Describe the environment a benchmark ran in."""
+    return {
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "git_revision": git_revision(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        **extra,
+    }
+
+
+def write_results(name: str, results: dict, output: Path | None = None) -> Path:
+    """Write benchmark results as JSON and return the path written to.
+
+    By default results go to ``benchmarks/results/<name>-<revision>-<time>.json``
+    so that runs from different versions can be compared side by side.
+    """
+    if output is None:
+        revision = results.get("meta", {}).get("git_revision") or "unknown"
+        stamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        output = RESULTS_DIR / f"{name}-{revision}-{stamp}.json"
+
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(results, indent=2, sort_keys=True))
+    return output
+
+
+def compare_results(
+    current: dict, baseline: dict, metric: str = "p50_ms", threshold: float = 1.2
+) -> list[str]:
+    """Compare two result files and describe metrics that regressed.
+
+    Any nested dict that carries ``metric`` in both files is compared. A value
+    more than ``threshold`` times its baseline is reported as a regression.
+    """
+    regressions = []
+
+    def walk(current_node, baseline_node, path):
+        if not isinstance(current_node, dict) or not isinstance(baseline_node, dict):
+            return
+        if metric in current_node and metric in baseline_node:
+            before, after = baseline_node[metric], current_node[metric]
+            if before and after > before * threshold:
+                regressions.append(
+                    f"{path}: {metric} {before:.3f} -> {after:.3f} ({after / before:.2f}x)"
+                )
+        for key, value in current_node.items():
+            if key in baseline_node:
+                walk(value, baseline_node[key], f"{path}.{key}" if path else key)
+
+    walk(current, baseline, "")
+    return regressions
@@ -0,0 +1,277 @@
+"""
+Micro-benchmarks for GuacamoleExecutor against a local fake Guacamole page.
+
+The fake page (fake_guacamole.html) implements the ``window.guacClient`` surface
+used by the executor and renders input into a canvas, so neither network access
+nor a real RDP session is needed, only a local Chrome.
+
+Run from the ``src`` directory:
+
+    python -m benchmarks.executor_bench --iterations 50
+    python -m benchmarks.executor_bench --baseline benchmarks/results/<file>.json
+"""
+
+from dataclasses import asdict
+from pathlib import Path
+import argparse
+import base64
+import json
+import logging
+import sys
+import time
+
+from computer_use_demo.browser_profiles import BROWSER_PROFILES
+from computer_use_demo.executors.capture import (
+    CanvasCapture,
+    CdpScreenshotCapture,
+    ScreencastCapture,
+    WebDriverCapture,
+)
+from computer_use_demo.executors.guacamole_executor import GuacamoleExecutor
+from computer_use_demo.imaging import media_type_of
+
+from .common import (
+    FAKE_GUACAMOLE_PAGE,
+    SCREEN_HEIGHT,
+    SCREEN_WIDTH,
+    compare_results,
+    launch_driver,
+    run_metadata,
+    serve_directory,
+    summarize,
+    write_results,
+)
+
+LOGGER = logging.getLogger(__name__)
+
+TYPING_SAMPLE = "The quick brown fox jumps over the lazy dog 0123456789. "
+
+
+def action_cases(executor: GuacamoleExecutor) -> dict:
+    """The executor calls to time, keyed by the name used in the results."""
+    x, y = SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2
+    return {
+        "key": lambda: executor.key("Return"),
+        "key_combo": lambda: executor.key("ctrl+shift+t"),
+        "type_char": lambda: executor.type("a"),
+        "mouse_move": lambda: executor.mouse_move(x, y),
+        "left_click": executor.left_click,
+        "right_click": executor.right_click,
+        "middle_click": executor.middle_click,
+        "double_click": executor.double_click,
+        "left_click_drag": lambda: executor.left_click_drag(x + 10, y + 10),
+        "cursor_position": executor.cursor_position,
+        "screenshot": executor.screenshot,
+    }
+
+
+def time_call(fn, iterations: int, warmup: int) -> list[float]:
+    for _ in range(warmup):
+        fn()
+
+    samples = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    return samples
+
+
+def bench_actions(executor: GuacamoleExecutor, iterations: int, warmup: int) -> dict:
+    results = {}
+    for name, fn in action_cases(executor).items():
+        LOGGER.info(f"Timing {name}")
+        results[name] = summarize(time_call(fn, iterations, warmup))
+    return results
+
+
+def bench_typing(executor: GuacamoleExecutor, length: int) -> dict:
+    text = (TYPING_SAMPLE * (length // len(TYPING_SAMPLE) + 1))[:length]
+
+    start = time.perf_counter()
+    executor.type(text)
+    elapsed = time.perf_counter() - start
+
+    return {
+        "chars": len(text),
+        "typing_delay_ms": executor.typing_delay_ms,
+        "paste_min_length": executor.paste_min_length,
+        "adaptive_pacing": executor.adaptive_pacing,
+        "pacing": executor.pacing_stats() if executor.adaptive_pacing else None,
+        "elapsed_s": elapsed,
+        "chars_per_s": len(text) / elapsed,
+        # Per-character latency, so that compare_results can flag regressions
+        "per_char": {"p50_ms": elapsed / len(text) * 1000},
+    }
+
+
+def bench_screenshots(executor: GuacamoleExecutor, iterations: int) -> dict:
+    samples, sizes = [], []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        image = executor.screenshot()
+        samples.append(time.perf_counter() - start)
+        sizes.append(len(base64.b64decode(image)))
+
+    return {
+        "capture": summarize(samples),
+        "bytes_min": min(sizes),
+        "bytes_mean": sum(sizes) / len(sizes),
+        "bytes_max": max(sizes),
+        "base64_chars_mean": sum(sizes) / len(sizes) * 4 / 3,
+    }
+
+
+def capture_engines(driver) -> dict:
+    """The capture engines to compare, keyed by the name used in the results."""
+    return {
+        "webdriver": lambda: WebDriverCapture(driver),
+        "cdp_png": lambda: CdpScreenshotCapture(driver),
+        "cdp_jpeg": lambda: CdpScreenshotCapture(driver, format="jpeg", quality=80),
+        "canvas_png": lambda: CanvasCapture(driver),
+        "canvas_jpeg": lambda: CanvasCapture(driver, "image/jpeg", quality=0.8),
+        "screencast_jpeg": lambda: ScreencastCapture(driver, quality=80),
+    }
+
+
+def bench_capture_engines(
+    executor: GuacamoleExecutor, iterations: int, warmup: int
+) -> dict:
+    """Capture latency and image size of each engine, with the screen changing
+    between captures. A screencast capture only returns the latest pushed
+    frame, so its latency is that of reading it rather than of taking it."""
+    results = {}
+    for name, make_engine in capture_engines(executor.driver).items():
+        LOGGER.info(f"Timing the {name} capture engine")
+        engine = make_engine()
+        try:
+            samples, sizes = [], []
+            for i in range(warmup + iterations):
+                executor.type("a")
+                start = time.perf_counter()
+                image = engine.capture()
+                if i >= warmup:
+                    samples.append(time.perf_counter() - start)
+                    sizes.append(len(base64.b64decode(image)))
+        finally:
+            engine.close()
+
+        results[name] = {
+            "capture": summarize(samples),
+            "media_type": media_type_of(image),
+            "bytes_mean": sum(sizes) / len(sizes),
+        }
+    return results
+
+
+def bench_background_capture(driver, iterations: int, settle_ms: int) -> dict:
+    """Screenshots taken ``settle_ms`` after typing a character, as when the
+    model takes a while to ask for one, served by the background capturer."""
+    executor = GuacamoleExecutor(driver, background_capture=True)
+    try:
+        samples = []
+        for _ in range(iterations):
+            executor.type("a")
+            time.sleep(settle_ms / 1000)
+            start = time.perf_counter()
+            executor.screenshot()
+            samples.append(time.perf_counter() - start)
+        return {
+            "settle_ms": settle_ms,
+            "capture": summarize(samples),
+            "capturer": asdict(executor.capturer.stats),
+        }
+    finally:
+        executor.close()
+
+
+def run(args: argparse.Namespace) -> dict:
+    server, base_url = serve_directory()
+    driver = launch_driver(
+        chromedriver=args.chromedriver,
+        headless=not args.headed,
+        profile=args.browser_profile,
+    )
+
+    try:
+        driver.get(f"{base_url}/{FAKE_GUACAMOLE_PAGE}")
+        # The fake page pastes on ctrl+v, like a remote text field
+        executor = GuacamoleExecutor(driver, paste_min_length=32)
+
+        results = {
+            "meta": run_metadata(
+                benchmark="executor",
+                iterations=args.iterations,
+                browser_profile=args.browser_profile,
+                browser_version=driver.capabilities.get("browserVersion"),
+            ),
+            "actions": bench_actions(executor, args.iterations, args.warmup),
+            "screenshot": bench_screenshots(executor, args.iterations),
+            "capture_engines": bench_capture_engines(
+                executor, args.iterations, args.warmup
+            ),
+            "screenshot_background": bench_background_capture(
+                driver, args.iterations, args.settle_ms
+            ),
+            "typing": {"paste": bench_typing(executor, args.typing_chars)},
+        }
+
+        # Key presses only: paced by syncs, then with and without a fixed delay
+        executor.paste_min_length = None
+        results["typing"]["adaptive"] = bench_typing(executor, args.typing_chars)
+        executor.adaptive_pacing = False
+        results["typing"]["default_delay"] = bench_typing(executor, args.typing_chars)
+        executor.typing_delay_ms = 0
+        results["typing"]["no_delay"] = bench_typing(executor, args.typing_chars)
+        return results
+    finally:
+        driver.quit()
+        server.shutdown()
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=30)
+    parser.add_argument("--warmup", type=int, default=3)
+    parser.add_argument("--typing-chars", type=int, default=200)
+    parser.add_argument(
+        "--settle-ms",
+        type=int,
+        default=300,
+        help="Pause before background-captured screenshots",
+    )
+    parser.add_argument("--chromedriver", help="Path to a local chromedriver")
+    parser.add_argument("--headed", action="store_true", help="Show the browser")
+    parser.add_argument(
+        "--browser-profile",
+        default="default",
+        choices=BROWSER_PROFILES,
+        help="Chrome launch options (see computer_use_demo/browser_profiles.py)",
+    )
+    parser.add_argument("--output", type=Path, help="Where to write the JSON results")
+    parser.add_argument("--baseline", type=Path, help="Results file to compare with")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=1.2,
+        help="Slowdown factor reported as a regression when comparing",
+    )
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO)
+    results = run(args)
+    path = write_results("executor", results, args.output)
+    LOGGER.info(f"Results written to {path}")
+
+    if args.baseline:
+        baseline = json.loads(args.baseline.read_text())
+        regressions = compare_results(results, baseline, threshold=args.threshold)
+        for regression in regressions:
+            LOGGER.warning(f"Regression: {regression}")
+        return 1 if regressions else 0
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,154 @@
+"""
+Cold-start benchmark: how long importing each part of computer_use_demo takes.
+
+Every sample imports one module in a fresh interpreter with ``-X importtime``,
+so the numbers are what a CLI invocation or a short-lived worker pays. The
+results also list the slowest imports pulled in by each module and which heavy
+third-party packages it loads.
+
+Run from the ``src`` directory:
+
+    python -m benchmarks.import_time
+    python -m benchmarks.import_time --baseline benchmarks/results/<previous run>.json
+"""
+
+from pathlib import Path
+import argparse
+import json
+import logging
+import subprocess
+import sys
+
+from .common import (
+    BENCHMARK_DIR,
+    compare_results,
+    run_metadata,
+    summarize,
+    write_results,
+)
+
+LOGGER = logging.getLogger(__name__)
+
+DEFAULT_MODULES = (
+    "computer_use_demo.keysym_lookup",
+    "computer_use_demo.key_combo",
+    "computer_use_demo.tools",
+    "computer_use_demo.tools.computer",
+    "computer_use_demo.executors.guacamole_executor",
+    "computer_use_demo.executors.virtual_desktop_executor",
+    "computer_use_demo.usage",
+    "computer_use_demo.journal",
+    "computer_use_demo.loop",
+)
+
+HEAVY_PACKAGES = ("anthropic", "selenium", "webdriver_manager", "numpy", "PIL")
+
+
+def parse_importtime(stderr: str) -> list[tuple[str, int, int]]:
+    """Parse ``-X importtime`` output into (module, self us, cumulative us)."""
+    imports = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, module = line[len("import time:") :].split("|")
+        imports.append((module.strip(), int(self_us), int(cumulative_us)))
+    return imports
+
+
+def measure(module: str) -> list[tuple[str, int, int]]:
+    """Import ``module`` in a fresh interpreter and return its import times."""
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=BENCHMARK_DIR.parent,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return parse_importtime(completed.stderr)
+
+
+def bench_module(module: str, iterations: int, top: int) -> dict:
+    runs = []
+    for _ in range(iterations):
+        imports = measure(module)
+        total_us = next(cumulative for name, _, cumulative in imports if name == module)
+        runs.append((total_us, imports))
+
+    runs.sort(key=lambda run: run[0])
+    median_total_us, median_imports = runs[len(runs) // 2]
+    loaded = {name for name, _, _ in median_imports}
+
+    return {
+        **summarize([total_us / 1e6 for total_us, _ in runs]),
+        "modules_imported": len(median_imports),
+        "heavy_packages": [package for package in HEAVY_PACKAGES if package in loaded],
+        "slowest_self_ms": {
+            name: self_us / 1000
+            for name, self_us, _ in sorted(
+                median_imports, key=lambda entry: entry[1], reverse=True
+            )[:top]
+        },
+    }
+
+
+def bench_startup(iterations: int) -> dict:
+    """The interpreter's own startup, as a floor for the module numbers."""
+    totals = []
+    for _ in range(iterations):
+        imports = measure("sys")
+        totals.append(sum(self_us for _, self_us, _ in imports) / 1e6)
+    return summarize(totals)
+
+
+def run(args: argparse.Namespace) -> dict:
+    modules = args.modules or DEFAULT_MODULES
+    results = {
+        "meta": run_metadata(
+            benchmark="import_time", iterations=args.iterations, modules=modules
+        ),
+        "interpreter": bench_startup(args.iterations),
+        "modules": {},
+    }
+
+    for module in modules:
+        LOGGER.info(f"Measuring {module}")
+        results["modules"][module] = bench_module(module, args.iterations, args.top)
+
+    return results
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument(
+        "modules", nargs="*", help="Modules to measure (default: the main ones)"
+    )
+    parser.add_argument("--iterations", type=int, default=15)
+    parser.add_argument("--top", type=int, default=10, help="Slowest imports to list")
+    parser.add_argument("--output", type=Path, help="Where to write the JSON results")
+    parser.add_argument("--baseline", type=Path, help="Results file to compare with")
+    parser.add_argument("--threshold", type=float, default=1.2)
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO)
+
+    results = run(args)
+    path = write_results("import_time", results, args.output)
+
+    width = max(map(len, results["modules"]))
+    for module, result in results["modules"].items():
+        heavy = ", ".join(result["heavy_packages"]) or "-"
+        print(f"{module:<{width}}  {result['p50_ms']:8.1f} ms  loads: {heavy}")
+    print(f"Results written to {path}")
+
+    if args.baseline:
+        baseline = json.loads(args.baseline.read_text())
+        regressions = compare_results(results, baseline, threshold=args.threshold)
+        for regression in regressions:
+            print(f"Regression: {regression}")
+        return 1 if regressions else 0
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
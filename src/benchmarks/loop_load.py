@@ -0,0 +1,336 @@
+"""
+Load test of the agent loop against a simulated desktop and a scripted model.
+
+perform_action is driven by ScriptedAnthropicClient and VirtualDesktopExecutor,
+so the measurements cover only the loop itself: history growth, image pruning,
+message serialization and tool dispatch, without browser or network costs.
+With ``--recording``, the screens come from a Guacamole session recording
+(see RecordingReplayExecutor) instead, for realistic screen content.
+
+Run from the ``src`` directory:
+
+    python -m benchmarks.loop_load --turns 2000 --workers 4 --keep-images 3
+    python -m benchmarks.loop_load --turns 500 --profile loop.pstats
+    python -m benchmarks.loop_load --recording session.guac --dedup
+    python -m benchmarks.loop_load --recording session.guac --governor
+
+With ``--governor``, an ungoverned run of the same script is made as well, and
+the benchmark fails if any pointer action of a governed run leaves the cursor
+somewhere else than in that run.
+"""
+
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict
+from pathlib import Path
+import argparse
+import cProfile
+import json
+import logging
+import sys
+import time
+import tracemalloc
+
+from computer_use_demo.frame_archive import FrameArchive
+from computer_use_demo.loop import perform_action
+from computer_use_demo.screenshot_dedup import ScreenshotDeduplicator
+from computer_use_demo.screenshot_governor import FINE_ACTIONS, ScreenshotGovernor
+from computer_use_demo.scripted_client import ScriptedAnthropicClient, tool_use_script
+from computer_use_demo.tools import ComputerTool, ToolBox
+from computer_use_demo.usage import RunBudget, RunUsage
+from computer_use_demo.executors.recording_replay_executor import (
+    RecordingReplayExecutor,
+)
+from computer_use_demo.executors.virtual_desktop_executor import (
+    TITLE_BAR_HEIGHT,
+    VirtualDesktopExecutor,
+)
+
+from .common import compare_results, run_metadata, summarize, write_results
+
+LOGGER = logging.getLogger(__name__)
+
+
+def scripted_actions(width: int, height: int, turns: int) -> list[dict]:
+    """A repeating browse-like sequence of actions on the default desktop."""
+    address_bar = [width // 16 + 20, height // 12 + TITLE_BAR_HEIGHT + 12]
+    cycle = [
+        {"action": "mouse_move", "coordinate": address_bar},
+        {"action": "left_click"},
+        {"action": "key", "text": "ctrl+a"},
+        {"action": "type", "text": "https://example.com/search?q=benchmark"},
+        {"action": "key", "text": "Return"},
+        {"action": "screenshot"},
+    ]
+    return [cycle[turn % len(cycle)] for turn in range(turns)]
+
+
+class PointerLog:
+    """Wraps an executor to record where each pointer action leaves the cursor."""
+
+    def __init__(self, executor):
+        self.executor = executor
+        self.targets: list[tuple[str, int, int]] = []
+
+    def __getattr__(self, name: str):
+        attribute = getattr(self.executor, name)
+        if name not in FINE_ACTIONS:
+            return attribute
+
+        def logged(*args):
+            attribute(*args)
+            self.targets.append((name, *self.executor.cursor_position()))
+
+        return logged
+
+
+def run_worker(args: argparse.Namespace, worker: int) -> dict:
+    if args.recording:
+        executor = RecordingReplayExecutor(args.recording)
+        width, height = executor.width, executor.height
+    else:
+        executor = VirtualDesktopExecutor(args.width, args.height)
+        width, height = args.width, args.height
+    pointer_log = PointerLog(executor)
+    usage = RunUsage()
+    # The script's turns stand in for the budget the governor spends down
+    governor = (
+        ScreenshotGovernor(budget=RunBudget(max_turns=args.turns), usage=usage)
+        if args.governor
+        else None
+    )
+    toolbox = ToolBox(
+        ComputerTool(
+            screen_width=width,
+            screen_height=height,
+            executor=pointer_log,
+            governor=governor,
+        )
+    )
+    client = ScriptedAnthropicClient(
+        tool_use_script(scripted_actions(width, height, args.turns)),
+        latency_s=args.latency_ms / 1000,
+        throttle_probability=args.throttle_probability,
+        max_retries=args.max_retries,
+        estimate_usage=not args.no_usage,
+        seed=worker,
+    )
+
+    history: list[dict] = []
+    turn_times: list[float] = []
+    history_bytes: list[int] = []
+    serialize_times: list[float] = []
+    last_turn = time.perf_counter()
+
+    def on_new_message(message: dict):
+        nonlocal last_turn
+        history.append(message)
+        if message["role"] != "assistant":
+            return
+
+        now = time.perf_counter()
+        turn_times.append(now - last_turn)
+        last_turn = now
+
+        if len(turn_times) % args.sample_every == 0:
+            start = time.perf_counter()
+            payload = json.dumps(history)
+            serialize_times.append(time.perf_counter() - start)
+            history_bytes.append(len(payload))
+
+    deduplicator = ScreenshotDeduplicator() if args.dedup else None
+    frame_archive = (
+        FrameArchive(args.frame_archive / f"worker-{worker}")
+        if args.frame_archive
+        else None
+    )
+    start = time.perf_counter()
+    perform_action(
+        anthropic_client=client,
+        model="scripted",
+        action_description="Search for benchmark on example.com",
+        toolbox=toolbox,
+        only_n_most_recent_images=args.keep_images,
+        on_new_message_callback=on_new_message,
+        turn_delay_ms=0,
+        usage=usage,
+        screenshot_deduplicator=deduplicator,
+        frame_archive=frame_archive,
+    )
+    elapsed = time.perf_counter() - start
+    if frame_archive is not None:
+        frame_archive.close()
+    if args.recording:
+        executor.close()
+
+    return {
+        "elapsed_s": elapsed,
+        "turns": len(turn_times),
+        "turn_times": turn_times,
+        "history_bytes": history_bytes,
+        "serialize_times": serialize_times,
+        "client": client.stats,
+        "dedup": asdict(deduplicator.stats) if deduplicator else None,
+        "frame_archive": asdict(frame_archive.stats) if frame_archive else None,
+        "governor": asdict(governor.stats) if governor else None,
+        "targets": pointer_log.targets,
+    }
+
+
+def run(args: argparse.Namespace) -> dict:
+    if args.trace_memory:
+        tracemalloc.start()
+
+    start = time.perf_counter()
+    if args.workers == 1:
+        # Stay on the main thread so that --profile sees the loop
+        workers = [run_worker(args, 0)]
+    else:
+        with ThreadPoolExecutor(max_workers=args.workers) as pool:
+            workers = list(pool.map(lambda i: run_worker(args, i), range(args.workers)))
+    elapsed = time.perf_counter() - start
+
+    turns = sum(worker["turns"] for worker in workers)
+    results = {
+        "meta": run_metadata(
+            benchmark="loop_load",
+            turns_per_worker=args.turns,
+            workers=args.workers,
+            screen=[args.width, args.height],
+            keep_images=args.keep_images,
+            latency_ms=args.latency_ms,
+            throttle_probability=args.throttle_probability,
+            dedup=args.dedup,
+            governor=args.governor,
+            recording=str(args.recording) if args.recording else None,
+        ),
+        "elapsed_s": elapsed,
+        "turns": turns,
+        "turns_per_s": turns / elapsed,
+        "turn": summarize([t for worker in workers for t in worker["turn_times"]]),
+        "serialize_history": summarize(
+            [t for worker in workers for t in worker["serialize_times"]]
+        ),
+        "history_bytes": {
+            "samples_every_n_turns": args.sample_every,
+            "worker_0": workers[0]["history_bytes"],
+        },
+        "client": {
+            key: sum(worker["client"][key] for worker in workers)
+            for key in workers[0]["client"]
+        },
+    }
+    if args.frame_archive:
+        results["frame_archive"] = {
+            key: sum(worker["frame_archive"][key] for worker in workers)
+            for key in workers[0]["frame_archive"]
+        }
+    if args.dedup:
+        results["dedup"] = {
+            key: sum(worker["dedup"][key] for worker in workers)
+            for key in workers[0]["dedup"]
+        }
+
+    if args.governor:
+        stats = [worker["governor"] for worker in workers]
+        # The script is the same for every worker, so one ungoverned run is
+        # where all of them should click
+        reference = run_worker(
+            argparse.Namespace(
+                **{**vars(args), "governor": False, "frame_archive": None}
+            ),
+            0,
+        )["targets"]
+        results["governor"] = {
+            "levels": dict(sum((Counter(s["levels"]) for s in stats), Counter())),
+            **{
+                key: sum(s[key] for s in stats)
+                for key in ("kept", "bytes_in", "bytes_out")
+            },
+            "pointer_actions": sum(len(worker["targets"]) for worker in workers),
+            "targets_missed": sum(
+                sum(target != expected for target, expected in zip(targets, reference))
+                + abs(len(targets) - len(reference))
+                for targets in (worker["targets"] for worker in workers)
+            ),
+        }
+
+    if args.trace_memory:
+        current, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        results["memory"] = {"current_bytes": current, "peak_bytes": peak}
+
+    return results
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--turns", type=int, default=1000, help="Turns per worker")
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--width", type=int, default=320)
+    parser.add_argument("--height", type=int, default=240)
+    parser.add_argument("--keep-images", type=int, default=3)
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    parser.add_argument("--throttle-probability", type=float, default=0.0)
+    parser.add_argument("--max-retries", type=int, default=0)
+    parser.add_argument(
+        "--no-usage",
+        action="store_true",
+        help="Skip the scripted client's usage estimate, to isolate loop overhead",
+    )
+    parser.add_argument(
+        "--dedup", action="store_true", help="Deduplicate repeated screenshots"
+    )
+    parser.add_argument(
+        "--governor",
+        action="store_true",
+        help="Govern screenshot encoding and quality (see ScreenshotGovernor), "
+        "and check that pointer actions land as they do without it",
+    )
+    parser.add_argument(
+        "--frame-archive", type=Path, help="Archive every screenshot under here"
+    )
+    parser.add_argument(
+        "--recording",
+        type=Path,
+        help="Replay this Guacamole session recording instead of simulating a "
+        "desktop (--width and --height are then the recording's)",
+    )
+    parser.add_argument("--sample-every", type=int, default=50)
+    parser.add_argument("--trace-memory", action="store_true")
+    parser.add_argument("--profile", type=Path, help="Write cProfile stats here")
+    parser.add_argument("--output", type=Path, help="Where to write the JSON results")
+    parser.add_argument("--baseline", type=Path, help="Results file to compare with")
+    parser.add_argument("--threshold", type=float, default=1.2)
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.WARNING)
+
+    if args.profile:
+        profiler = cProfile.Profile()
+        results = profiler.runcall(run, args)
+        profiler.dump_stats(args.profile)
+    else:
+        results = run(args)
+
+    path = write_results("loop_load", results, args.output)
+    print(f"{results['turns_per_s']:.0f} turns/s, results written to {path}")
+    if args.governor and results["governor"]["targets_missed"]:
+        print(
+            f"{results['governor']['targets_missed']} pointer actions landed "
+            "elsewhere than without the governor"
+        )
+        return 1
+
+    if args.baseline:
+        baseline = json.loads(args.baseline.read_text())
+        regressions = compare_results(results, baseline, threshold=args.threshold)
+        for regression in regressions:
+            print(f"Regression: {regression}")
+        return 1 if regressions else 0
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,181 @@
+"""
+Compares the Chrome launch profiles of computer_use_demo.browser_profiles and
+picks the best one for this host.
+
+Each profile launches a fresh browser on the fake Guacamole page and is timed
+on launch, page load, the executor's actions and screenshots. The memory of
+the browser's processes is read from /proc where available. The best profile
+is the one with the lowest action and screenshot latency, or with
+``--objective memory``, the lowest memory use.
+
+Run from the ``src`` directory:
+
+    python -m benchmarks.profile_bench --iterations 20
+    python -m benchmarks.profile_bench --objective memory
+"""
+
+from pathlib import Path
+import argparse
+import json
+import logging
+import os
+import sys
+import time
+
+from computer_use_demo.browser_profiles import BROWSER_PROFILES
+from computer_use_demo.executors.guacamole_executor import GuacamoleExecutor
+
+from .common import (
+    FAKE_GUACAMOLE_PAGE,
+    compare_results,
+    launch_driver,
+    run_metadata,
+    serve_directory,
+    summarize,
+    write_results,
+)
+from .executor_bench import action_cases, bench_screenshots, time_call
+
+LOGGER = logging.getLogger(__name__)
+
+# The actions whose latency decides the best profile, besides screenshots
+SCORED_ACTIONS = ("key", "type_char", "left_click", "double_click", "mouse_move")
+
+
+def process_tree_rss(pid: int) -> int | None:
+    """Resident memory in bytes of a process and its descendants, or None
+    where /proc is not available."""
+    if not os.path.isdir("/proc"):
+        return None
+
+    children: dict[int, list[int]] = {}
+    rss_pages: dict[int, int] = {}
+    for entry in os.listdir("/proc"):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f"/proc/{entry}/stat") as stat_file:
+                stat = stat_file.read()
+            with open(f"/proc/{entry}/statm") as statm_file:
+                rss_pages[int(entry)] = int(statm_file.read().split()[1])
+        except (OSError, IndexError, ValueError):
+            continue
+        # The command name is in parentheses and may contain spaces
+        parent = int(stat.rsplit(")", 1)[1].split()[1])
+        children.setdefault(parent, []).append(int(entry))
+
+    total, pending = 0, [pid]
+    while pending:
+        current = pending.pop()
+        total += rss_pages.get(current, 0)
+        pending.extend(children.get(current, ()))
+    return total * os.sysconf("SC_PAGE_SIZE")
+
+
+def bench_profile(profile: str, base_url: str, args: argparse.Namespace) -> dict:
+    start = time.perf_counter()
+    driver = launch_driver(
+        chromedriver=args.chromedriver, headless=not args.headed, profile=profile
+    )
+    launch_s = time.perf_counter() - start
+
+    try:
+        start = time.perf_counter()
+        driver.get(f"{base_url}/{FAKE_GUACAMOLE_PAGE}")
+        load_s = time.perf_counter() - start
+
+        executor = GuacamoleExecutor(driver)
+        cases = action_cases(executor)
+        actions = {
+            name: summarize(time_call(cases[name], args.iterations, args.warmup))
+            for name in SCORED_ACTIONS
+        }
+        screenshot = bench_screenshots(executor, args.iterations)
+
+        return {
+            "launch_s": launch_s,
+            "page_load_s": load_s,
+            "actions": actions,
+            "screenshot": screenshot,
+            "rss_bytes": process_tree_rss(driver.service.process.pid),
+            "latency_score_ms": sum(action["p50_ms"] for action in actions.values())
+            + screenshot["capture"]["p50_ms"],
+        }
+    finally:
+        driver.quit()
+
+
+def best_profile(profiles: dict, objective: str) -> str:
+    if objective == "memory" and all(
+        result["rss_bytes"] is not None for result in profiles.values()
+    ):
+        return min(profiles, key=lambda name: profiles[name]["rss_bytes"])
+    return min(profiles, key=lambda name: profiles[name]["latency_score_ms"])
+
+
+def run(args: argparse.Namespace) -> dict:
+    server, base_url = serve_directory()
+    try:
+        profiles = {}
+        for profile in args.profiles or BROWSER_PROFILES:
+            LOGGER.info(f"Benchmarking the {profile} profile")
+            profiles[profile] = bench_profile(profile, base_url, args)
+    finally:
+        server.shutdown()
+
+    return {
+        "meta": run_metadata(
+            benchmark="browser_profiles",
+            iterations=args.iterations,
+            objective=args.objective,
+        ),
+        "profiles": profiles,
+        "best_profile": best_profile(profiles, args.objective),
+    }
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument(
+        "profiles",
+        nargs="*",
+        help=f"Profiles to compare (default: {', '.join(BROWSER_PROFILES)})",
+    )
+    parser.add_argument("--iterations", type=int, default=20)
+    parser.add_argument("--warmup", type=int, default=3)
+    parser.add_argument("--objective", choices=("latency", "memory"), default="latency")
+    parser.add_argument("--chromedriver", help="Path to a local chromedriver")
+    parser.add_argument("--headed", action="store_true", help="Show the browser")
+    parser.add_argument("--output", type=Path, help="Where to write the JSON results")
+    parser.add_argument("--baseline", type=Path, help="Results file to compare with")
+    parser.add_argument("--threshold", type=float, default=1.2)
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO)
+
+    results = run(args)
+    path = write_results("browser_profiles", results, args.output)
+
+    width = max(map(len, results["profiles"]))
+    for profile, result in results["profiles"].items():
+        rss = result["rss_bytes"]
+        memory = f"{rss / 1e6:7.0f} MB" if rss is not None else "      -"
+        print(
+            f"{profile:<{width}}  launch {result['launch_s']:5.2f} s  "
+            f"latency {result['latency_score_ms']:7.1f} ms  memory {memory}"
+        )
+    print(f"Best profile for {args.objective}: {results['best_profile']}")
+    print(f"Results written to {path}")
+
+    if args.baseline:
+        baseline = json.loads(args.baseline.read_text())
+        regressions = compare_results(results, baseline, threshold=args.threshold)
+        for regression in regressions:
+            print(f"Regression: {regression}")
+        return 1 if regressions else 0
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
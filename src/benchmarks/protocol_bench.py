@@ -0,0 +1,156 @@
+"""
+Throughput of computer_use_demo.guacamole_protocol's parser and encoders.
+
+The parser is fed a Guacamole session recording, or by default a synthetic
+stream shaped like one (image streams in base64 blobs, copies, fills, mouse
+and sync instructions), in chunks of each of the given sizes.
+
+Run from the ``src`` directory:
+
+    python -m benchmarks.protocol_bench
+    python -m benchmarks.protocol_bench --recording session.guac --chunk-sizes 4096 65536
+"""
+
+from pathlib import Path
+import argparse
+import base64
+import json
+import logging
+import random
+import sys
+import time
+
+from computer_use_demo.guacamole_protocol import (
+    InstructionParser,
+    encode_instruction,
+    encode_key,
+    encode_mouse,
+    encode_sync,
+)
+
+from .common import compare_results, run_metadata, summarize, write_results
+
+LOGGER = logging.getLogger(__name__)
+
+
+def synthetic_stream(frames: int, seed: int = 0) -> bytes:
+    """A stream of ``frames`` frames of typical remote desktop updates."""
+    rng = random.Random(seed)
+    instructions = [encode_instruction("size", 0, 1024, 768)]
+    for frame in range(frames):
+        x, y = rng.randrange(1024), rng.randrange(768)
+        if frame % 4 == 0:
+            # An image update of a few kilobytes, in blobs as guacd sends them
+            data = base64.b64encode(rng.randbytes(rng.randrange(512, 12288)))
+            instructions.append(encode_instruction("img", 1, 14, 0, "image/png", x, y))
+            instructions += [
+                encode_instruction("blob", 1, data[i : i + 6144].decode())
+                for i in range(0, len(data), 6144)
+            ]
+            instructions.append(encode_instruction("end", 1))
+        instructions.append(encode_instruction("copy", -1, 0, 0, 64, 64, 14, 0, x, y))
+        instructions.append(encode_instruction("rect", 0, x, y, 120, 18))
+        instructions.append(encode_instruction("cfill", 14, 0, 255, 255, 255, 255))
+        instructions.append(encode_instruction("mouse", x, y, 0, frame * 40))
+        instructions.append(encode_instruction("sync", frame * 40))
+    return b"".join(instructions)
+
+
+def bench_parse(stream: bytes, chunk_size: int, iterations: int) -> dict:
+    samples, instructions = [], 0
+    for _ in range(iterations):
+        parser = InstructionParser()
+        start = time.perf_counter()
+        instructions = 0
+        for offset in range(0, len(stream), chunk_size):
+            for _ in parser.feed(stream[offset : offset + chunk_size]):
+                instructions += 1
+        samples.append(time.perf_counter() - start)
+
+    best_s = min(samples)
+    return {
+        **summarize(samples),
+        "instructions": instructions,
+        "mb_per_s": len(stream) / best_s / 1e6,
+        "instructions_per_s": instructions / best_s,
+    }
+
+
+def bench_encode(count: int) -> dict:
+    cases = {
+        "key": lambda i: encode_key(0xFF0D, i % 2 == 0),
+        "mouse": lambda i: encode_mouse(i % 1024, i % 768, 1),
+        "sync": lambda i: encode_sync(i),
+    }
+    results = {}
+    for name, encode in cases.items():
+        start = time.perf_counter()
+        for i in range(count):
+            encode(i)
+        results[name] = {"per_s": count / (time.perf_counter() - start)}
+    return results
+
+
+def run(args: argparse.Namespace) -> dict:
+    if args.recording:
+        stream = args.recording.read_bytes()
+    else:
+        stream = synthetic_stream(args.frames)
+
+    return {
+        "meta": run_metadata(
+            benchmark="guacamole_protocol",
+            recording=str(args.recording) if args.recording else None,
+            stream_bytes=len(stream),
+            iterations=args.iterations,
+        ),
+        "parse": {
+            f"chunk_{chunk_size}": bench_parse(stream, chunk_size, args.iterations)
+            for chunk_size in args.chunk_sizes
+        },
+        "encode": bench_encode(args.encode_count),
+    }
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--recording", type=Path, help="A .guac recording to parse")
+    parser.add_argument(
+        "--frames", type=int, default=5000, help="Frames of the synthetic stream"
+    )
+    parser.add_argument(
+        "--chunk-sizes", type=int, nargs="+", default=[1024, 8192, 65536]
+    )
+    parser.add_argument("--iterations", type=int, default=5)
+    parser.add_argument("--encode-count", type=int, default=100000)
+    parser.add_argument("--output", type=Path, help="Where to write the JSON results")
+    parser.add_argument("--baseline", type=Path, help="Results file to compare with")
+    parser.add_argument("--threshold", type=float, default=1.2)
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO)
+
+    results = run(args)
+    path = write_results("guacamole_protocol", results, args.output)
+
+    for name, result in results["parse"].items():
+        print(
+            f"parse {name:<12} {result['mb_per_s']:7.1f} MB/s  "
+            f"{result['instructions_per_s'] / 1e6:5.2f} M instructions/s"
+        )
+    for name, result in results["encode"].items():
+        print(f"encode {name:<11} {result['per_s'] / 1e6:5.2f} M/s")
+    print(f"Results written to {path}")
+
+    if args.baseline:
+        baseline = json.loads(args.baseline.read_text())
+        regressions = compare_results(results, baseline, threshold=args.threshold)
+        for regression in regressions:
+            print(f"Regression: {regression}")
+        return 1 if regressions else 0
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
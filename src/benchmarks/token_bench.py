@@ -0,0 +1,280 @@
+"""
+Benchmark of provisioning Guacamole sessions with computer_use_demo.guacamole_auth.
+
+A local stand-in for Guacamole's ``/api/tokens`` decrypts and verifies each
+request the way guacamole-auth-json does, and answers after ``--latency-ms``,
+so no Guacamole server is needed. One token is minted per worker, from a
+connection template rendered for each, first cold, then again from the cache.
+``--shell`` also times what run_demo.sh does for one session: encrypt-json.sh
+and curl in subprocesses.
+
+Run from the ``src`` directory:
+
+    python -m benchmarks.token_bench --workers 200 --concurrency 32
+    python -m benchmarks.token_bench --workers 20 --shell
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qs
+import argparse
+import base64
+import hashlib
+import hmac
+import json
+import logging
+import secrets
+import shutil
+import subprocess
+import sys
+import threading
+import time
+
+import requests
+
+from computer_use_demo.guacamole_auth import (
+    NULL_IV,
+    TokenProvider,
+    load_connection,
+    sign_and_encrypt,
+)
+
+from .common import compare_results, run_metadata, summarize, write_results
+
+LOGGER = logging.getLogger(__name__)
+
+REPO_DIR = Path(__file__).resolve().parents[2]
+# The key run_demo.sh shares with the Guacamole container
+SECRET_KEY = "4c0b569e4c96df157eee1b65dd0e4d41"
+
+
+def worker_template() -> dict:
+    """connections/computer-use.json, with one user and desktop per worker."""
+    template = load_connection(REPO_DIR / "connections" / "computer-use.json")
+    template["username"] = "claude-{worker}"
+    (connection,) = template["connections"].values()
+    connection["id"] = "linux-{worker}"
+    connection["parameters"]["hostname"] = "rdesktop-{worker}"
+    template["connections"] = {"linux-{worker}": connection}
+    return template
+
+
+def decrypt_and_verify(data: str, secret_key: str) -> dict:
+    """What guacamole-auth-json does with a request, or ValueError if it would
+    reject it."""
+    from cryptography.hazmat.primitives import padding
+    from cryptography.hazmat.primitives.ciphers import Cipher, algorithms, modes
+
+    key = bytes.fromhex(secret_key)
+    decryptor = Cipher(algorithms.AES(key), modes.CBC(NULL_IV)).decryptor()
+    padded = decryptor.update(base64.b64decode(data)) + decryptor.finalize()
+    unpadder = padding.PKCS7(algorithms.AES.block_size).unpadder()
+    signed = unpadder.update(padded) + unpadder.finalize()
+
+    signature, payload = signed[:32], signed[32:]
+    if not hmac.compare_digest(signature, hmac.digest(key, payload, hashlib.sha256)):
+        raise ValueError("Bad signature")
+    connection = json.loads(payload)
+    if connection.get("expires", float("inf")) < time.time() * 1000:
+        raise ValueError("Expired")
+    return connection
+
+
+def serve_token_endpoint(
+    secret_key: str, latency_ms: float
+) -> tuple[ThreadingHTTPServer, str]:
+    """Serve a stand-in for Guacamole's token endpoint on a free localhost port.
+
+    Returns the server (call ``shutdown()`` when done) and the base URL to give
+    TokenProvider.
+    """
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_POST(self):
+            length = int(self.headers.get("Content-Length", 0))
+            form = parse_qs(self.rfile.read(length).decode())
+            time.sleep(latency_ms / 1000)
+            try:
+                connection = decrypt_and_verify(form["data"][0], secret_key)
+                status, body = 200, {
+                    "authToken": secrets.token_hex(32).upper(),
+                    "username": connection["username"],
+                    "dataSource": "json",
+                    "availableDataSources": ["json"],
+                }
+            except (KeyError, ValueError) as e:
+                status, body = 403, {"message": f"Permission denied: {e}"}
+
+            encoded = json.dumps(body).encode()
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(encoded)))
+            self.end_headers()
+            self.wfile.write(encoded)
+
+        def log_message(self, format, *args):
+            LOGGER.debug(format, *args)
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    host, port = server.server_address
+    return server, f"http://{host}:{port}/guacamole"
+
+
+def mint_all(mint, workers: int, concurrency: int) -> tuple[float, list[float]]:
+    """Call ``mint(worker)`` for every worker on ``concurrency`` threads.
+    Returns the total time and the time of each call, in seconds."""
+
+    def timed(worker: int) -> float:
+        start = time.perf_counter()
+        mint(worker)
+        return time.perf_counter() - start
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        samples = list(pool.map(timed, range(workers)))
+    return time.perf_counter() - start, samples
+
+
+def phase(total_s: float, samples: list[float]) -> dict:
+    return {
+        "total_s": total_s,
+        "sessions_per_s": len(samples) / total_s if total_s else 0.0,
+        **summarize(samples),
+    }
+
+
+def shell_mint(base_url: str) -> None:
+    """One session the way run_demo.sh provisions it."""
+    data = subprocess.run(
+        [
+            str(REPO_DIR / "encrypt-json.sh"),
+            SECRET_KEY,
+            str(REPO_DIR / "connections" / "computer-use.json"),
+        ],
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stdout
+    subprocess.run(
+        ["curl", "-s", "--data-urlencode", f"data={data}", f"{base_url}/api/tokens"],
+        capture_output=True,
+        check=True,
+    )
+
+
+def run(args: argparse.Namespace) -> dict:
+    template = worker_template()
+    server, base_url = serve_token_endpoint(SECRET_KEY, args.latency_ms)
+    try:
+        samples = []
+        for _ in range(args.iterations):
+            start = time.perf_counter()
+            sign_and_encrypt(template, SECRET_KEY)
+            samples.append(time.perf_counter() - start)
+        results = {"sign_and_encrypt": summarize(samples)}
+
+        with TokenProvider(
+            base_url, SECRET_KEY, pool_size=args.concurrency
+        ) as provider:
+
+            def mint(worker):
+                return provider.token_for_worker(template, worker)
+
+            results["pooled_cold"] = phase(
+                *mint_all(mint, args.workers, args.concurrency)
+            )
+            results["pooled_cached"] = phase(
+                *mint_all(mint, args.workers, args.concurrency)
+            )
+            results["provider"] = provider.stats.summary()
+
+        # A new connection for every token, as a fresh curl process makes
+        def unpooled_mint(worker):
+            session = requests.Session()
+            with TokenProvider(base_url, SECRET_KEY, session=session) as provider:
+                return provider.token_for_worker(template, worker)
+
+        results["unpooled"] = phase(
+            *mint_all(unpooled_mint, args.workers, args.concurrency)
+        )
+
+        if args.shell:
+            if shutil.which("openssl") and shutil.which("curl"):
+                results["shell"] = phase(
+                    *mint_all(
+                        lambda worker: shell_mint(base_url),
+                        args.workers,
+                        args.concurrency,
+                    )
+                )
+            else:
+                LOGGER.warning("openssl and curl are needed for --shell")
+    finally:
+        server.shutdown()
+
+    return {
+        "meta": run_metadata(
+            benchmark="token_provisioning",
+            workers=args.workers,
+            concurrency=args.concurrency,
+            latency_ms=args.latency_ms,
+        ),
+        "results": results,
+    }
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--workers", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument(
+        "--latency-ms",
+        type=float,
+        default=20.0,
+        help="How long the stand-in endpoint takes to answer",
+    )
+    parser.add_argument(
+        "--iterations", type=int, default=200, help="sign_and_encrypt calls to time"
+    )
+    parser.add_argument(
+        "--shell", action="store_true", help="Also time encrypt-json.sh and curl"
+    )
+    parser.add_argument("--output", type=Path, help="Where to write the JSON results")
+    parser.add_argument("--baseline", type=Path, help="Results file to compare with")
+    parser.add_argument("--threshold", type=float, default=1.2)
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO)
+
+    results = run(args)
+    path = write_results("token_provisioning", results, args.output)
+
+    for name, result in results["results"].items():
+        if isinstance(result, str):
+            print(f"{name:<16} {result}")
+        elif "sessions_per_s" in result:
+            print(
+                f"{name:<16} {result['sessions_per_s']:8.1f} sessions/s  "
+                f"p50 {result['p50_ms']:7.2f} ms  p99 {result['p99_ms']:7.2f} ms"
+            )
+        else:
+            print(f"{name:<16} p50 {result['p50_ms']:7.3f} ms")
+    print(f"Results written to {path}")
+
+    if args.baseline:
+        baseline = json.loads(args.baseline.read_text())
+        regressions = compare_results(results, baseline, threshold=args.threshold)
+        for regression in regressions:
+            print(f"Regression: {regression}")
+        return 1 if regressions else 0
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,72 @@
+"""
+Named sets of Chrome launch options for driving Guacamole.
+
+"default" is what main.py has always used: a fixed window size and headless
+mode. "latency" stops Chrome from throttling a page it considers hidden (timers,
+rendering and IPC are all throttled for headless or occluded windows, which
+delays Guacamole's canvas updates and input) and skips the GPU process, whose
+fallback to software rendering on a GPU-less host costs a slower first frame.
+"low_memory" trades some of that for a smaller footprint, for hosts running
+many browsers. Use ``python -m benchmarks.profile_bench`` to find the best one
+for a host.
+"""
+
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from selenium.webdriver.chrome.options import Options
+
+_COMMON_ARGUMENTS = (
+    "--no-first-run",
+    "--no-default-browser-check",
+    "--disable-extensions",
+    "--mute-audio",
+)
+
+BROWSER_PROFILES: dict[str, tuple[str, ...]] = {
+    "default": (),
+    "latency": _COMMON_ARGUMENTS
+    + (
+        "--disable-background-timer-throttling",
+        "--disable-backgrounding-occluded-windows",
+        "--disable-renderer-backgrounding",
+        "--disable-ipc-flooding-protection",
+        "--disable-gpu",
+    ),
+    "low_memory": _COMMON_ARGUMENTS
+    + (
+        "--disable-dev-shm-usage",
+        "--renderer-process-limit=1",
+        "--disable-site-isolation-trials",
+        "--disable-features=BackForwardCache,Translate,MediaRouter",
+        "--disk-cache-size=1048576",
+        "--js-flags=--max-old-space-size=256",
+        "--disable-gpu",
+    ),
+}
+
+
+def chrome_options(
+    profile: str = "default",
+    window_width: int | None = None,
+    window_height: int | None = None,
+    headless: bool = True,
+) -> "Options":
+    """Chrome options for a named profile from BROWSER_PROFILES."""
+    # Imported here, as Selenium is slow to import and only launching needs it
+    from selenium.webdriver.chrome.options import Options
+
+    if profile not in BROWSER_PROFILES:
+        raise ValueError(
+            f"Unknown browser profile '{profile}', "
+            f"expected one of {', '.join(BROWSER_PROFILES)}"
+        )
+
+    options = Options()
+    if window_width is not None and window_height is not None:
+        options.add_argument(f"--window-size={window_width},{window_height}")
+    if headless:
+        options.add_argument("--headless")
+    for argument in BROWSER_PROFILES[profile]:
+        options.add_argument(argument)
+    return options
@@ -0,0 +1,413 @@
+"""
+Ways of capturing the browser's view of the remote screen, and a background
+capturer that keeps recent frames so that a screenshot requested after an
+action can usually be served without waiting for a new capture.
+"""
+
+from abc import ABCMeta, abstractmethod
+from collections import deque
+from dataclasses import dataclass
+from itertools import count
+from time import monotonic
+from typing import TYPE_CHECKING, Callable, Iterator
+import json
+import logging
+import threading
+import urllib.request
+
+from ..tools.base_tool import ToolError
+
+if TYPE_CHECKING:
+    from selenium.webdriver.chrome.webdriver import WebDriver
+
+LOGGER = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class Frame:
+    # Base64-encoded image
+    image: str
+    # time.monotonic() when the capture started
+    captured_at: float
+    # Change serial of the screen when the capture started (see BackgroundCapturer)
+    serial: int
+
+
+class FrameRingBuffer:
+    """The most recent ``size`` frames, oldest first. Safe to share between threads."""
+
+    def __init__(self, size: int = 8):
+        self._frames: deque[Frame] = deque(maxlen=size)
+        self._lock = threading.Lock()
+
+    def push(self, frame: Frame) -> None:
+        with self._lock:
+            self._frames.append(frame)
+
+    def latest(self, newer_than: float = float("-inf")) -> Frame | None:
+        """The most recent frame, if it was captured after ``newer_than``."""
+        with self._lock:
+            if self._frames and self._frames[-1].captured_at > newer_than:
+                return self._frames[-1]
+        return None
+
+    def clear(self) -> None:
+        with self._lock:
+            self._frames.clear()
+
+    def __len__(self) -> int:
+        return len(self._frames)
+
+    def __iter__(self) -> Iterator[Frame]:
+        with self._lock:
+            return iter(list(self._frames))
+
+
+@dataclass
+class CaptureStats:
+    captures: int = 0
+    served: int = 0
+    missed: int = 0
+    errors: int = 0
+
+    def summary(self) -> str:
+        requests = self.served + self.missed
+        hit_rate = self.served / requests if requests else 0.0
+        return (
+            f"{self.served}/{requests} screenshots served from background frames "
+            f"({hit_rate:.0%}), {self.captures} captures, {self.errors} errors"
+        )
+
+
+class BackgroundCapturer:
+    """Keeps a ring buffer of recent frames, captured on a background thread.
+
+    ``change_serial`` returns a number that changes whenever the screen is
+    drawn to, or None if the screen's changes cannot be tracked. The thread
+    checks it every ``interval_ms`` and captures a frame only when it has
+    changed, or when there has been input since the last frame, so an idle
+    screen costs one cheap check per interval.
+
+    ``fresh_frame`` returns the latest frame if it was captured after the last
+    input and the screen has not changed since, in which case it shows exactly
+    what a new capture would. Call ``note_input`` after sending input.
+
+    ``capture`` and ``change_serial`` are called from the background thread,
+    so they must be safe to call concurrently with the executor's actions.
+    """
+
+    def __init__(
+        self,
+        capture: Callable[[], str],
+        change_serial: Callable[[], int | None],
+        buffer_size: int = 8,
+        interval_ms: int = 100,
+    ):
+        self.capture = capture
+        self.change_serial = change_serial
+        self.interval_ms = interval_ms
+        self.frames = FrameRingBuffer(buffer_size)
+        self.stats = CaptureStats()
+
+        self._last_input_at = float("-inf")
+        self._stopped = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        self._stopped.clear()
+        self._thread = threading.Thread(
+            target=self._run, name="background-capture", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stopped.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def note_input(self) -> None:
+        """Mark the frames captured so far as older than the last input."""
+        self._last_input_at = monotonic()
+
+    def fresh_frame(self, serial: int | None) -> Frame | None:
+        """The latest frame, if the screen has not changed since it was captured.
+
+        ``serial`` is the current change serial of the screen.
+        """
+        frame = self.frames.latest(newer_than=self._last_input_at)
+        if frame is None or serial is None or frame.serial != serial:
+            self.stats.missed += 1
+            return None
+        self.stats.served += 1
+        return frame
+
+    def _run(self) -> None:
+        while not self._stopped.wait(self.interval_ms / 1000):
+            try:
+                self._capture_if_changed()
+            except Exception as e:
+                self.stats.errors += 1
+                LOGGER.debug(f"Background capture failed: {e}")
+
+    def _capture_if_changed(self) -> None:
+        started = monotonic()
+        serial = self.change_serial()
+        if serial is None:
+            return  # A frame could never be known to be fresh
+
+        latest = self.frames.latest()
+        if (
+            latest is not None
+            and latest.serial == serial
+            and latest.captured_at > self._last_input_at
+        ):
+            return
+
+        self.frames.push(Frame(self.capture(), started, serial))
+        self.stats.captures += 1
+
+
+class CaptureEngine(metaclass=ABCMeta):
+    """Captures the browser's view of the remote screen."""
+
+    name: str
+
+    @abstractmethod
+    def capture(self) -> str:
+        """Capture the screen. Returns the base64-encoded image."""
+        ...
+
+    def note_input(self) -> None:
+        """Called after input is sent, for engines that keep frames of their own."""
+
+    def close(self) -> None:
+        """Release whatever the engine holds open."""
+
+
+class WebDriverCapture(CaptureEngine):
+    """WebDriver's own screenshot: a PNG of the browser viewport."""
+
+    name = "webdriver"
+
+    def __init__(self, driver: "WebDriver"):
+        self.driver = driver
+
+    def capture(self) -> str:
+        return self.driver.get_screenshot_as_base64()
+
+
+class CdpScreenshotCapture(CaptureEngine):
+    """``Page.captureScreenshot`` through the Chrome DevTools Protocol.
+
+    Captures only the Guacamole display element, with ``optimizeForSpeed``,
+    which trades compression for encoding time. ``format`` is "png", "jpeg" or
+    "webp"; ``quality`` (0-100) applies to the latter two.
+    """
+
+    name = "cdp"
+
+    def __init__(
+        self, driver: "WebDriver", format: str = "png", quality: int | None = None
+    ):
+        self.driver = driver
+        self.format = format
+        self.quality = quality
+        self._clip: dict | None = None
+
+    def capture(self) -> str:
+        params = {"format": self.format, "optimizeForSpeed": True}
+        if self.quality is not None:
+            params["quality"] = self.quality
+        clip = self.clip()
+        if clip is not None:
+            params["clip"] = clip
+        return self.driver.execute_cdp_cmd("Page.captureScreenshot", params)["data"]
+
+    def clip(self) -> dict | None:
+        """The display element's area of the page, found on the first capture."""
+        if self._clip is None:
+            rect = self.driver.execute_script(
+                "return window.__computerUseRuntime"
+                " ? window.__computerUseRuntime.displayRect() : null;"
+            )
+            if rect is not None:
+                x, y, width, height = rect
+                self._clip = {
+                    "x": x,
+                    "y": y,
+                    "width": width,
+                    "height": height,
+                    "scale": 1,
+                }
+        return self._clip
+
+
+class CanvasCapture(CaptureEngine):
+    """Exports the Guacamole display's canvas from the page.
+
+    The image has the remote computer's native resolution rather than the
+    browser window's, and is encoded by the page as ``mime_type`` (with
+    ``quality`` between 0 and 1 for JPEG and WebP).
+    """
+
+    name = "canvas"
+
+    def __init__(
+        self,
+        driver: "WebDriver",
+        mime_type: str = "image/png",
+        quality: float | None = None,
+    ):
+        self.driver = driver
+        self.mime_type = mime_type
+        self.quality = quality
+
+    def capture(self) -> str:
+        return self.driver.execute_script(
+            "return window.__computerUseRuntime.exportDisplay(arguments[0], arguments[1]);",
+            self.mime_type,
+            self.quality,
+        )
+
+
+class ScreencastCapture(CaptureEngine):
+    """Frames pushed by Chrome's ``Page.startScreencast``.
+
+    Chrome sends a frame, scaled to fit ``max_width`` by ``max_height``,
+    whenever the page is repainted. Each frame is acknowledged so that Chrome
+    keeps sending them, and only the latest is kept, so ``capture`` costs no
+    round-trip to the browser at all. A frame shows the page as of its last
+    repaint: a change that the browser has not painted yet is not in it.
+
+    After ``note_input``, ``capture`` waits up to ``fresh_frame_timeout_s`` for
+    a frame received after the input, so that a screenshot taken right after
+    an action does not show the screen from before it. Without one by then,
+    the page has not been repainted, and the latest frame is still current.
+
+    DevTools events cannot be received through WebDriver, so the engine opens
+    its own DevTools connection to the page, at the debugger address that
+    chromedriver reports.
+    """
+
+    name = "screencast"
+
+    def __init__(
+        self,
+        driver: "WebDriver",
+        format: str = "jpeg",
+        quality: int = 80,
+        max_width: int | None = None,
+        max_height: int | None = None,
+        first_frame_timeout_s: float = 2.0,
+        fresh_frame_timeout_s: float = 0.5,
+    ):
+        # Installed with Selenium, but only needed here
+        import websocket
+
+        self.first_frame_timeout_s = first_frame_timeout_s
+        self.fresh_frame_timeout_s = fresh_frame_timeout_s
+        self.frames_received = 0
+
+        self._socket = websocket.create_connection(
+            _page_websocket_url(driver), suppress_origin=True
+        )
+        self._ids = count(1)
+        self._send_lock = threading.Lock()
+        self._latest: str | None = None
+        # time.monotonic() when the latest frame and the last input arrived
+        self._latest_at = float("-inf")
+        self._input_at = float("-inf")
+        self._frame_received = threading.Condition()
+        self._first_frame = threading.Event()
+        self._receiver = threading.Thread(
+            target=self._receive, name="screencast", daemon=True
+        )
+        self._receiver.start()
+
+        params = {"format": format, "quality": quality, "everyNthFrame": 1}
+        if max_width is not None:
+            params["maxWidth"] = max_width
+        if max_height is not None:
+            params["maxHeight"] = max_height
+        self._send("Page.startScreencast", params)
+
+    def capture(self) -> str:
+        if not self._first_frame.wait(self.first_frame_timeout_s):
+            raise ToolError("No screencast frame received from the browser")
+        with self._frame_received:
+            self._frame_received.wait_for(
+                lambda: self._latest_at > self._input_at, self.fresh_frame_timeout_s
+            )
+            return self._latest
+
+    def note_input(self) -> None:
+        with self._frame_received:
+            self._input_at = monotonic()
+
+    def close(self) -> None:
+        try:
+            self._send("Page.stopScreencast", {})
+        except Exception as e:
+            LOGGER.debug(f"Could not stop the screencast: {e}")
+        self._socket.close()
+        self._receiver.join()
+
+    def _send(self, method: str, params: dict) -> None:
+        with self._send_lock:
+            message = {"id": next(self._ids), "method": method, "params": params}
+            self._socket.send(json.dumps(message))
+
+    def _receive(self) -> None:
+        import websocket
+
+        while True:
+            try:
+                message = json.loads(self._socket.recv())
+            except (websocket.WebSocketException, OSError, ValueError):
+                return  # Closed
+
+            if message.get("method") != "Page.screencastFrame":
+                continue
+            params = message["params"]
+            with self._frame_received:
+                self._latest = params["data"]
+                self._latest_at = monotonic()
+                self.frames_received += 1
+                self._frame_received.notify_all()
+            self._first_frame.set()
+            try:
+                self._send(
+                    "Page.screencastFrameAck", {"sessionId": params["sessionId"]}
+                )
+            except (websocket.WebSocketException, OSError):
+                return
+
+
+def _page_websocket_url(driver: "WebDriver") -> str:
+    """The DevTools WebSocket URL of the page the driver controls."""
+    address = driver.capabilities["goog:chromeOptions"]["debuggerAddress"]
+    with urllib.request.urlopen(f"http://{address}/json/list") as response:
+        targets = [target for target in json.load(response) if target["type"] == "page"]
+    if not targets:
+        raise ToolError("The browser has no page to capture")
+
+    # chromedriver's window handles are the DevTools target ids
+    handle = driver.current_window_handle
+    for target in targets:
+        if target["id"] == handle or handle.endswith(target["id"]):
+            return target["webSocketDebuggerUrl"]
+    return targets[0]["webSocketDebuggerUrl"]
+
+
+CAPTURE_ENGINES = {
+    engine.name: engine
+    for engine in (
+        WebDriverCapture,
+        CdpScreenshotCapture,
+        CanvasCapture,
+        ScreencastCapture,
+    )
+}
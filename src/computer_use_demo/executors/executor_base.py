@@ -2,6 +2,7 @@ from abc import ABCMeta, abstractmethod
 from typing import Tuple
 import logging
 from ..tools.base_tool import ToolError
+from ..key_combo import compile_key_combo
 
 
 LOGGER = logging.getLogger(__name__)
@@ -63,8 +64,30 @@ class ComputerUseExecutor(metaclass=ABCMeta):
         """Take a screenshot of the screen. Returns the base64-encoded image."""
         ...
 
+    def changed_regions(
+        self, reset: bool = False
+    ) -> list[tuple[int, int, int, int]] | None:
+        """The regions (x, y, width, height) of the screen that changed since the
+        last screenshot, or None if the executor cannot tell. An empty list means
+        nothing changed. With ``reset``, start tracking changes afresh."""
+        return None
+
+    def zoom(
+        self, left: float, top: float, right: float, bottom: float
+    ) -> str | None:
+        """Capture a region, given as fractions of the screen's width and height,
+        at the remote computer's native resolution. Returns the base64-encoded
+        image, or None if the executor cannot, in which case the region is
+        cropped from a screenshot.
+        """
+        return None
+
     def validate_action(
-        self, action: str, text: str, coordinate: Tuple[int, int]
+        self,
+        action: str,
+        text: str,
+        coordinate: Tuple[int, int],
+        region: list[int] | None = None,
     ) -> None:
         """Validate the action and its parameters."""
 
@@ -72,9 +95,18 @@ class ComputerUseExecutor(metaclass=ABCMeta):
             case "mouse_move" | "left_click_drag":
                 self.require_coordinate(coordinate)
                 self.require_not_text(text)
-            case "key" | "type":
+            case "key":
+                self.require_text(text)
+                self.require_not_coordinate(coordinate)
+                # Rejects unknown keys before anything is sent
+                compile_key_combo(text)
+            case "type":
                 self.require_text(text)
                 self.require_not_coordinate(coordinate)
+            case "zoom":
+                self.require_region(region)
+                self.require_not_text(text)
+                self.require_not_coordinate(coordinate)
             case (
                 "left_click"
                 | "right_click"
@@ -112,6 +144,21 @@ class ComputerUseExecutor(metaclass=ABCMeta):
         if not all(isinstance(i, int) and i >= 0 for i in coordinate):
             raise ToolError(f"{coordinate} must be a tuple of non-negative ints")
 
+    def require_region(self, region: list[int]) -> None:
+        """Raise an error if the region is not a valid [x1, y1, x2, y2] rectangle."""
+        if region is None:
+            raise ToolError("Region is required for this action.")
+
+        if not isinstance(region, list) or len(region) != 4:
+            raise ToolError(f"{region} must be a list of length 4")
+
+        if not all(isinstance(i, int) and i >= 0 for i in region):
+            raise ToolError(f"{region} must be a list of non-negative ints")
+
+        x1, y1, x2, y2 = region
+        if x1 >= x2 or y1 >= y2:
+            raise ToolError(f"{region} must have x1 < x2 and y1 < y2")
+
     def require_not_coordinate(self, coordinate: Tuple[int, int]) -> None:
         """Raise an error if the coordinate is not None."""
         if coordinate is not None:
@@ -1,15 +1,103 @@
 from .executor_base import ComputerUseExecutor
-from typing import Any, Tuple
-from selenium.webdriver.chrome.webdriver import WebDriver
+from typing import TYPE_CHECKING, Any, Tuple
 import logging
-from time import sleep
+import threading
 from enum import Enum
-from ..keysym_lookup import KEYSYM_MAP
+from functools import cache
+from pathlib import Path
+from .capture import CAPTURE_ENGINES, BackgroundCapturer, CaptureEngine
+from ..key_combo import compile_key_combo
+from ..keysym_lookup import text_to_keysyms
+from ..tools.base_tool import ToolError
+
+if TYPE_CHECKING:
+    from selenium.webdriver.chrome.webdriver import WebDriver
 
 LOGGER = logging.getLogger(__name__)
 
+RUNTIME_JS_PATH = Path(__file__).with_name("guacamole_runtime.js")
+
+# Opcodes of the programs run by guacamole_runtime.js
+OP_KEY = 0
+OP_MOUSE = 1
+OP_WAIT = 2
+OP_CURSOR = 3
+OP_CLIPBOARD = 4
+OP_PACE = 5
+OP_AWAIT_DAMAGE = 6
+
+# Ops that change what is on the remote screen
+INPUT_OPS = {OP_KEY, OP_MOUSE, OP_CLIPBOARD}
+
+# Runs a program, or returns null if the runtime is gone (the page reloaded)
+RUN_JS = """
+var done = arguments[arguments.length - 1];
+if (!window.__computerUseRuntime) return done(null);
+window.__computerUseRuntime.run(arguments[0], done);
+"""
+
+RESUME_JS = """
+var done = arguments[arguments.length - 1];
+if (!window.__computerUseRuntime) return done(null);
+window.__computerUseRuntime.resume(done);
+"""
+
+# Programs running longer than this return and are resumed in a new round-trip,
+# which keeps long typing well within the WebDriver script timeout
+ROUND_TRIP_BUDGET_MS = 5000
+
+# Pause between the two clicks of a double-click, and between the steps of a drag
+DOUBLE_CLICK_INTERVAL_MS = 30
+DRAG_STEP_MS = 50
+
+# x of a MOUSE op that keeps the cursor where it is
+CURRENT_POSITION = -1
+
+
+@cache
+def _runtime_js() -> str:
+    return RUNTIME_JS_PATH.read_text()
+
 
 class GuacamoleExecutor(ComputerUseExecutor):
+    """Controls a remote computer through the Guacamole web client in a browser.
+
+    A small runtime (guacamole_runtime.js) is injected into the page, and each
+    action is compiled into a program of key, mouse, wait and cursor ops that
+    the runtime runs in a single WebDriver round-trip.
+
+    Text is typed one key press per character, ``typing_delay_ms`` apart. With
+    ``paste_min_length`` set, text of at least that many characters is instead
+    entered by setting the remote clipboard and pressing ``paste_key``, which
+    takes the same time whatever its length. Only enable it where ``paste_key``
+    pastes (not in a terminal, where ctrl+v inserts a literal ^V) and the remote
+    clipboard may be replaced. ``paste_delay_ms`` gives the remote computer time
+    to take up the new clipboard before pasting, and the paste only succeeds if
+    the screen changes within ``paste_confirm_timeout_ms`` after it.
+
+    With ``adaptive_pacing``, typed keys are paced by the sync instructions
+    that guacd sends after each frame rather than by a fixed delay: keys are
+    sent in a window that grows while syncs arrive on time and halves when
+    they lag more than ``target_lag_ms``. ``typing_delay_ms`` is then only
+    used until the first sync arrives. See ``pacing_stats``.
+
+    With ``background_capture``, the screen is captured on a background thread
+    whenever it changes, at most every ``capture_interval_ms``, and
+    ``screenshot`` returns the latest of those frames when it is newer than the
+    last input and the screen has not changed since. This takes the capture off
+    the critical path when the screen settles before the screenshot is taken,
+    for example while the model is thinking. It needs the runtime's damage
+    tracking; without it every screenshot is captured on demand.
+
+    ``capture_engine`` chooses how screenshots are captured: "webdriver"
+    (WebDriver's screenshot of the viewport), "cdp" (``Page.captureScreenshot``
+    of the display element), "canvas" (the display's canvas, exported by the
+    page at the remote's native resolution) or "screencast" (the latest frame
+    pushed by Chrome's screencast, as JPEG). Pass a CaptureEngine from
+    capture.py to set its format and quality. Call ``close`` to stop the
+    background capturer and the engine.
+    """
+
     class KeyAction(Enum):
         KEY_DOWN = 1
         KEY_UP = 0
@@ -19,117 +107,249 @@ class GuacamoleExecutor(ComputerUseExecutor):
         MOUSE_MIDDLE = 2
         MOUSE_RIGHT = 4
 
-    def __init__(self, driver: WebDriver, typing_delay_ms=50):
+    def __init__(
+        self,
+        driver: "WebDriver",
+        typing_delay_ms=50,
+        paste_min_length: int | None = None,
+        paste_key: str = "ctrl+v",
+        paste_delay_ms: int = 100,
+        paste_confirm_timeout_ms: int = 1000,
+        adaptive_pacing: bool = True,
+        target_lag_ms: int = 100,
+        sync_timeout_ms: int = 500,
+        background_capture: bool = False,
+        frame_buffer_size: int = 8,
+        capture_interval_ms: int = 100,
+        capture_engine: str | CaptureEngine = "webdriver",
+    ):
         super().__init__(typing_delay_ms)
         self.driver = driver
+        self.paste_min_length = paste_min_length
+        self.paste_key = paste_key
+        self.paste_delay_ms = paste_delay_ms
+        self.paste_confirm_timeout_ms = paste_confirm_timeout_ms
+        self.adaptive_pacing = adaptive_pacing
+        self.target_lag_ms = target_lag_ms
+        self.sync_timeout_ms = sync_timeout_ms
+        # WebDriver commands from the background capturer and from actions
+        # must not interleave
+        self._driver_lock = threading.RLock()
 
-        # Initialize the client once
-        init_js = """
-        var injector = angular.element(document.body).injector();
-        var guacClientManager = injector.get('guacClientManager');
-        var clients = guacClientManager.getManagedClients();
-        var main = Object.values(clients)[0];
-        main.managedDisplay.display.showCursor(true);
-        window.guacClient = main.client;
-        """
-        self.driver.execute_script(init_js)
+        self._inject_runtime()
+
+        if isinstance(capture_engine, str):
+            if capture_engine not in CAPTURE_ENGINES:
+                raise ValueError(
+                    f"Unknown capture engine '{capture_engine}', "
+                    f"expected one of {', '.join(CAPTURE_ENGINES)}"
+                )
+            capture_engine = CAPTURE_ENGINES[capture_engine](driver)
+        self.capture_engine = capture_engine
+
+        self.capturer = None
+        if background_capture:
+            self.capturer = BackgroundCapturer(
+                self._capture,
+                self._damage_serial,
+                buffer_size=frame_buffer_size,
+                interval_ms=capture_interval_ms,
+            )
+            self.capturer.start()
 
     def key(self, key: str) -> None:
-        key_codes = self._key_to_codes(key)
+        self._run(self._key_ops(key))
 
-        if not key_codes:
+    def type(self, text: str) -> None:
+        if (
+            self.paste_min_length is not None
+            and len(text) >= self.paste_min_length
+            and self.paste(text)
+        ):
             return
 
-        js = ""
-
-        # Press all keys in the order they appear
-        for key_code in key_codes:
-            js += self._get_key_action_js(key_code, self.KeyAction.KEY_DOWN)
+        pace = OP_PACE if self.adaptive_pacing else OP_WAIT
+        ops = []
+        for keysym in text_to_keysyms(text):
+            ops.append((OP_KEY, self.KeyAction.KEY_DOWN.value, keysym))
+            ops.append((OP_KEY, self.KeyAction.KEY_UP.value, keysym))
+            ops.append((pace, self.typing_delay_ms))
+        self._run(ops)
 
-        # Release all keys in the reverse order
-        for key_code in reversed(key_codes):
-            js += self._get_key_action_js(key_code, self.KeyAction.KEY_UP)
+        if self.adaptive_pacing:
+            LOGGER.debug(f"Typing pace: {self.pacing_stats()}")
 
-        self.driver.execute_script(js)
+    def paste(self, text: str) -> bool:
+        """Enter text through the remote clipboard.
 
-    def type(self, text: str) -> None:
-        for char in text:
-            self.key(char)
-            sleep(self.typing_delay_ms / 1000)
+        Returns False, without sending anything, if the Guacamole client does
+        not support clipboard streams. Raises a ToolError if the screen does not
+        change after pasting, as the field may refuse paste or ``paste_key`` may
+        not paste there.
+        """
+        ops = [(OP_CLIPBOARD, text), (OP_WAIT, self.paste_delay_ms)]
+        ops += self._key_ops(self.paste_key)
+        ops.append((OP_AWAIT_DAMAGE, self.paste_confirm_timeout_ms))
+        results = self._run(ops)
+        if not results[0]:
+            LOGGER.warning("Clipboard streams are not supported, typing instead")
+            self.paste_min_length = None
+            return False
+        if results[-1] is False:
+            raise ToolError(
+                f"Pasted the text with {self.paste_key}, but the screen did not "
+                f"change within {self.paste_confirm_timeout_ms} ms; take a "
+                "screenshot to check whether it was entered"
+            )
+        return True
 
     def cursor_position(self) -> Tuple[int, int]:
-        x = self.driver.execute_script("return window.guacClient.getDisplay().cursorX;")
-        y = self.driver.execute_script("return window.guacClient.getDisplay().cursorY;")
+        x, y = self._run([(OP_CURSOR,)])[0]
         return x, y
 
     def mouse_move(self, x: int, y: int) -> None:
-        js = self._get_mouse_action_js(x, y, 0)
-        self.driver.execute_script(js)
+        self._run([(OP_MOUSE, x, y, 0)])
 
     def left_click(self) -> None:
-        no_pressed_buttons = 0
-        pressed_buttons = self.MouseButton.MOUSE_LEFT.value
-        js = self._get_mouse_action_js(*self.cursor_position(), pressed_buttons)
-        js += self._get_mouse_action_js(*self.cursor_position(), no_pressed_buttons)
-        self.driver.execute_script(js)
+        self._run(self._click_ops(self.MouseButton.MOUSE_LEFT))
 
     def left_click_drag(self, x: int, y: int) -> None:
-        no_pressed_buttons = 0
         pressed_buttons = self.MouseButton.MOUSE_LEFT.value
-        js = self._get_mouse_action_js(*self.cursor_position(), pressed_buttons)
-        js += self._get_mouse_action_js(x, y, pressed_buttons)
-        js += self._get_mouse_action_js(x, y, no_pressed_buttons)
-        self.driver.execute_script(js)
+        self._run(
+            [
+                (OP_MOUSE, CURRENT_POSITION, 0, pressed_buttons),
+                (OP_WAIT, DRAG_STEP_MS),
+                (OP_MOUSE, x, y, pressed_buttons),
+                (OP_WAIT, DRAG_STEP_MS),
+                (OP_MOUSE, x, y, 0),
+            ]
+        )
 
     def right_click(self) -> None:
-        no_pressed_buttons = 0
-        pressed_buttons = self.MouseButton.MOUSE_RIGHT.value
-        js = self._get_mouse_action_js(*self.cursor_position(), pressed_buttons)
-        js += self._get_mouse_action_js(*self.cursor_position(), no_pressed_buttons)
-        self.driver.execute_script(js)
+        self._run(self._click_ops(self.MouseButton.MOUSE_RIGHT))
 
     def middle_click(self) -> None:
-        no_pressed_buttons = 0
-        pressed_buttons = self.MouseButton.MOUSE_MIDDLE.value
-        js = self._get_mouse_action_js(*self.cursor_position(), pressed_buttons)
-        js += self._get_mouse_action_js(*self.cursor_position(), no_pressed_buttons)
-        self.driver.execute_script(js)
+        self._run(self._click_ops(self.MouseButton.MOUSE_MIDDLE))
 
     def double_click(self) -> None:
-        self.left_click()
-        self.left_click()
+        click = self._click_ops(self.MouseButton.MOUSE_LEFT)
+        self._run([*click, (OP_WAIT, DOUBLE_CLICK_INTERVAL_MS), *click])
 
     def screenshot(self) -> str:
-        return self.driver.get_screenshot_as_base64()
+        # One round-trip both starts the next changed_regions and gets the serial
+        with self._driver_lock:
+            serial = self.driver.execute_script(
+                "return window.__computerUseRuntime"
+                " ? window.__computerUseRuntime.resetDamage() : null;"
+            )
+        if self.capturer is not None:
+            frame = self.capturer.fresh_frame(serial)
+            if frame is not None:
+                return frame.image
+        return self._capture()
+
+    def changed_regions(
+        self, reset: bool = False
+    ) -> list[tuple[int, int, int, int]] | None:
+        with self._driver_lock:
+            regions = self.driver.execute_script(
+                "return window.__computerUseRuntime"
+                " ? window.__computerUseRuntime.changedRegions(arguments[0]) : null;",
+                reset,
+            )
+        return None if regions is None else [tuple(region) for region in regions]
+
+    def zoom(self, left: float, top: float, right: float, bottom: float) -> str:
+        # The display canvas has the remote's native resolution, which the
+        # browser screenshot has scaled to the window, so the runtime maps the
+        # fractions onto the canvas's own size
+        with self._driver_lock:
+            return self.driver.execute_script(
+                "return window.__computerUseRuntime.crop.apply(null, arguments);",
+                left,
+                top,
+                right,
+                bottom,
+            )
+
+    def close(self) -> None:
+        """Stop the background capturer and the capture engine. The driver is
+        left open."""
+        if self.capturer is not None:
+            self.capturer.stop()
+        self.capture_engine.close()
 
-    def _get_key_press_js(self, key_code: int) -> str:
-        result = self._get_key_action_js(key_code, self.KeyAction.KEY_DOWN)
-        result += self._get_key_action_js(key_code, self.KeyAction.KEY_UP)
-        return result
+    def pacing_stats(self) -> dict | None:
+        """Diagnostics of the adaptive pacing in the page.
 
-    def _get_key_action_js(self, key_code: int, action: KeyAction) -> str:
-        return f"window.guacClient.sendKeyEvent({action.value}, {key_code});"
+        ``window`` is the number of keys currently sent per sync, ``lagMs`` the
+        lag of the last sync, ``syncWaitMs`` the average wait for a sync, and
+        ``syncTimeouts`` how often none came within ``sync_timeout_ms``.
+        """
+        with self._driver_lock:
+            return self.driver.execute_script(
+                "return window.__computerUseRuntime"
+                " ? window.__computerUseRuntime.pacingStats() : null;"
+            )
 
-    def _get_mouse_action_js(self, x: int, y: int, pressed_button_mask: int) -> str:
-        return f"""window.guacClient.sendMouseState(
-            {{ x: {x}, y: {y},
-               left: {str(bool(pressed_button_mask & 1)).lower()},
-               middle: {str(bool(pressed_button_mask & 2)).lower()},
-               right: {str(bool(pressed_button_mask & 4)).lower()}
-            }});"""
+    def _capture(self) -> str:
+        with self._driver_lock:
+            return self.capture_engine.capture()
 
-    def _key_to_codes(self, key: str) -> list[int]:
-        keys = key.split("+")
+    def _damage_serial(self) -> int | None:
+        with self._driver_lock:
+            return self.driver.execute_script(
+                "return window.__computerUseRuntime"
+                " ? window.__computerUseRuntime.damageSerial() : null;"
+            )
 
-        result = []
+    def _inject_runtime(self) -> None:
+        with self._driver_lock:
+            self.driver.execute_script(_runtime_js())
+            self.driver.execute_script(
+                "window.__computerUseRuntime.configure(arguments[0]);",
+                {
+                    "roundTripBudgetMs": ROUND_TRIP_BUDGET_MS,
+                    "targetLagMs": self.target_lag_ms,
+                    "syncTimeoutMs": self.sync_timeout_ms,
+                },
+            )
 
-        for key in keys:
+    def _run(self, ops: list[tuple]) -> list[Any]:
+        """Run a program in the page and return the results of its ops."""
+        with self._driver_lock:
             try:
-                key_code = KEYSYM_MAP[key]
-            except KeyError:
-                LOGGER.debug(f"Key not found in KEYSYM_MAP: {key}")
-                continue
+                return self._run_program(ops)
+            finally:
+                if any(op[0] in INPUT_OPS for op in ops):
+                    self.capture_engine.note_input()
+                    if self.capturer is not None:
+                        self.capturer.note_input()
+
+    def _run_program(self, ops: list[tuple]) -> list[Any]:
+        program = [value for op in ops for value in op]
+        outcome = self.driver.execute_async_script(RUN_JS, program)
+        if outcome is None:
+            LOGGER.info("Guacamole runtime missing, injecting it again")
+            self._inject_runtime()
+            outcome = self.driver.execute_async_script(RUN_JS, program)
+
+        results = outcome["results"]
+        while outcome["pending"] and not outcome["error"]:
+            outcome = self.driver.execute_async_script(RESUME_JS)
+            if outcome is None:
+                raise ToolError("The Guacamole page reloaded while sending input")
+            results += outcome["results"]
+
+        if outcome["error"]:
+            raise ToolError(f"Failed to send input to Guacamole: {outcome['error']}")
+        return results
 
-            result.append(key_code)
+    def _key_ops(self, key: str) -> list[tuple]:
+        return [(OP_KEY, pressed, keysym) for pressed, keysym in compile_key_combo(key)]
 
-        return result
+    def _click_ops(self, button: MouseButton) -> list[tuple]:
+        return [
+            (OP_MOUSE, CURRENT_POSITION, 0, button.value),
+            (OP_MOUSE, CURRENT_POSITION, 0, 0),
+        ]
@@ -0,0 +1,487 @@
+// Injected into the Guacamole page by GuacamoleExecutor. It runs "programs":
+// flat arrays of opcodes and their arguments, so that each tool call costs one
+// round-trip and the timing between events (double-clicks, drags, typing) is
+// kept in the browser rather than across the WebDriver connection.
+//
+//   0 KEY pressed keysym        send a key event
+//   1 MOUSE x y buttons         send the mouse state; x = -1 keeps the cursor
+//                               where it is; buttons is a mask (1 left,
+//                               2 middle, 4 right)
+//   2 WAIT ms                   pause
+//   3 CURSOR                    add [x, y] of the cursor to the results
+//   4 CLIPBOARD text            set the remote clipboard and add true to the
+//                               results, or add false and stop the program if
+//                               the client has no clipboard streams
+//   5 PACE fallback_ms          pace input by the server's sync instructions
+//                               (see below), or pause fallback_ms if the
+//                               server has not sent any
+//   6 AWAIT_DAMAGE timeout_ms   wait until the display has been drawn to since
+//                               the program started, and add whether it was
+//                               within timeout_ms to the results (null if the
+//                               display cannot be tracked)
+//
+// run(ops, done) calls done({results: [...], error: null | "message",
+// pending: bool}). A program that is still running after roundTripBudgetMs
+// returns with pending set, and resume(done) continues it, so that a single
+// round-trip stays well within the WebDriver script timeout.
+//
+// crop(left, top, right, bottom) returns the base64 PNG of a region of the
+// remote display, given as fractions of its width and height, at its native
+// resolution. The display's canvas can be larger than the screen the model is
+// told about, so the region is mapped onto the canvas's own size.
+//
+// exportDisplay(mimeType, quality) returns the whole remote display, encoded
+// by the browser, and displayRect() the [x, y, width, height] of the display
+// element in the page.
+//
+// changedRegions(reset) returns the regions of the display, as [x, y, width,
+// height], drawn to since the last reset, or null when the display cannot be
+// tracked. The display's drawing operations (draw, put, copy, transfer, rect,
+// resize, layer moves and cursor moves) are wrapped to record the regions they
+// touch. Regions are merged when they overlap, and collapse into their
+// bounding box beyond MAX_DAMAGE_RECTS.
+//
+// damageSerial() returns a number that grows whenever the display is drawn
+// to, or null when the display cannot be tracked. Unlike changedRegions, it is
+// never reset, so a background capturer can tell whether a frame is current
+// without disturbing the regions reported to the executor. The display queues
+// drawing operations and carries them out when it flushes the frame that a
+// sync instruction ends, so the serial only grows once that flush completes
+// (or, for displays without flush, on the sync): a frame captured in between
+// still shows the screen from before the damage, and must not look current.
+// resetDamage() clears the changed regions and returns damageSerial(), for
+// the executor's screenshots.
+//
+// Pacing: guacd ends every frame with a sync instruction, which carries the
+// server's timestamp. Up to `window` PACE ops pass without waiting; the next
+// one waits for a sync. The window grows by one after each sync that shows no
+// lag and halves when the lag (how much later than usual syncs arrive,
+// relative to the server's clock) exceeds targetLagMs, and no input is sent
+// until the lag is back under targetLagMs. Without any sync within
+// syncTimeoutMs (the screen may simply not be changing), PACE ops fall back to
+// fixed pauses until the next sync arrives.
+(function () {
+  if (window.__computerUseRuntime) return;
+
+  var OP_KEY = 0;
+  var OP_MOUSE = 1;
+  var OP_WAIT = 2;
+  var OP_CURSOR = 3;
+  var OP_CLIPBOARD = 4;
+  var OP_PACE = 5;
+  var OP_AWAIT_DAMAGE = 6;
+
+  var DAMAGE_POLL_MS = 20;
+
+  var injector = angular.element(document.body).injector();
+  var clients = injector.get("guacClientManager").getManagedClients();
+  var main = Object.values(clients)[0];
+  main.managedDisplay.display.showCursor(true);
+
+  var client = main.client;
+  var display = client.getDisplay();
+  window.guacClient = client;
+
+  // Damage tracking
+  var MAX_DAMAGE_RECTS = 32;
+  var CURSOR_EXTENT = 32;
+  var damage = [];
+  var damageSerial = 0;
+  // Whether damage has been queued that no flush has started drawing yet
+  var unflushed = false;
+  var flushTracked = false;
+  var tracking = typeof display.getDefaultLayer === "function";
+
+  function bounds() {
+    var layer = display.getDefaultLayer();
+    return [0, 0, layer.width, layer.height];
+  }
+
+  function intersects(a, b) {
+    return a[0] <= b[0] + b[2] && b[0] <= a[0] + a[2] && a[1] <= b[1] + b[3] && b[1] <= a[1] + a[3];
+  }
+
+  function union(a, b) {
+    var x = Math.min(a[0], b[0]);
+    var y = Math.min(a[1], b[1]);
+    return [x, y, Math.max(a[0] + a[2], b[0] + b[2]) - x, Math.max(a[1] + a[3], b[1] + b[3]) - y];
+  }
+
+  function addScreenDamage(rect) {
+    var screen = bounds();
+    var x = Math.max(rect[0], 0);
+    var y = Math.max(rect[1], 0);
+    var width = Math.min(rect[0] + rect[2], screen[2]) - x;
+    var height = Math.min(rect[1] + rect[3], screen[3]) - y;
+    if (width <= 0 || height <= 0) return;
+    unflushed = true;
+
+    var merged = [x, y, width, height];
+    var i = 0;
+    while (i < damage.length) {
+      if (intersects(damage[i], merged)) {
+        merged = union(damage.splice(i, 1)[0], merged);
+        i = 0;
+      } else i++;
+    }
+    damage.push(merged);
+    if (damage.length > MAX_DAMAGE_RECTS) damage = [damage.reduce(union)];
+  }
+
+  // Adds damage in the coordinates of a layer. Buffers (off-screen layers,
+  // which have no position) are ignored.
+  function addDamage(layer, x, y, width, height) {
+    var offsetX = 0;
+    var offsetY = 0;
+    for (var current = layer; current; current = current.parent) {
+      if (typeof current.x !== "number") return;
+      offsetX += current.x;
+      offsetY += current.y;
+    }
+    addScreenDamage([x + offsetX, y + offsetY, width, height]);
+  }
+
+  function wrap(name, record) {
+    var original = display[name];
+    if (typeof original !== "function") return;
+    display[name] = function () {
+      try {
+        record.apply(null, arguments);
+      } catch (e) {
+        addScreenDamage(bounds());
+      }
+      return original.apply(this, arguments);
+    };
+  }
+
+  function wholeLayer(layer) {
+    addDamage(layer, 0, 0, layer.width, layer.height);
+  }
+
+  function wholeScreen() {
+    addScreenDamage(bounds());
+  }
+
+  function cursorDamage() {
+    addScreenDamage([
+      display.cursorX - CURSOR_EXTENT,
+      display.cursorY - CURSOR_EXTENT,
+      2 * CURSOR_EXTENT,
+      2 * CURSOR_EXTENT,
+    ]);
+  }
+
+  if (tracking) {
+    wrap("drawImage", function (layer, x, y, image) {
+      addDamage(layer, x, y, image.width, image.height);
+    });
+    ["draw", "drawBlob", "drawStream"].forEach(function (name) {
+      wrap(name, function (layer, x, y) {
+        // The size of the image is not known until it is decoded
+        addDamage(layer, x, y, layer.width - x, layer.height - y);
+      });
+    });
+    ["put", "copy", "transfer"].forEach(function (name) {
+      wrap(name, function (srcLayer, srcx, srcy, srcw, srch, dstLayer, x, y) {
+        addDamage(dstLayer, x, y, srcw, srch);
+      });
+    });
+    wrap("rect", function (layer, x, y, width, height) {
+      addDamage(layer, x, y, width, height);
+    });
+    ["arc", "curveTo", "lineTo", "fillLayer", "strokeLayer"].forEach(function (name) {
+      wrap(name, wholeLayer);
+    });
+    wrap("resize", function (layer, width, height) {
+      addDamage(layer, 0, 0, Math.max(layer.width, width), Math.max(layer.height, height));
+    });
+    ["move", "shade", "distort", "dispose"].forEach(function (name) {
+      wrap(name, wholeScreen);
+    });
+    ["moveCursor", "setCursor", "showCursor"].forEach(function (name) {
+      wrap(name, cursorDamage);
+    });
+    // moveCursor has already happened by the time the wrapper returns, so
+    // record the cursor's new position too
+    var moveCursor = display.moveCursor;
+    if (typeof moveCursor === "function")
+      display.moveCursor = function () {
+        var result = moveCursor.apply(this, arguments);
+        cursorDamage();
+        return result;
+      };
+
+    // The damage queued so far is drawn when the flush started now completes
+    var flush = display.flush;
+    if (typeof flush === "function") {
+      flushTracked = true;
+      display.flush = function (callback) {
+        var drawsDamage = unflushed;
+        unflushed = false;
+        var args = Array.prototype.slice.call(arguments);
+        args[0] = function () {
+          if (drawsDamage) damageSerial++;
+          if (typeof callback === "function") return callback.apply(this, arguments);
+        };
+        return flush.apply(this, args);
+      };
+    }
+  }
+
+  function resetDamage() {
+    if (!tracking) return null;
+    damage = [];
+    return damageSerial;
+  }
+
+  function changedRegions(reset) {
+    if (!tracking) return null;
+    var regions = damage.slice();
+    if (reset) damage = [];
+    return regions;
+  }
+
+  var settings = {
+    roundTripBudgetMs: 5000,
+    targetLagMs: 100,
+    syncTimeoutMs: 500,
+    minWindow: 1,
+    maxWindow: 64,
+  };
+
+  var pacing = {
+    window: 4,
+    inFlight: 0,
+    paced: 0,
+    syncs: 0,
+    syncing: false,
+    syncTimeouts: 0,
+    lagMs: 0,
+    syncWaitMs: 0,
+  };
+  var baseOffset = null;
+  var syncWaiters = [];
+
+  var previousOnsync = client.onsync;
+  client.onsync = function (timestamp) {
+    if (!flushTracked && unflushed) {
+      unflushed = false;
+      damageSerial++;
+    }
+    // The lowest (local time - server time) seen is the delay of an idle link
+    var offset = Date.now() - timestamp;
+    if (baseOffset === null || offset < baseOffset) baseOffset = offset;
+    pacing.lagMs = offset - baseOffset;
+    pacing.syncs++;
+    pacing.syncing = true;
+    pacing.inFlight = 0;
+
+    var waiters = syncWaiters;
+    syncWaiters = [];
+    waiters.forEach(function (waiter) {
+      waiter();
+    });
+    if (previousOnsync) return previousOnsync.apply(this, arguments);
+  };
+
+  function waitForSync(next) {
+    var started = Date.now();
+    var finished = false;
+
+    var timer = setTimeout(function () {
+      if (finished) return;
+      finished = true;
+      pacing.syncTimeouts++;
+      pacing.syncing = false;
+      pacing.window = settings.minWindow;
+      pacing.inFlight = 0;
+      next();
+    }, settings.syncTimeoutMs);
+
+    syncWaiters.push(function () {
+      if (finished) return;
+      finished = true;
+      clearTimeout(timer);
+
+      var waited = Date.now() - started;
+      pacing.syncWaitMs = pacing.syncWaitMs ? 0.8 * pacing.syncWaitMs + 0.2 * waited : waited;
+      if (pacing.lagMs > settings.targetLagMs)
+        pacing.window = Math.max(settings.minWindow, pacing.window / 2);
+      else pacing.window = Math.min(settings.maxWindow, pacing.window + 1);
+      next();
+    });
+  }
+
+  function setClipboard(text) {
+    if (!window.Guacamole || !client.createClipboardStream) return false;
+    var writer = new Guacamole.StringWriter(client.createClipboardStream("text/plain"));
+    writer.sendText(text);
+    writer.sendEnd();
+    return true;
+  }
+
+  var program = null;
+
+  function run(ops, done) {
+    program = { ops: ops, i: 0, startSerial: damageSerial };
+    resume(done);
+  }
+
+  function resume(done) {
+    var results = [];
+    var started = Date.now();
+
+    if (!program) return done({ results: results, error: "no program to resume", pending: false });
+    var ops = program.ops;
+
+    function finish(error) {
+      var pending = !error && program.i < ops.length;
+      if (!pending) program = null;
+      done({ results: results, error: error, pending: pending });
+    }
+
+    // Pauses, then continues the program in this round-trip if it has time left
+    function pause(ms) {
+      if (Date.now() - started + ms > settings.roundTripBudgetMs) {
+        program.waitMs = ms;
+        return finish(null);
+      }
+      setTimeout(step, ms);
+    }
+
+    function step() {
+      try {
+        while (program.i < ops.length) {
+          var i = program.i;
+          switch (ops[i]) {
+            case OP_KEY:
+              client.sendKeyEvent(ops[i + 1], ops[i + 2]);
+              program.i += 3;
+              break;
+            case OP_MOUSE:
+              var keep = ops[i + 1] < 0;
+              var buttons = ops[i + 3];
+              client.sendMouseState({
+                x: keep ? display.cursorX : ops[i + 1],
+                y: keep ? display.cursorY : ops[i + 2],
+                left: !!(buttons & 1),
+                middle: !!(buttons & 2),
+                right: !!(buttons & 4),
+              });
+              program.i += 4;
+              break;
+            case OP_WAIT:
+              program.i += 2;
+              if (ops[i + 1] > 0) return pause(ops[i + 1]);
+              break;
+            case OP_CURSOR:
+              results.push([display.cursorX, display.cursorY]);
+              program.i += 1;
+              break;
+            case OP_CLIPBOARD:
+              var copied = setClipboard(ops[i + 1]);
+              results.push(copied);
+              program.i = copied ? i + 2 : ops.length;
+              break;
+            case OP_AWAIT_DAMAGE:
+              // Kept in the program, so that a wait split across round-trips
+              // keeps its deadline
+              if (program.awaitDeadline === undefined) program.awaitDeadline = Date.now() + ops[i + 1];
+              var drawn = damageSerial !== program.startSerial;
+              if (tracking && !drawn && Date.now() < program.awaitDeadline) return pause(DAMAGE_POLL_MS);
+              results.push(tracking ? drawn : null);
+              program.awaitDeadline = undefined;
+              program.i += 2;
+              break;
+            case OP_PACE:
+              program.i += 2;
+              pacing.paced++;
+              pacing.inFlight++;
+              if (!pacing.syncing) {
+                if (ops[i + 1] > 0) return pause(ops[i + 1]);
+              } else if (
+                pacing.inFlight >= Math.floor(pacing.window) ||
+                pacing.lagMs > settings.targetLagMs
+              ) {
+                if (Date.now() - started + settings.syncTimeoutMs > settings.roundTripBudgetMs) {
+                  program.waitForSync = true;
+                  return finish(null);
+                }
+                return waitForSync(step);
+              }
+              break;
+            default:
+              return finish("unknown opcode " + ops[i]);
+          }
+        }
+      } catch (e) {
+        return finish(String(e));
+      }
+      finish(null);
+    }
+
+    // Carry out the pause that ended the previous round-trip
+    if (program.waitForSync) {
+      program.waitForSync = false;
+      waitForSync(step);
+    } else if (program.waitMs) {
+      setTimeout(step, program.waitMs);
+      program.waitMs = 0;
+    } else step();
+  }
+
+  function crop(left, top, right, bottom) {
+    var source = display.flatten();
+    var x1 = Math.floor(left * source.width);
+    var y1 = Math.floor(top * source.height);
+    var x2 = Math.min(Math.max(Math.round(right * source.width), x1 + 1), source.width);
+    var y2 = Math.min(Math.max(Math.round(bottom * source.height), y1 + 1), source.height);
+
+    var canvas = document.createElement("canvas");
+    canvas.width = Math.max(x2 - x1, 1);
+    canvas.height = Math.max(y2 - y1, 1);
+    canvas.getContext("2d").drawImage(source, x1, y1, canvas.width, canvas.height, 0, 0, canvas.width, canvas.height);
+    return canvas.toDataURL("image/png").split(",")[1];
+  }
+
+  function exportDisplay(mimeType, quality) {
+    var source = display.flatten();
+    return source.toDataURL(mimeType || "image/png", quality === null ? undefined : quality).split(",")[1];
+  }
+
+  function displayRect() {
+    var rect = display.getElement().getBoundingClientRect();
+    return [rect.left, rect.top, rect.width, rect.height];
+  }
+
+  function configure(options) {
+    Object.assign(settings, options);
+  }
+
+  function pacingStats() {
+    return {
+      window: pacing.window,
+      paced: pacing.paced,
+      syncs: pacing.syncs,
+      syncing: pacing.syncing,
+      syncTimeouts: pacing.syncTimeouts,
+      lagMs: pacing.lagMs,
+      syncWaitMs: pacing.syncWaitMs,
+    };
+  }
+
+  window.__computerUseRuntime = {
+    run: run,
+    resume: resume,
+    crop: crop,
+    exportDisplay: exportDisplay,
+    displayRect: displayRect,
+    changedRegions: changedRegions,
+    resetDamage: resetDamage,
+    damageSerial: function () {
+      return tracking ? damageSerial : null;
+    },
+    configure: configure,
+    pacingStats: pacingStats,
+  };
+})();
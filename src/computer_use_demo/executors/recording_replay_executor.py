@@ -0,0 +1,422 @@
+"""
+An executor that plays back a Guacamole session recording, so that the capture,
+encoding, deduplication and pruning of screenshots can be benchmarked offline
+on real screen content, with the same frames on every run.
+"""
+
+from collections import Counter
+from pathlib import Path
+from typing import IO, Iterator, Tuple
+import base64
+import gzip
+import io
+import logging
+
+import numpy as np
+from PIL import Image
+
+from .executor_base import ComputerUseExecutor
+from ..guacamole_protocol import Instruction, InstructionParser
+from ..imaging import crop_box, encode_png
+
+LOGGER = logging.getLogger(__name__)
+
+# The layer Guacamole displays; negative layers are off-screen buffers
+DEFAULT_LAYER = 0
+
+# Channel mask of Guacamole's SRC compositing operation. Every other mask is
+# drawn as OVER, which is what nearly all remote desktop updates use.
+MASK_SRC = 0xC
+
+# Beyond this many changed regions, changed_regions reports the whole screen
+MAX_CHANGED_REGIONS = 64
+
+_CHUNK_SIZE = 1 << 16
+
+
+class RecordingReplayExecutor(ComputerUseExecutor):
+    """Replays a ``.guac`` session recording into an in-memory framebuffer.
+
+    The recording is read as it is played, one frame (everything up to a
+    ``sync`` instruction) at a time. Every action advances playback by
+    ``frames_per_action`` frames or, with ``ms_per_action``, by that much
+    recording time. A screenshot shows the frame playback has reached; one
+    taken without an action since the last screenshot (other than the first
+    screenshot, which shows the first frame) advances playback itself, so
+    every turn of the agent loop moves the recording on exactly
+    once. At the end of the recording, playback starts over with ``loop``,
+    or stays on the last frame.
+
+    Input is counted but has no effect on the screen. Drawing to the default
+    layer and to off-screen buffers (images, copies and filled rectangles) is
+    replayed; visible layers other than the default one, cursors, audio and
+    instructions outside those are skipped and counted in ``skipped_opcodes``.
+    """
+
+    def __init__(
+        self,
+        recording: str | Path,
+        frames_per_action: int = 1,
+        ms_per_action: float | None = None,
+        loop: bool = True,
+        typing_delay_ms=0,
+        png_compress_level: int = 1,
+    ):
+        super().__init__(typing_delay_ms)
+        self.recording = Path(recording)
+        self.frames_per_action = frames_per_action
+        self.ms_per_action = ms_per_action
+        self.loop = loop
+        self.png_compress_level = png_compress_level
+
+        self.action_counts = Counter()
+        self.skipped_opcodes = Counter()
+        # Frames played since the start of the recording, and how often it
+        # has been started over
+        self.frame_number = 0
+        self.loops = 0
+        # Timestamp (milliseconds) of the last frame played
+        self.timestamp = 0
+
+        self._file: IO[bytes] | None = None
+        self._instructions: Iterator[Instruction] = iter(())
+        self._layers: dict[int, np.ndarray] = {}
+        self._paths: dict[int, list[tuple[int, int, int, int]]] = {}
+        self._streams: dict[int, tuple[int, int, int, int, list[memoryview]]] = {}
+        self._changed: list[tuple[int, int, int, int]] = []
+        self._screenshot: str | None = None
+        # Whether playback has moved on since the last screenshot
+        self._advanced = False
+
+        self._start()
+        if not self._next_frame() or DEFAULT_LAYER not in self._layers:
+            raise ValueError(f"{self.recording} has no frame to replay")
+        # So that the first screenshot shows the first frame
+        self._advanced = True
+        self.cursor = (self.width // 2, self.height // 2)
+
+    @property
+    def width(self) -> int:
+        return self._layers[DEFAULT_LAYER].shape[1]
+
+    @property
+    def height(self) -> int:
+        return self._layers[DEFAULT_LAYER].shape[0]
+
+    def key(self, key: str) -> None:
+        self._act("key")
+
+    def type(self, text: str) -> None:
+        self._act("type")
+
+    def cursor_position(self) -> Tuple[int, int]:
+        self.action_counts["cursor_position"] += 1
+        return self.cursor
+
+    def mouse_move(self, x: int, y: int) -> None:
+        self.cursor = (min(x, self.width - 1), min(y, self.height - 1))
+        self._act("mouse_move")
+
+    def left_click(self) -> None:
+        self._act("left_click")
+
+    def left_click_drag(self, x: int, y: int) -> None:
+        self.cursor = (min(x, self.width - 1), min(y, self.height - 1))
+        self._act("left_click_drag")
+
+    def right_click(self) -> None:
+        self._act("right_click")
+
+    def middle_click(self) -> None:
+        self._act("middle_click")
+
+    def double_click(self) -> None:
+        self._act("double_click")
+
+    def screenshot(self) -> str:
+        self.action_counts["screenshot"] += 1
+        if not self._advanced:
+            self._advance()
+        self._advanced = False
+        if self._screenshot is None:
+            self._screenshot = encode_png(
+                self._layers[DEFAULT_LAYER], compress_level=self.png_compress_level
+            )
+        return self._screenshot
+
+    def changed_regions(
+        self, reset: bool = False
+    ) -> list[tuple[int, int, int, int]] | None:
+        regions = list(self._changed)
+        if len(regions) > MAX_CHANGED_REGIONS:
+            regions = [(0, 0, self.width, self.height)]
+        if reset:
+            self._changed.clear()
+        return regions
+
+    def zoom(self, left: float, top: float, right: float, bottom: float) -> str:
+        self.action_counts["zoom"] += 1
+        x1, y1, x2, y2 = crop_box(left, top, right, bottom, self.width, self.height)
+        return encode_png(
+            np.ascontiguousarray(self._layers[DEFAULT_LAYER][y1:y2, x1:x2]),
+            compress_level=self.png_compress_level,
+        )
+
+    def close(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def _act(self, action: str) -> None:
+        self.action_counts[action] += 1
+        self._advance()
+        self._advanced = True
+
+    def _advance(self) -> None:
+        """Play the frames of one action."""
+        start, frames = self.timestamp, 0
+        while (
+            frames < self.frames_per_action
+            if self.ms_per_action is None
+            else not frames or self.timestamp - start < self.ms_per_action
+        ):
+            if self._next_frame():
+                frames += 1
+            elif self.loop and self.frame_number > 0:
+                # The first frame of the recording ends the action
+                self.loops += 1
+                self._start()
+                self._next_frame()
+                return
+            else:
+                return
+
+    def _start(self) -> None:
+        """Open the recording and clear the screen, to play from the start."""
+        self.close()
+        opener = gzip.open if self.recording.suffix == ".gz" else open
+        self._file = opener(self.recording, "rb")
+        self._instructions = _read_instructions(self._file)
+        self._layers = {
+            layer: np.zeros_like(pixels)
+            for layer, pixels in self._layers.items()
+            if layer == DEFAULT_LAYER
+        }
+        self._paths.clear()
+        self._streams.clear()
+        self.frame_number = 0
+        self.timestamp = 0
+        self._invalidate(0, 0, *self._size(DEFAULT_LAYER))
+
+    def _next_frame(self) -> bool:
+        """Apply the instructions up to the next ``sync``. Returns False at the
+        end of the recording."""
+        for opcode, args in self._instructions:
+            if opcode == "sync":
+                self.frame_number += 1
+                self.timestamp = int(args[0])
+                return True
+            handler = _HANDLERS.get(opcode)
+            if handler is None:
+                self.skipped_opcodes[opcode] += 1
+                continue
+            try:
+                handler(self, *args)
+            except (ValueError, TypeError, OSError) as e:
+                LOGGER.debug(f"Skipped a malformed {opcode} instruction: {e}")
+                self.skipped_opcodes[opcode] += 1
+        return False
+
+    def _size(self, layer: int) -> tuple[int, int]:
+        pixels = self._layers.get(layer)
+        return (0, 0) if pixels is None else (pixels.shape[1], pixels.shape[0])
+
+    def _layer(self, layer: int, width: int = 0, height: int = 0) -> np.ndarray | None:
+        """The pixels of a layer. Buffers grow to fit what is drawn to them, as
+        in Guacamole; the default layer keeps the size it was given."""
+        pixels = self._layers.get(layer)
+        if layer > DEFAULT_LAYER:
+            return None
+        if layer < DEFAULT_LAYER and (
+            pixels is None or pixels.shape[1] < width or pixels.shape[0] < height
+        ):
+            old_width, old_height = self._size(layer)
+            grown = np.zeros(
+                (max(height, old_height), max(width, old_width), 3), dtype=np.uint8
+            )
+            if pixels is not None:
+                grown[:old_height, :old_width] = pixels
+            self._layers[layer] = pixels = grown
+        return pixels
+
+    def _invalidate(self, x: int, y: int, width: int, height: int) -> None:
+        if width > 0 and height > 0:
+            self._screenshot = None
+            if len(self._changed) <= MAX_CHANGED_REGIONS:
+                self._changed.append((x, y, width, height))
+
+    def _draw(self, mask: int, layer: int, x: int, y: int, pixels: np.ndarray) -> None:
+        """Composite RGB or RGBA ``pixels`` onto a layer at (x, y)."""
+        height, width = pixels.shape[:2]
+        target = self._layer(layer, x + width, y + height)
+        if target is None:
+            return
+        x0, y0 = max(x, 0), max(y, 0)
+        x1 = min(x + width, target.shape[1])
+        y1 = min(y + height, target.shape[0])
+        if x0 >= x1 or y0 >= y1:
+            return
+
+        source = pixels[y0 - y : y1 - y, x0 - x : x1 - x]
+        region = target[y0:y1, x0:x1]
+        if source.shape[2] == 4 and mask != MASK_SRC:
+            alpha = source[..., 3:4].astype(np.uint16)
+            region[:] = (
+                source[..., :3] * alpha + region.astype(np.uint16) * (255 - alpha)
+            ) // 255
+        else:
+            region[:] = source[..., :3]
+        if layer == DEFAULT_LAYER:
+            self._invalidate(x0, y0, x1 - x0, y1 - y0)
+
+    # Instruction handlers, called with the instruction's arguments
+
+    def _on_size(
+        self, layer: memoryview, width: memoryview, height: memoryview
+    ) -> None:
+        layer, width, height = int(layer), int(width), int(height)
+        if layer > DEFAULT_LAYER:
+            return
+        old = self._layers.get(layer)
+        resized = np.zeros((height, width, 3), dtype=np.uint8)
+        if old is not None:
+            common_height = min(height, old.shape[0])
+            common_width = min(width, old.shape[1])
+            resized[:common_height, :common_width] = old[:common_height, :common_width]
+        self._layers[layer] = resized
+        if layer == DEFAULT_LAYER:
+            self._screenshot = None
+            self._changed = [(0, 0, width, height)]
+
+    def _on_img(
+        self,
+        stream: memoryview,
+        mask: memoryview,
+        layer: memoryview,
+        mimetype: memoryview,
+        x: memoryview,
+        y: memoryview,
+    ) -> None:
+        self._streams[int(stream)] = (int(mask), int(layer), int(x), int(y), [])
+
+    def _on_blob(self, stream: memoryview, data: memoryview) -> None:
+        pending = self._streams.get(int(stream))
+        if pending is not None:
+            pending[4].append(data)
+
+    def _on_end(self, stream: memoryview) -> None:
+        pending = self._streams.pop(int(stream), None)
+        if pending is None:
+            return
+        mask, layer, x, y, blobs = pending
+        self._draw(mask, layer, x, y, _decode(b"".join(blobs)))
+
+    def _on_png(
+        self,
+        mask: memoryview,
+        layer: memoryview,
+        x: memoryview,
+        y: memoryview,
+        data: memoryview,
+    ) -> None:
+        # The instruction that preceded img streams in older protocol versions
+        self._draw(int(mask), int(layer), int(x), int(y), _decode(data))
+
+    def _on_copy(
+        self,
+        source_layer: memoryview,
+        source_x: memoryview,
+        source_y: memoryview,
+        width: memoryview,
+        height: memoryview,
+        mask: memoryview,
+        layer: memoryview,
+        x: memoryview,
+        y: memoryview,
+    ) -> None:
+        source = self._layers.get(int(source_layer))
+        if source is None:
+            return
+        source_x, source_y = max(int(source_x), 0), max(int(source_y), 0)
+        pixels = source[
+            source_y : source_y + int(height), source_x : source_x + int(width)
+        ].copy()
+        self._draw(int(mask), int(layer), int(x), int(y), pixels)
+
+    def _on_rect(
+        self,
+        layer: memoryview,
+        x: memoryview,
+        y: memoryview,
+        width: memoryview,
+        height: memoryview,
+    ) -> None:
+        self._paths.setdefault(int(layer), []).append(
+            (int(x), int(y), int(width), int(height))
+        )
+
+    def _on_cfill(
+        self,
+        mask: memoryview,
+        layer: memoryview,
+        red: memoryview,
+        green: memoryview,
+        blue: memoryview,
+        alpha: memoryview,
+    ) -> None:
+        color = np.array([int(red), int(green), int(blue), int(alpha)], dtype=np.uint8)
+        for x, y, width, height in self._paths.pop(int(layer), ()):
+            fill = np.broadcast_to(color, (max(height, 0), max(width, 0), 4))
+            self._draw(int(mask), int(layer), x, y, fill)
+
+    def _on_path_end(self, *args: memoryview) -> None:
+        # Other fills and strokes of a path are not replayed, but consume it
+        self.skipped_opcodes["path_fill"] += 1
+        self._paths.pop(int(args[1]), None)
+
+    def _on_dispose(self, layer: memoryview) -> None:
+        layer = int(layer)
+        if layer != DEFAULT_LAYER:
+            self._layers.pop(layer, None)
+
+
+_HANDLERS = {
+    "size": RecordingReplayExecutor._on_size,
+    "img": RecordingReplayExecutor._on_img,
+    "blob": RecordingReplayExecutor._on_blob,
+    "end": RecordingReplayExecutor._on_end,
+    "png": RecordingReplayExecutor._on_png,
+    "jpeg": RecordingReplayExecutor._on_png,
+    "copy": RecordingReplayExecutor._on_copy,
+    "rect": RecordingReplayExecutor._on_rect,
+    "cfill": RecordingReplayExecutor._on_cfill,
+    "cstroke": RecordingReplayExecutor._on_path_end,
+    "lfill": RecordingReplayExecutor._on_path_end,
+    "lstroke": RecordingReplayExecutor._on_path_end,
+    "dispose": RecordingReplayExecutor._on_dispose,
+}
+
+
+def _decode(data: bytes | memoryview) -> np.ndarray:
+    """A base64 image as an (height, width, 3 or 4) uint8 array."""
+    with Image.open(io.BytesIO(base64.b64decode(data))) as image:
+        mode = (
+            "RGBA" if "A" in image.getbands() or "transparency" in image.info else "RGB"
+        )
+        return np.asarray(image.convert(mode))
+
+
+def _read_instructions(file: IO[bytes]) -> Iterator[Instruction]:
+    parser = InstructionParser()
+    while chunk := file.read(_CHUNK_SIZE):
+        yield from parser.feed(chunk)
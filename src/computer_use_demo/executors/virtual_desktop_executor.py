@@ -0,0 +1,416 @@
+"""
+An executor that simulates a desktop in memory, so that the agent loop can be
+load tested and profiled without a browser, Guacamole or a remote computer.
+"""
+
+from collections import Counter
+from dataclasses import dataclass, field
+from functools import lru_cache
+from time import sleep
+from typing import Tuple
+import logging
+
+import numpy as np
+
+from .executor_base import ComputerUseExecutor
+from ..imaging import crop_box, encode_png
+from ..key_combo import KEY_DOWN, compile_key_combo
+
+LOGGER = logging.getLogger(__name__)
+
+TITLE_BAR_HEIGHT = 20
+GLYPH_WIDTH = 6
+GLYPH_HEIGHT = 10
+
+BACKGROUND = np.array((30, 58, 95), dtype=np.uint8)
+WINDOW = np.array((236, 236, 236), dtype=np.uint8)
+TITLE_ACTIVE = np.array((52, 101, 164), dtype=np.uint8)
+TITLE_INACTIVE = np.array((136, 138, 133), dtype=np.uint8)
+TITLE_TEXT = np.array((255, 255, 255), dtype=np.uint8)
+FIELD = np.array((255, 255, 255), dtype=np.uint8)
+FIELD_BORDER = np.array((160, 160, 160), dtype=np.uint8)
+FIELD_FOCUS = np.array((245, 121, 0), dtype=np.uint8)
+SELECTION = np.array((173, 216, 230), dtype=np.uint8)
+TEXT = np.array((0, 0, 0), dtype=np.uint8)
+CURSOR = np.array((255, 255, 255), dtype=np.uint8)
+
+# The modifiers held by the left and right modifier keys
+MODIFIER_KEYSYMS = {
+    0xFFE1: "shift",
+    0xFFE2: "shift",
+    0xFFE3: "ctrl",
+    0xFFE4: "ctrl",
+    0xFFE7: "meta",
+    0xFFE8: "meta",
+    0xFFE9: "alt",
+    0xFFEA: "alt",
+    0xFFEB: "super",
+    0xFFEC: "super",
+}
+# The other keys a text field responds to
+XK_A, XK_a = 0x41, 0x61
+XK_BACKSPACE = 0xFF08
+XK_TAB = 0xFF09
+XK_RETURN = 0xFF0D
+XK_ESCAPE = 0xFF1B
+XK_KP_ENTER = 0xFF8D
+XK_DELETE = 0xFFFF
+
+
+@dataclass
+class TextField:
+    """A single-line text input, positioned relative to its window."""
+
+    x: int
+    y: int
+    width: int
+    height: int = 16
+    text: str = ""
+    selected: bool = False
+    submitted: list[str] = field(default_factory=list)
+
+
+@dataclass
+class VirtualWindow:
+    """A window with a title bar and any number of text fields."""
+
+    title: str
+    x: int
+    y: int
+    width: int
+    height: int
+    fields: list[TextField] = field(default_factory=list)
+
+    def contains(self, x: int, y: int) -> bool:
+        return self.x <= x < self.x + self.width and self.y <= y < self.y + self.height
+
+    def title_bar_contains(self, x: int, y: int) -> bool:
+        return self.contains(x, y) and y < self.y + TITLE_BAR_HEIGHT
+
+    def field_at(self, x: int, y: int) -> TextField | None:
+        for text_field in self.fields:
+            field_x, field_y = self.x + text_field.x, self.y + text_field.y
+            if (
+                field_x <= x < field_x + text_field.width
+                and field_y <= y < field_y + text_field.height
+            ):
+                return text_field
+        return None
+
+
+def default_windows(width: int, height: int) -> list[VirtualWindow]:
+    """A browser-like window with an address bar and a small form window."""
+    browser_width = width * 3 // 4
+    return [
+        VirtualWindow(
+            title="Browser",
+            x=width // 16,
+            y=height // 12,
+            width=browser_width,
+            height=height * 2 // 3,
+            fields=[TextField(x=8, y=TITLE_BAR_HEIGHT + 8, width=browser_width - 16)],
+        ),
+        VirtualWindow(
+            title="Form",
+            x=width // 2,
+            y=height // 2,
+            width=width // 3,
+            height=height // 3,
+            fields=[
+                TextField(x=8, y=TITLE_BAR_HEIGHT + 8 + 24 * i, width=width // 3 - 16)
+                for i in range(3)
+            ],
+        ),
+    ]
+
+
+@lru_cache(maxsize=None)
+def _glyph(char: str) -> np.ndarray:
+    """A deterministic bit pattern standing in for the shape of a character."""
+    if char.isspace():
+        return np.zeros((GLYPH_HEIGHT - 2, GLYPH_WIDTH - 1), dtype=bool)
+
+    seed = (ord(char) * 2654435761) | 1
+    bits = [(seed >> i) & 1 for i in range((GLYPH_HEIGHT - 2) * (GLYPH_WIDTH - 1))]
+    return np.array(bits, dtype=bool).reshape(GLYPH_HEIGHT - 2, GLYPH_WIDTH - 1)
+
+
+_CURSOR_MASK = np.tril(np.ones((12, 8), dtype=bool), k=0)
+
+
+class VirtualDesktopExecutor(ComputerUseExecutor):
+    """A deterministic desktop simulated in a NumPy framebuffer.
+
+    Windows are raised by clicking them and moved by dragging their title bar.
+    Clicking a text field focuses it, ``type`` inserts text into the focused
+    field and ``key`` understands a handful of editing keys (BackSpace, Delete,
+    Return, Tab, Escape and ctrl+a). Key combinations are compiled like
+    GuacamoleExecutor's, so unknown keys raise a ToolError; any other known key
+    is accepted and ignored.
+
+    Screenshots are only re-rendered and re-encoded after the desktop changes.
+    PNG encoding dominates the cost of a turn: a 320x240 desktop sustains a few
+    hundred to thousands of turns per second, a full XGA desktop around fifty.
+    """
+
+    def __init__(
+        self,
+        screen_width: int = 1024,
+        screen_height: int = 768,
+        windows: list[VirtualWindow] | None = None,
+        typing_delay_ms=0,
+        png_compress_level: int = 1,
+    ):
+        super().__init__(typing_delay_ms)
+        self.width = screen_width
+        self.height = screen_height
+        self.windows = (
+            windows
+            if windows is not None
+            else default_windows(screen_width, screen_height)
+        )
+        self.png_compress_level = png_compress_level
+        self.cursor = (screen_width // 2, screen_height // 2)
+        self.focused: TextField | None = None
+        self.action_counts = Counter()
+
+        self._framebuffer = np.empty((screen_height, screen_width, 3), dtype=np.uint8)
+        self._background = np.empty_like(self._framebuffer)
+        self._background[:] = BACKGROUND
+        self._screenshot: str | None = None
+        self._changed = True
+
+    def key(self, key: str) -> None:
+        self.action_counts["key"] += 1
+        # Compiled like GuacamoleExecutor's keys, so that sequences, aliases and
+        # "+" behave the same, and replayed event by event
+        held: set[int] = set()
+        for action, keysym in compile_key_combo(key):
+            if keysym in MODIFIER_KEYSYMS:
+                if action == KEY_DOWN:
+                    held.add(keysym)
+                else:
+                    held.discard(keysym)
+            elif action == KEY_DOWN:
+                self._press(keysym, {MODIFIER_KEYSYMS[modifier] for modifier in held})
+
+    def _press(self, keysym: int, modifiers: set[str]) -> None:
+        text_field = self.focused
+        if text_field is None:
+            return
+
+        if keysym in (XK_A, XK_a) and "ctrl" in modifiers:
+            text_field.selected = True
+        elif keysym == XK_BACKSPACE:
+            text_field.text = "" if text_field.selected else text_field.text[:-1]
+            text_field.selected = False
+        elif keysym == XK_DELETE:
+            if text_field.selected:
+                text_field.text = ""
+                text_field.selected = False
+        elif keysym in (XK_RETURN, XK_KP_ENTER):
+            text_field.submitted.append(text_field.text)
+            text_field.text = ""
+            text_field.selected = False
+        elif keysym == XK_TAB:
+            self._focus_next_field()
+        elif keysym == XK_ESCAPE:
+            self._focus(None)
+        else:
+            return
+
+        self._invalidate()
+
+    def type(self, text: str) -> None:
+        self.action_counts["type"] += 1
+        if self.typing_delay_ms:
+            sleep(len(text) * self.typing_delay_ms / 1000)
+
+        text_field = self.focused
+        if text_field is None:
+            return
+
+        if text_field.selected:
+            text_field.text = ""
+            text_field.selected = False
+        text_field.text += text
+        self._invalidate()
+
+    def cursor_position(self) -> Tuple[int, int]:
+        self.action_counts["cursor_position"] += 1
+        return self.cursor
+
+    def mouse_move(self, x: int, y: int) -> None:
+        self.action_counts["mouse_move"] += 1
+        self._move_cursor(x, y)
+
+    def left_click(self) -> None:
+        self.action_counts["left_click"] += 1
+        self._click()
+
+    def left_click_drag(self, x: int, y: int) -> None:
+        self.action_counts["left_click_drag"] += 1
+        start_x, start_y = self.cursor
+        window = self._window_at(start_x, start_y)
+
+        if window is not None:
+            self._raise(window)
+            if window.title_bar_contains(start_x, start_y):
+                window.x += x - start_x
+                window.y += y - start_y
+            elif text_field := window.field_at(start_x, start_y):
+                self._focus(text_field)
+                text_field.selected = True
+
+        self._move_cursor(x, y)
+
+    def right_click(self) -> None:
+        self.action_counts["right_click"] += 1
+
+    def middle_click(self) -> None:
+        self.action_counts["middle_click"] += 1
+
+    def double_click(self) -> None:
+        self.action_counts["double_click"] += 1
+        self._click()
+        if self.focused is not None:
+            self.focused.selected = True
+
+    def screenshot(self) -> str:
+        self.action_counts["screenshot"] += 1
+        self._changed = False
+        if self._screenshot is None:
+            self._render()
+            self._screenshot = encode_png(
+                self._framebuffer, compress_level=self.png_compress_level
+            )
+        return self._screenshot
+
+    def changed_regions(
+        self, reset: bool = False
+    ) -> list[tuple[int, int, int, int]] | None:
+        # Changes are not tracked by region, so any change is the whole screen
+        regions = [(0, 0, self.width, self.height)] if self._changed else []
+        if reset:
+            self._changed = False
+        return regions
+
+    def zoom(self, left: float, top: float, right: float, bottom: float) -> str:
+        self.action_counts["zoom"] += 1
+        if self._screenshot is None:
+            self._render()
+        x1, y1, x2, y2 = crop_box(left, top, right, bottom, self.width, self.height)
+        return encode_png(
+            np.ascontiguousarray(self._framebuffer[y1:y2, x1:x2]),
+            compress_level=self.png_compress_level,
+        )
+
+    def _invalidate(self) -> None:
+        self._screenshot = None
+        self._changed = True
+
+    def _move_cursor(self, x: int, y: int) -> None:
+        self.cursor = (min(x, self.width - 1), min(y, self.height - 1))
+        self._invalidate()
+
+    def _click(self) -> None:
+        window = self._window_at(*self.cursor)
+        if window is None:
+            self._focus(None)
+            return
+
+        self._raise(window)
+        self._focus(window.field_at(*self.cursor))
+
+    def _window_at(self, x: int, y: int) -> VirtualWindow | None:
+        for window in reversed(self.windows):
+            if window.contains(x, y):
+                return window
+        return None
+
+    def _raise(self, window: VirtualWindow) -> None:
+        if self.windows[-1] is not window:
+            self.windows.remove(window)
+            self.windows.append(window)
+            self._invalidate()
+
+    def _focus(self, text_field: TextField | None) -> None:
+        if self.focused is not None and self.focused is not text_field:
+            self.focused.selected = False
+        self.focused = text_field
+        self._invalidate()
+
+    def _focus_next_field(self) -> None:
+        for window in self.windows:
+            if self.focused in window.fields:
+                index = window.fields.index(self.focused)
+                self._focus(window.fields[(index + 1) % len(window.fields)])
+                return
+
+    def _render(self) -> None:
+        np.copyto(self._framebuffer, self._background)
+
+        for window in self.windows:
+            title_color = TITLE_ACTIVE if window is self.windows[-1] else TITLE_INACTIVE
+            self._fill(window.x, window.y, window.width, window.height, WINDOW)
+            self._fill(window.x, window.y, window.width, TITLE_BAR_HEIGHT, title_color)
+            self._draw_text(
+                window.title, window.x + 4, window.y + 5, window.width - 8, TITLE_TEXT
+            )
+
+            for text_field in window.fields:
+                field_x, field_y = window.x + text_field.x, window.y + text_field.y
+                border = FIELD_FOCUS if text_field is self.focused else FIELD_BORDER
+                fill = SELECTION if text_field.selected else FIELD
+                self._fill(
+                    field_x - 1,
+                    field_y - 1,
+                    text_field.width + 2,
+                    text_field.height + 2,
+                    border,
+                )
+                self._fill(field_x, field_y, text_field.width, text_field.height, fill)
+                self._draw_text(
+                    text_field.text,
+                    field_x + 2,
+                    field_y + (text_field.height - GLYPH_HEIGHT) // 2 + 1,
+                    text_field.width - 4,
+                    TEXT,
+                    keep_end=True,
+                )
+
+        self._draw_cursor()
+
+    def _fill(self, x: int, y: int, width: int, height: int, color) -> None:
+        x0, y0 = max(x, 0), max(y, 0)
+        x1, y1 = min(x + width, self.width), min(y + height, self.height)
+        if x0 < x1 and y0 < y1:
+            self._framebuffer[y0:y1, x0:x1] = color
+
+    def _draw_text(
+        self, text: str, x: int, y: int, max_width: int, color, keep_end=False
+    ) -> None:
+        """Draw as much of ``text`` as fits, keeping the end when ``keep_end``."""
+        fits = max(max_width // GLYPH_WIDTH, 0)
+        text = text[-fits:] if keep_end and fits else text[:fits]
+
+        for i, char in enumerate(text):
+            glyph = _glyph(char)
+            glyph_x = x + i * GLYPH_WIDTH
+            height, width = glyph.shape
+            if (
+                glyph_x < 0
+                or y < 0
+                or glyph_x + width > self.width
+                or y + height > self.height
+            ):
+                continue
+            self._framebuffer[y : y + height, glyph_x : glyph_x + width][glyph] = color
+
+    def _draw_cursor(self) -> None:
+        x, y = self.cursor
+        height, width = _CURSOR_MASK.shape
+        height, width = min(height, self.height - y), min(width, self.width - x)
+        if height > 0 and width > 0:
+            region = self._framebuffer[y : y + height, x : x + width]
+            region[_CURSOR_MASK[:height, :width]] = CURSOR
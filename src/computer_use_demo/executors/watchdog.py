@@ -0,0 +1,277 @@
+"""
+Deadlines for executor operations, and a watchdog that restarts a stalled or
+crashed browser and stops the run when it keeps failing.
+"""
+
+from dataclasses import dataclass
+from time import monotonic
+from typing import Any, Callable, Tuple
+import logging
+import threading
+
+from .executor_base import ComputerUseExecutor
+from ..tools.base_tool import ToolError
+
+LOGGER = logging.getLogger(__name__)
+
+# Seconds each operation may take before it is considered stalled. "type" also
+# gets twice the executor's typing delay per character.
+DEFAULT_DEADLINES_S = {
+    "key": 10.0,
+    "type": 20.0,
+    "cursor_position": 5.0,
+    "mouse_move": 10.0,
+    "left_click": 10.0,
+    "left_click_drag": 10.0,
+    "right_click": 10.0,
+    "middle_click": 10.0,
+    "double_click": 10.0,
+    "screenshot": 15.0,
+    "changed_regions": 5.0,
+    "zoom": 15.0,
+}
+
+# Added to the error of an operation after which the browser was restarted
+RESTARTED_NOTE = "; the browser was restarted, take a screenshot to see its state"
+
+
+class OperationTimeout(ToolError):
+    """An executor operation missed its deadline."""
+
+
+class CircuitOpenError(Exception):
+    """The executor failed too often in a row and is not being called anymore.
+
+    Not a ToolError, so that it is not reported to the model as a failed action
+    but ends the run: see perform_action.
+    """
+
+
+@dataclass
+class CircuitBreaker:
+    """Opens after ``failure_threshold`` consecutive failures.
+
+    While open, calls fail fast with CircuitOpenError. After ``reset_after_s``
+    a single trial call is let through ("half-open"): success closes the
+    circuit, failure opens it again. With ``reset_after_s`` None, it stays open.
+    """
+
+    failure_threshold: int = 3
+    reset_after_s: float | None = None
+    consecutive_failures: int = 0
+    opened_at: float | None = None
+
+    @property
+    def is_open(self) -> bool:
+        return self.opened_at is not None
+
+    def before_call(self) -> None:
+        if self.opened_at is None:
+            return
+        if (
+            self.reset_after_s is not None
+            and monotonic() - self.opened_at >= self.reset_after_s
+        ):
+            LOGGER.info("Circuit half-open, trying the executor again")
+            return
+        raise CircuitOpenError(
+            f"Executor unavailable after {self.consecutive_failures} "
+            "consecutive failures"
+        )
+
+    def record_success(self) -> None:
+        self.consecutive_failures = 0
+        self.opened_at = None
+
+    def record_failure(self) -> None:
+        self.consecutive_failures += 1
+        if self.consecutive_failures >= self.failure_threshold:
+            if self.opened_at is None:
+                LOGGER.error(
+                    f"Circuit opened after {self.consecutive_failures} "
+                    "consecutive executor failures"
+                )
+            self.opened_at = monotonic()
+
+
+@dataclass
+class WatchdogStats:
+    calls: int = 0
+    timeouts: int = 0
+    crashes: int = 0
+    restarts: int = 0
+
+    def summary(self) -> str:
+        return (
+            f"{self.calls} executor calls, {self.timeouts} timed out, "
+            f"{self.crashes} crashed, {self.restarts} restarts"
+        )
+
+
+class WatchdogExecutor(ComputerUseExecutor):
+    """Runs each operation of another executor under a deadline.
+
+    An operation that misses its deadline (see DEFAULT_DEADLINES_S), or fails
+    with anything but a ToolError (such as a WebDriverException from a crashed
+    browser), counts as a failure. After a failure, ``health_check`` is run on
+    the executor under ``health_check_deadline_s``. If it fails too,
+    ``restart`` is called with the old executor and must return a new one; it
+    is responsible for disposing of the old one. The failed operation is
+    reported to the model as a ToolError either way.
+
+    The stalled call itself cannot be cancelled. It is left to finish, or
+    fail, in the background once the restart has torn down its browser.
+
+    After ``circuit_breaker.failure_threshold`` consecutive failures, every
+    call raises CircuitOpenError, which ends the run instead of letting it
+    hang on a browser that cannot recover.
+    """
+
+    def __init__(
+        self,
+        executor: ComputerUseExecutor,
+        restart: Callable[[ComputerUseExecutor], ComputerUseExecutor] | None = None,
+        health_check: Callable[[ComputerUseExecutor], Any] | None = None,
+        deadlines_s: dict[str, float] | None = None,
+        health_check_deadline_s: float = 5.0,
+        restart_deadline_s: float = 120.0,
+        circuit_breaker: CircuitBreaker | None = None,
+    ):
+        super().__init__(executor.typing_delay_ms)
+        self.executor = executor
+        self.restart = restart
+        self.health_check = health_check or (
+            lambda executor: executor.cursor_position()
+        )
+        self.deadlines_s = {**DEFAULT_DEADLINES_S, **(deadlines_s or {})}
+        self.health_check_deadline_s = health_check_deadline_s
+        self.restart_deadline_s = restart_deadline_s
+        self.circuit_breaker = circuit_breaker or CircuitBreaker()
+        self.stats = WatchdogStats()
+
+    def key(self, key: str) -> None:
+        self._call("key", key)
+
+    def type(self, text: str) -> None:
+        extra_s = len(text) * self.executor.typing_delay_ms / 1000 * 2
+        self._call("type", text, extra_s=extra_s)
+
+    def cursor_position(self) -> Tuple[int, int]:
+        return self._call("cursor_position")
+
+    def mouse_move(self, x: int, y: int) -> None:
+        self._call("mouse_move", x, y)
+
+    def left_click(self) -> None:
+        self._call("left_click")
+
+    def left_click_drag(self, x: int, y: int) -> None:
+        self._call("left_click_drag", x, y)
+
+    def right_click(self) -> None:
+        self._call("right_click")
+
+    def middle_click(self) -> None:
+        self._call("middle_click")
+
+    def double_click(self) -> None:
+        self._call("double_click")
+
+    def screenshot(self) -> str:
+        return self._call("screenshot")
+
+    def changed_regions(
+        self, reset: bool = False
+    ) -> list[tuple[int, int, int, int]] | None:
+        return self._call("changed_regions", reset)
+
+    def zoom(
+        self, left: float, top: float, right: float, bottom: float
+    ) -> str | None:
+        return self._call("zoom", left, top, right, bottom)
+
+    def validate_action(self, *args, **kwargs) -> None:
+        self.executor.validate_action(*args, **kwargs)
+
+    def _call(self, operation: str, *args, extra_s: float = 0.0) -> Any:
+        self.circuit_breaker.before_call()
+        self.stats.calls += 1
+        deadline_s = self.deadlines_s[operation] + extra_s
+        method = getattr(self.executor, operation)
+
+        try:
+            result = _run_with_deadline(lambda: method(*args), deadline_s)
+        except OperationTimeout:
+            self.stats.timeouts += 1
+            LOGGER.warning(f"Executor {operation} timed out after {deadline_s:.1f}s")
+            note = RESTARTED_NOTE if self._recover() else ""
+            raise OperationTimeout(
+                f"{operation} timed out after {deadline_s:.1f}s{note}"
+            )
+        except ToolError:
+            # A problem with the action rather than with the executor
+            raise
+        except Exception as e:
+            self.stats.crashes += 1
+            LOGGER.warning(f"Executor {operation} failed: {e!r}")
+            note = RESTARTED_NOTE if self._recover() else ""
+            raise ToolError(f"{operation} failed: {e}{note}") from e
+
+        self.circuit_breaker.record_success()
+        return result
+
+    def _recover(self) -> bool:
+        """Count a failure, and restart the executor if it is unhealthy.
+        Returns whether it was restarted."""
+        self.circuit_breaker.record_failure()
+        if self.circuit_breaker.is_open:
+            raise CircuitOpenError(
+                f"Executor unavailable after {self.circuit_breaker.consecutive_failures} "
+                "consecutive failures"
+            )
+
+        try:
+            _run_with_deadline(
+                lambda: self.health_check(self.executor), self.health_check_deadline_s
+            )
+            return False
+        except Exception as e:
+            LOGGER.warning(f"Executor health check failed: {e!r}")
+
+        if self.restart is None:
+            return False
+        LOGGER.warning("Restarting the executor")
+        try:
+            self.executor = _run_with_deadline(
+                lambda: self.restart(self.executor), self.restart_deadline_s
+            )
+            self.stats.restarts += 1
+            return True
+        except Exception as e:
+            LOGGER.error(f"Executor restart failed: {e!r}")
+            self.circuit_breaker.record_failure()
+            if self.circuit_breaker.is_open:
+                raise CircuitOpenError(f"Executor could not be restarted: {e}") from e
+            return False
+
+
+def _run_with_deadline(fn: Callable[[], Any], deadline_s: float) -> Any:
+    """Run ``fn`` on a daemon thread, raising OperationTimeout if it takes
+    longer than ``deadline_s``. A daemon thread, so that a call that never
+    returns does not keep the process alive."""
+    outcome: dict[str, Any] = {}
+
+    def target():
+        try:
+            outcome["result"] = fn()
+        except BaseException as e:
+            outcome["error"] = e
+
+    thread = threading.Thread(target=target, name="executor-call", daemon=True)
+    thread.start()
+    thread.join(deadline_s)
+    if thread.is_alive():
+        raise OperationTimeout(f"Timed out after {deadline_s:.1f}s")
+    if "error" in outcome:
+        raise outcome["error"]
+    return outcome.get("result")
@@ -0,0 +1,309 @@
+"""
+A compact archive of every screenshot of a run, for auditing and debugging.
+
+Frames are stored in an append-only segment file as occasional keyframes and,
+in between, the XOR of the rectangle that changed since the previous frame,
+each zlib-compressed. Consecutive screenshots of a desktop mostly differ in a
+small area, so a run costs a fraction of its base64 PNGs. A fixed-size index
+record per frame gives random access, and FrameArchiveReader rebuilds any frame
+from the memory-mapped segment on demand.
+"""
+
+from dataclasses import dataclass
+from pathlib import Path
+from queue import Queue
+from threading import Event, Thread
+import logging
+import mmap
+import os
+import struct
+import time
+import zlib
+
+import numpy as np
+
+from .imaging import decode_image, encode_png
+
+LOGGER = logging.getLogger(__name__)
+
+SEGMENT_FILE = "frames.seg"
+INDEX_FILE = "frames.idx"
+
+# A whole frame, the XOR of a changed rectangle with the previous frame, or
+# nothing at all when the frame is the same as the previous one
+KIND_KEYFRAME = 0
+KIND_DELTA = 1
+KIND_UNCHANGED = 2
+
+# Changes covering more of the screen than this are stored as a keyframe,
+# which is quicker to read back than a delta of the same size
+MAX_DELTA_AREA = 0.75
+
+# offset, length, turn, timestamp, kind, width, height, then the rectangle
+# x, y, width, height of the stored pixels
+_INDEX_RECORD = struct.Struct("<QIIdBHHHHHH")
+
+_CLOSE = object()
+
+
+@dataclass(frozen=True)
+class IndexEntry:
+    offset: int
+    length: int
+    turn: int
+    timestamp: float
+    kind: int
+    width: int
+    height: int
+    rect: tuple[int, int, int, int]
+
+
+@dataclass
+class ArchiveStats:
+    frames: int = 0
+    keyframes: int = 0
+    input_bytes: int = 0
+    stored_bytes: int = 0
+
+    def summary(self) -> str:
+        ratio = self.input_bytes / self.stored_bytes if self.stored_bytes else 0.0
+        return (
+            f"{self.frames} frames archived ({self.keyframes} keyframes), "
+            f"{self.stored_bytes / 1e6:.1f} MB for {self.input_bytes / 1e6:.1f} MB "
+            f"of screenshots ({ratio:.1f}x smaller)"
+        )
+
+
+class FrameArchive:
+    """Appends the screenshots of a run to ``<directory>/frames.seg``.
+
+    A keyframe is written every ``keyframe_interval`` frames, whenever the
+    screen size changes, and whenever most of the screen changed. Like
+    RunJournal, frames are decoded, diffed and written by a background thread,
+    so archiving adds no latency to a turn. An existing archive in the same
+    directory is appended to.
+    """
+
+    def __init__(
+        self,
+        directory: str | Path,
+        keyframe_interval: int = 50,
+        compress_level: int = 6,
+    ):
+        self.directory = Path(directory)
+        self.keyframe_interval = keyframe_interval
+        self.compress_level = compress_level
+        self.stats = ArchiveStats()
+
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._segment = open(self.directory / SEGMENT_FILE, "ab")
+        self._index = open(self.directory / INDEX_FILE, "ab")
+        # An appended archive starts again with a keyframe
+        self._previous: np.ndarray | None = None
+        self._since_keyframe = 0
+
+        self._queue: Queue = Queue()
+        self._thread = Thread(target=self._run, name="frame-archive", daemon=True)
+        self._thread.start()
+
+    def __enter__(self) -> "FrameArchive":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def append(self, base64_image: str, turn: int) -> None:
+        """Queue a screenshot taken during ``turn`` to be archived."""
+        self._queue.put((base64_image, turn, time.time()))
+
+    def flush(self, timeout_s: float = 10.0) -> None:
+        """Block until everything appended so far is written, for at most
+        ``timeout_s``. Raises a RuntimeError if the writer thread has stopped,
+        as nothing appended would then be written."""
+        if not self._thread.is_alive():
+            raise RuntimeError("The frame archive's writer has stopped")
+        done = Event()
+        self._queue.put(done)
+        deadline = time.monotonic() + timeout_s
+        while not done.wait(timeout=min(max(deadline - time.monotonic(), 0), 0.1)):
+            if not self._thread.is_alive():
+                raise RuntimeError("The frame archive's writer stopped before flushing")
+            if time.monotonic() >= deadline:
+                LOGGER.warning(f"Frame archive not flushed within {timeout_s} s")
+                return
+
+    def close(self) -> None:
+        if self._thread.is_alive():
+            self._queue.put(_CLOSE)
+            self._thread.join()
+        for file in (self._segment, self._index):
+            file.flush()
+            os.fsync(file.fileno())
+            file.close()
+
+    def _run(self) -> None:
+        while True:
+            item = self._queue.get()
+            if item is _CLOSE:
+                return
+            if isinstance(item, Event):
+                self._segment.flush()
+                self._index.flush()
+                item.set()
+                continue
+
+            try:
+                self._write(*item)
+            except (OSError, ValueError, zlib.error) as e:
+                LOGGER.error(f"Failed to archive frame: {e}")
+                # The next frame must not be a delta against a lost one
+                self._previous = None
+
+    def _write(self, base64_image: str, turn: int, timestamp: float) -> None:
+        pixels = decode_image(base64_image)
+        height, width = pixels.shape[:2]
+        previous = self._previous
+
+        kind, rect, data = KIND_KEYFRAME, (0, 0, width, height), None
+        if (
+            previous is not None
+            and previous.shape == pixels.shape
+            and self._since_keyframe < self.keyframe_interval
+        ):
+            difference = np.bitwise_xor(pixels, previous)
+            changed = _changed_rect(difference)
+            if changed is None:
+                kind, rect, data = KIND_UNCHANGED, (0, 0, 0, 0), b""
+            elif changed[2] * changed[3] < width * height * MAX_DELTA_AREA:
+                x, y, w, h = changed
+                kind, rect = KIND_DELTA, changed
+                data = zlib.compress(
+                    difference[y : y + h, x : x + w].tobytes(), self.compress_level
+                )
+
+        if kind == KIND_KEYFRAME:
+            data = zlib.compress(pixels.tobytes(), self.compress_level)
+            self._since_keyframe = 0
+            self.stats.keyframes += 1
+        else:
+            self._since_keyframe += 1
+
+        offset = self._segment.tell()
+        self._segment.write(data)
+        self._index.write(
+            _INDEX_RECORD.pack(
+                offset, len(data), turn, timestamp, kind, width, height, *rect
+            )
+        )
+        self._previous = pixels
+
+        self.stats.frames += 1
+        self.stats.input_bytes += len(base64_image) * 3 // 4
+        self.stats.stored_bytes += len(data) + _INDEX_RECORD.size
+
+
+class FrameArchiveReader:
+    """Random access to the frames of an archive, rebuilt lazily.
+
+    Frame ``n`` is rebuilt from the nearest keyframe at or before it, or from
+    the last frame rebuilt when that is closer, so reading frames in order
+    decodes each record once. The reader sees frames appended after it was
+    opened once ``refresh`` is called.
+    """
+
+    def __init__(self, directory: str | Path):
+        self.directory = Path(directory)
+        self._segment = open(self.directory / SEGMENT_FILE, "rb")
+        self._map: mmap.mmap | None = None
+        self.entries: list[IndexEntry] = []
+        # The last frame rebuilt, as (frame number, pixels)
+        self._cached: tuple[int, np.ndarray] | None = None
+        self.refresh()
+
+    def __enter__(self) -> "FrameArchiveReader":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def refresh(self) -> None:
+        """Pick up frames appended since the archive was opened."""
+        with open(self.directory / INDEX_FILE, "rb") as index:
+            data = index.read()
+        # A record still being written is left for the next refresh
+        whole = len(data) - len(data) % _INDEX_RECORD.size
+        self.entries = [
+            IndexEntry(offset, length, turn, timestamp, kind, width, height, rect)
+            for offset, length, turn, timestamp, kind, width, height, *rect in (
+                _INDEX_RECORD.iter_unpack(data[:whole])
+            )
+        ]
+
+        size = os.fstat(self._segment.fileno()).st_size
+        if size and (self._map is None or len(self._map) < size):
+            if self._map is not None:
+                self._map.close()
+            self._map = mmap.mmap(self._segment.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def frames_of_turn(self, turn: int) -> list[int]:
+        """The numbers of the frames taken during a turn."""
+        return [
+            number for number, entry in enumerate(self.entries) if entry.turn == turn
+        ]
+
+    def pixels(self, number: int) -> np.ndarray:
+        """Frame ``number`` as a (height, width, 3) uint8 RGB array."""
+        if not 0 <= number < len(self.entries):
+            raise IndexError(f"Frame {number} is not in the archive")
+
+        start = number
+        while self.entries[start].kind != KIND_KEYFRAME:
+            start -= 1
+            if start < 0:
+                raise ValueError(f"Frame {number} has no keyframe")
+
+        frame = None
+        if self._cached is not None and start <= self._cached[0] <= number:
+            start, frame = self._cached[0] + 1, self._cached[1].copy()
+
+        for current in range(start, number + 1):
+            frame = self._apply(self.entries[current], frame)
+
+        self._cached = (number, frame)
+        return frame.copy()
+
+    def image(self, number: int) -> str:
+        """Frame ``number`` as a base64 PNG."""
+        return encode_png(self.pixels(number))
+
+    def close(self) -> None:
+        if self._map is not None:
+            self._map.close()
+        self._segment.close()
+
+    def _apply(self, entry: IndexEntry, frame: np.ndarray | None) -> np.ndarray:
+        if entry.kind == KIND_UNCHANGED:
+            return frame
+
+        data = zlib.decompress(self._map[entry.offset : entry.offset + entry.length])
+        x, y, w, h = entry.rect
+        pixels = np.frombuffer(data, dtype=np.uint8).reshape(h, w, 3)
+        if entry.kind == KIND_KEYFRAME:
+            return pixels.copy()
+
+        frame[y : y + h, x : x + w] ^= pixels
+        return frame
+
+
+def _changed_rect(difference: np.ndarray) -> tuple[int, int, int, int] | None:
+    """The bounding (x, y, width, height) of the non-zero pixels, if any."""
+    changed = difference.any(axis=2)
+    rows = np.flatnonzero(changed.any(axis=1))
+    if not len(rows):
+        return None
+    columns = np.flatnonzero(changed.any(axis=0))
+    x, y = int(columns[0]), int(rows[0])
+    return x, y, int(columns[-1]) - x + 1, int(rows[-1]) - y + 1
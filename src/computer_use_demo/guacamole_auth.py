@@ -0,0 +1,228 @@
+"""
+Guacamole session tokens from Python, for the guacamole-auth-json extension.
+
+sign_and_encrypt produces exactly what encrypt-json.sh does with openssl: an
+HMAC-SHA256 signature of the JSON followed by the JSON itself, encrypted with
+AES-128-CBC under the same key and a null IV, base64-encoded. TokenProvider
+exchanges that for a token at ``/api/tokens`` over a pooled HTTP session, and
+keeps the token until the connection definition it was minted for expires, so
+many sessions can be provisioned from one process without running a shell
+script and curl for each.
+"""
+
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+from urllib.parse import quote
+import base64
+import hashlib
+import hmac
+import json
+import logging
+import threading
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+
+LOGGER = logging.getLogger(__name__)
+
+# What encrypt-json.sh passes to openssl as the IV
+NULL_IV = bytes(16)
+
+
+class TokenError(Exception):
+    """Guacamole did not issue a token."""
+
+
+def sign_and_encrypt(data: dict | bytes, secret_key: str) -> str:
+    """Sign and encrypt JSON for guacamole-auth-json, as encrypt-json.sh does.
+
+    ``data`` is a connection definition, or JSON already serialized as bytes.
+    ``secret_key`` is the 32-digit hexadecimal ``json-secret-key`` that
+    Guacamole is configured with.
+    """
+    # Only needed to provision sessions, so not imported with the module
+    from cryptography.hazmat.primitives import padding
+    from cryptography.hazmat.primitives.ciphers import Cipher, algorithms, modes
+
+    if isinstance(data, dict):
+        data = json.dumps(data).encode()
+    key = bytes.fromhex(secret_key)
+    if len(key) != 16:
+        raise ValueError("The secret key must be 16 bytes (32 hexadecimal digits)")
+
+    signed = hmac.digest(key, data, hashlib.sha256) + data
+    # openssl enc pads with PKCS#7 by default
+    padder = padding.PKCS7(algorithms.AES.block_size).padder()
+    padded = padder.update(signed) + padder.finalize()
+    encryptor = Cipher(algorithms.AES(key), modes.CBC(NULL_IV)).encryptor()
+    return base64.b64encode(encryptor.update(padded) + encryptor.finalize()).decode()
+
+
+def load_connection(path: str | Path) -> dict:
+    """A connection definition such as ``connections/computer-use.json``."""
+    with open(path) as file:
+        return json.load(file)
+
+
+def render_connection(template: dict, **values: Any) -> dict:
+    """The connection definition ``template`` with placeholders filled in.
+
+    Every string in the template, keys included, is formatted with ``values``,
+    so a single definition can describe the session of any worker:
+
+        {"username": "worker-{worker}",
+         "connections": {"linux-{worker}": {"parameters": {
+             "hostname": "desktop-{worker}", ...}}}}
+
+    Strings without placeholders are left as they are; literal braces are
+    written doubled, as with str.format.
+    """
+
+    def render(node: Any) -> Any:
+        if isinstance(node, str):
+            return node.format_map(values)
+        if isinstance(node, dict):
+            return {render(key): render(value) for key, value in node.items()}
+        if isinstance(node, list):
+            return [render(item) for item in node]
+        return node
+
+    return render(template)
+
+
+@dataclass
+class TokenStats:
+    minted: int = 0
+    cached: int = 0
+    failures: int = 0
+    mint_s: float = 0.0
+
+    def summary(self) -> str:
+        mean_ms = self.mint_s / self.minted * 1000 if self.minted else 0.0
+        return (
+            f"{self.minted} tokens minted ({mean_ms:.0f} ms each), "
+            f"{self.cached} served from cache, {self.failures} failures"
+        )
+
+
+@dataclass(frozen=True)
+class _CachedToken:
+    token: str
+    # Epoch seconds after which the token is not handed out anymore
+    valid_until: float
+
+
+class TokenProvider:
+    """Mints Guacamole tokens for connection definitions and caches them.
+
+    ``base_url`` is Guacamole's own URL, such as
+    ``http://localhost:8080/guacamole``. Requests go through one
+    requests.Session whose pool keeps up to ``pool_size`` connections open,
+    so concurrent callers on many threads reuse connections rather than each
+    opening its own.
+
+    Before a definition is signed, its ``expires`` is set ``token_ttl_s``
+    from now (the one in a checked-in file is soon in the past), and the
+    token is cached under the rest of the definition until ``refresh_margin_s``
+    before then. Concurrent calls for the same definition mint it only once.
+    """
+
+    def __init__(
+        self,
+        base_url: str,
+        secret_key: str,
+        token_ttl_s: float = 3600.0,
+        refresh_margin_s: float = 60.0,
+        pool_size: int = 32,
+        timeout_s: float = 10.0,
+        session: requests.Session | None = None,
+    ):
+        self.base_url = base_url.rstrip("/")
+        self.secret_key = secret_key
+        self.token_ttl_s = token_ttl_s
+        self.refresh_margin_s = refresh_margin_s
+        self.timeout_s = timeout_s
+        self.stats = TokenStats()
+
+        if session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+        self.session = session
+
+        self._cache: dict[str, _CachedToken] = {}
+        self._locks: dict[str, threading.Lock] = {}
+        self._lock = threading.Lock()
+
+    def __enter__(self) -> "TokenProvider":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def token(self, connection: dict) -> str:
+        """A token for a connection definition, minted only if none is cached."""
+        key = _cache_key(connection)
+        with self._lock:
+            key_lock = self._locks.setdefault(key, threading.Lock())
+
+        with key_lock:
+            cached = self._cache.get(key)
+            if cached is not None and time.time() < cached.valid_until:
+                self.stats.cached += 1
+                return cached.token
+
+            expires = time.time() + self.token_ttl_s
+            token = self._mint({**connection, "expires": int(expires * 1000)})
+            self._cache[key] = _CachedToken(token, expires - self.refresh_margin_s)
+            return token
+
+    def token_for_worker(self, template: dict, worker: int | str, **values) -> str:
+        """A token for ``template`` rendered for one worker (see render_connection)."""
+        return self.token(render_connection(template, worker=worker, **values))
+
+    def client_url(self, token: str) -> str:
+        """The URL that opens Guacamole's client with a token."""
+        return f"{self.base_url}/?token={quote(token, safe='')}"
+
+    def invalidate(self, connection: dict | None = None) -> None:
+        """Forget the token of one connection definition, or of all of them."""
+        with self._lock:
+            if connection is None:
+                self._cache.clear()
+            else:
+                self._cache.pop(_cache_key(connection), None)
+
+    def close(self) -> None:
+        self.session.close()
+
+    def _mint(self, connection: dict) -> str:
+        data = sign_and_encrypt(connection, self.secret_key)
+        started = time.perf_counter()
+        try:
+            response = self.session.post(
+                f"{self.base_url}/api/tokens",
+                data={"data": data},
+                timeout=self.timeout_s,
+            )
+            response.raise_for_status()
+            token = response.json()["authToken"]
+        except (requests.RequestException, ValueError, KeyError) as e:
+            self.stats.failures += 1
+            raise TokenError(
+                f"Guacamole did not issue a token for {connection.get('username')}: {e}"
+            ) from e
+
+        self.stats.minted += 1
+        self.stats.mint_s += time.perf_counter() - started
+        LOGGER.debug(f"Minted a token for {connection.get('username')}")
+        return token
+
+
+def _cache_key(connection: dict) -> str:
+    """The definition without its expiry time, which every mint sets afresh."""
+    definition = {key: value for key, value in connection.items() if key != "expires"}
+    return json.dumps(definition, sort_keys=True)
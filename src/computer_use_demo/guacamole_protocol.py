@@ -0,0 +1,205 @@
+"""
+Parsing and encoding of the Guacamole protocol's instruction streams.
+
+An instruction is a list of elements, the opcode first, each written as its
+length in Unicode characters, a period and its value, and separated by commas
+up to a closing semicolon: ``4.size,1.0,4.1024,3.768;``. InstructionParser
+parses such a stream as it arrives, in chunks that may end anywhere, and hands
+out the arguments as memoryview slices of the chunks rather than as copies, so
+that recordings and live streams can be parsed at many megabytes per second.
+"""
+
+from typing import Iterator, NamedTuple
+import re
+
+# The length and period that start an element
+_ELEMENT_HEADER = re.compile(rb"(\d+)\.")
+# What is left of a buffer that ends partway through an element's length
+_PARTIAL_HEADER = re.compile(rb"\d*\Z")
+_NON_ASCII = re.compile(rb"[\x80-\xff]")
+# UTF-8 continuation bytes, which do not start a character
+_CONTINUATION = re.compile(rb"[\x80-\xbf]")
+
+_COMMA = ord(",")
+_SEMICOLON = ord(";")
+
+# Mouse button masks of the mouse instruction
+BUTTON_LEFT = 1
+BUTTON_MIDDLE = 2
+BUTTON_RIGHT = 4
+BUTTON_SCROLL_UP = 8
+BUTTON_SCROLL_DOWN = 16
+
+
+class ProtocolError(ValueError):
+    """The stream is not made of Guacamole instructions."""
+
+
+class Instruction(NamedTuple):
+    # Decoded, as opcodes are short and used to dispatch on
+    opcode: str
+    # Slices of the data fed to the parser, valid as long as that data is
+    # unchanged. Use arg_str, arg_int or bytes() to convert them.
+    args: tuple[memoryview, ...]
+
+
+_new_instruction = tuple.__new__
+
+
+def arg_str(arg: memoryview) -> str:
+    return str(arg, "utf-8")
+
+
+def arg_int(arg: memoryview) -> int:
+    return int(arg)
+
+
+class InstructionParser:
+    """Parses a Guacamole instruction stream incrementally.
+
+    ``feed`` takes the next chunk of the stream and yields the instructions
+    completed by it. An instruction split across chunks is yielded once its
+    end arrives: only it is copied, along with just enough of the next chunk
+    to complete it. Everything else is sliced out of the chunks, so a caller
+    that mutates a chunk after feeding it (a reused bytearray, say) must be
+    done with its instructions first.
+
+    ``max_instruction_size`` bounds how much of an unfinished instruction is
+    kept, so that a stream that is not Guacamole cannot exhaust memory.
+    """
+
+    def __init__(self, max_instruction_size: int = 16 * 1024 * 1024):
+        self.max_instruction_size = max_instruction_size
+        # The start of an instruction that the last chunk ended partway through
+        self._pending = b""
+
+    @property
+    def pending_bytes(self) -> int:
+        """Bytes of an unfinished instruction waiting for the next chunk."""
+        return len(self._pending)
+
+    def feed(self, data: bytes | bytearray | memoryview) -> Iterator[Instruction]:
+        view = memoryview(data).cast("B")
+        position = 0
+
+        if self._pending:
+            # Join the unfinished instruction with as little of the chunk as
+            # completes it, as far as the lengths parsed so far tell
+            needed = len(self._pending) + 1
+            while True:
+                joined = self._pending + view[: needed - len(self._pending)]
+                instruction, end = _parse(memoryview(joined), 0, _is_ascii(joined))
+                if instruction is not None:
+                    position = end - len(self._pending)
+                    self._pending = b""
+                    yield instruction
+                    break
+                if len(joined) - len(self._pending) >= len(view):
+                    self._keep(joined)
+                    return
+                needed = end
+
+        ascii = _is_ascii(data if isinstance(data, (bytes, bytearray)) else view)
+        while True:
+            instruction, end = _parse(view, position, ascii)
+            if instruction is None:
+                break
+            position = end
+            yield instruction
+        self._keep(bytes(view[position:]))
+
+    def _keep(self, pending: bytes) -> None:
+        if len(pending) > self.max_instruction_size:
+            raise ProtocolError(
+                f"Instruction longer than {self.max_instruction_size} bytes"
+            )
+        self._pending = pending
+
+
+def parse_all(data: bytes | bytearray | memoryview) -> list[Instruction]:
+    """The instructions of a complete stream."""
+    parser = InstructionParser()
+    instructions = list(parser.feed(data))
+    if parser.pending_bytes:
+        raise ProtocolError("The stream ends partway through an instruction")
+    return instructions
+
+
+def _is_ascii(buffer: bytes | bytearray | memoryview) -> bool:
+    if isinstance(buffer, (bytes, bytearray)):
+        return buffer.isascii()  # Much faster than searching
+    return _NON_ASCII.search(buffer) is None
+
+
+def _parse(
+    view: memoryview, position: int, ascii: bool, _match=_ELEMENT_HEADER.match
+) -> tuple[Instruction | None, int]:
+    """The instruction at ``position`` and the position after it. If the
+    buffer ends before the instruction does, None and the smallest buffer size
+    that could complete it. ``ascii`` says the buffer is all ASCII, so that
+    lengths in characters are lengths in bytes."""
+    elements = []
+    size = len(view)
+    while True:
+        header = _match(view, position)
+        if header is None:
+            if _PARTIAL_HEADER.match(view, position):
+                return None, size + 1
+            raise ProtocolError(f"Expected an element length at byte {position}")
+
+        start = header.end()
+        end = start + int(header[1])
+        if not ascii:
+            end = _utf8_end(view, start, end)
+        if end >= size:
+            return None, end + 1
+
+        elements.append(view[start:end])
+        position = end + 1
+        terminator = view[end]
+        if terminator == _SEMICOLON:
+            opcode = str(elements.pop(0), "utf-8")
+            # Faster than Instruction(), which matters for small instructions
+            return _new_instruction(Instruction, (opcode, tuple(elements))), position
+        if terminator != _COMMA:
+            raise ProtocolError(f"Expected ',' or ';' at byte {end}")
+
+
+def _utf8_end(view: memoryview, start: int, end: int) -> int:
+    """Where a value of ``end - start`` characters starting at ``start`` ends,
+    counting each multi-byte character as one."""
+    characters, size = end - start, len(view)
+    while True:
+        extended = start + characters + len(_CONTINUATION.findall(view, start, end))
+        # The rest of a multi-byte character that the value ends with
+        while extended < size and view[extended] & 0xC0 == 0x80:
+            extended += 1
+        if extended == end or extended >= size:
+            return extended
+        end = extended
+
+
+def encode_instruction(opcode: str, *args: str | int) -> bytes:
+    """An instruction, with each element's length counted in characters."""
+    elements = [str(element) for element in (opcode, *args)]
+    return (
+        ",".join(f"{len(element)}.{element}" for element in elements) + ";"
+    ).encode()
+
+
+def encode_key(keysym: int, pressed: bool) -> bytes:
+    """A key press or release, by X11 keysym."""
+    keysym = str(keysym)
+    return f"3.key,{len(keysym)}.{keysym},1.{int(pressed)};".encode()
+
+
+def encode_mouse(x: int, y: int, buttons: int = 0) -> bytes:
+    """The mouse position and the mask of the buttons held (BUTTON_*)."""
+    x, y, buttons = str(x), str(y), str(buttons)
+    return f"5.mouse,{len(x)}.{x},{len(y)}.{y},{len(buttons)}.{buttons};".encode()
+
+
+def encode_sync(timestamp: int) -> bytes:
+    """Acknowledges the frame that ended with a sync of ``timestamp``."""
+    timestamp = str(timestamp)
+    return f"4.sync,{len(timestamp)}.{timestamp};".encode()
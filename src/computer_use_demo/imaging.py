@@ -0,0 +1,136 @@
+"""
+Helpers for converting screenshots between base64-encoded images and pixel arrays.
+"""
+
+import base64
+import io
+
+import numpy as np
+from PIL import Image
+
+# Base64 prefixes of the image formats the capture engines produce
+_MEDIA_TYPE_PREFIXES = {
+    "iVBORw0KGgo": "image/png",
+    "/9j/": "image/jpeg",
+    "UklGR": "image/webp",
+}
+# The longest side the API accepts for an image
+MAX_IMAGE_EDGE = 8000
+
+
+def media_type_of(base64_image: str) -> str:
+    """The media type of a base64-encoded image, from its magic number."""
+    for prefix, media_type in _MEDIA_TYPE_PREFIXES.items():
+        if base64_image.startswith(prefix):
+            return media_type
+    return "image/png"
+
+
+def encode_png(pixels: np.ndarray, compress_level: int = 6) -> str:
+    """Encode an (height, width, 3) uint8 RGB array as a base64 PNG."""
+    buffer = io.BytesIO()
+    Image.fromarray(pixels, mode="RGB").save(
+        buffer, format="PNG", compress_level=compress_level
+    )
+    return base64.b64encode(buffer.getvalue()).decode("ascii")
+
+
+def decode_image(base64_image: str) -> np.ndarray:
+    """Decode a base64-encoded image into an (height, width, 3) uint8 RGB array."""
+    with Image.open(io.BytesIO(base64.b64decode(base64_image))) as image:
+        return np.asarray(image.convert("RGB"))
+
+
+def perceptual_hash(base64_image: str, hash_size: int = 16) -> int:
+    """Difference hash of an image, as a ``hash_size * hash_size``-bit integer.
+
+    Visually similar screens give hashes that differ in only a few bits, so
+    compare them with ``hamming_distance`` rather than for equality.
+    """
+    with Image.open(io.BytesIO(base64.b64decode(base64_image))) as image:
+        # Lets JPEG decoding skip straight to a reduced size
+        image.draft("L", (hash_size * 8, hash_size * 8))
+        small = image.convert("L").resize(
+            (hash_size + 1, hash_size), Image.Resampling.BOX
+        )
+
+    pixels = np.asarray(small, dtype=np.int16)
+    bits = (pixels[:, 1:] > pixels[:, :-1]).flatten()
+    return int.from_bytes(np.packbits(bits).tobytes(), "big")
+
+
+def hamming_distance(first_hash: int, second_hash: int) -> int:
+    """The number of bits that differ between two perceptual hashes."""
+    return (first_hash ^ second_hash).bit_count()
+
+
+def crop_box(
+    left: float, top: float, right: float, bottom: float, width: int, height: int
+) -> tuple[int, int, int, int]:
+    """The pixels (x1, y1, x2, y2) of a region given as fractions of the width
+    and height of an image, at least one pixel wide and high."""
+    x1, y1 = int(left * width), int(top * height)
+    return (
+        x1,
+        y1,
+        min(max(round(right * width), x1 + 1), width),
+        min(max(round(bottom * height), y1 + 1), height),
+    )
+
+
+def crop(
+    base64_image: str, left: float, top: float, right: float, bottom: float
+) -> str:
+    """Crop an image to a region given as fractions of its width and height."""
+    with Image.open(io.BytesIO(base64.b64decode(base64_image))) as image:
+        box = crop_box(left, top, right, bottom, *image.size)
+        buffer = io.BytesIO()
+        image.crop(box).save(buffer, format="PNG")
+    return base64.b64encode(buffer.getvalue()).decode("ascii")
+
+
+def fit_to_pixel_budget(base64_image: str, max_pixels: int) -> str:
+    """Scale an image, keeping its aspect ratio, to at most ``max_pixels``:
+    larger images are downscaled, and smaller ones enlarged to fill the budget,
+    so that a small region is shown as large as a screenshot. Neither side
+    grows beyond MAX_IMAGE_EDGE."""
+    with Image.open(io.BytesIO(base64.b64decode(base64_image))) as image:
+        width, height = image.size
+        scale = min(
+            (max_pixels / (width * height)) ** 0.5,
+            max(MAX_IMAGE_EDGE / max(width, height), 1),
+        )
+        if int(width * scale) == width and int(height * scale) == height:
+            return base64_image
+
+        size = (max(int(width * scale), 1), max(int(height * scale), 1))
+        buffer = io.BytesIO()
+        image.convert("RGB").resize(size, Image.Resampling.LANCZOS).save(
+            buffer, format="PNG"
+        )
+    return base64.b64encode(buffer.getvalue()).decode("ascii")
+
+
+def image_size(base64_image: str) -> tuple[int, int]:
+    """The width and height of a base64-encoded image, read from its header."""
+    with Image.open(io.BytesIO(base64.b64decode(base64_image))) as image:
+        return image.size
+
+
+def reencode(base64_image: str, format: str, quality: int | None = None) -> str:
+    """Encode an image as ``format`` (png, jpeg or webp), with ``quality`` for
+    the lossy formats, at its own size.
+
+    The image is returned as is when it already has that format, or when
+    re-encoding it would not make it smaller.
+    """
+    if media_type_of(base64_image) == f"image/{format}":
+        return base64_image
+
+    with Image.open(io.BytesIO(base64.b64decode(base64_image))) as image:
+        image = image.convert("RGB")
+    buffer = io.BytesIO()
+    options = {} if quality is None else {"quality": quality}
+    image.save(buffer, format=format.upper(), **options)
+    encoded = base64.b64encode(buffer.getvalue()).decode("ascii")
+    return encoded if len(encoded) < len(base64_image) else base64_image
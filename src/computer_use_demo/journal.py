@@ -0,0 +1,301 @@
+"""
+An append-only journal of the messages of a run, from which a run that was
+interrupted (browser crash, OOM, deploy) can be resumed.
+"""
+
+from pathlib import Path
+from queue import Empty, Queue
+from threading import Event, Thread
+from time import monotonic
+import base64
+import hashlib
+import json
+import logging
+import os
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from anthropic.types.beta import BetaMessageParam
+
+LOGGER = logging.getLogger(__name__)
+
+MESSAGES_FILE = "messages.jsonl"
+IMAGES_DIR = "images"
+
+_EXTENSIONS = {"image/png": "png", "image/jpeg": "jpg", "image/webp": "webp"}
+_MEDIA_TYPES = {extension: media_type for media_type, extension in _EXTENSIONS.items()}
+
+# Screenshots read back on resume by default. A resumed run starts from a
+# fresh screenshot, so the older ones are only context.
+RESUME_IMAGES = 3
+
+_CLOSE = object()
+
+
+class RunJournal:
+    """Journals the messages of a run to ``<directory>/messages.jsonl``.
+
+    Each message is one JSON line. Screenshots are written once, named by the
+    SHA-256 of their content, under ``<directory>/images/`` and the message
+    records only reference them, so repeated frames cost nothing extra.
+
+    Records are written by a background thread, which flushes and fsyncs them
+    after ``fsync_every`` records or ``fsync_interval_s`` seconds, whichever
+    comes first, so journaling adds no latency to a turn. A crash can lose at
+    most the records of the last interval. Use ``RunJournal.load_messages`` to
+    resume from a journal.
+    """
+
+    def __init__(
+        self,
+        directory: str | Path,
+        fsync_interval_s: float = 1.0,
+        fsync_every: int = 32,
+    ):
+        self.directory = Path(directory)
+        self.fsync_interval_s = fsync_interval_s
+        self.fsync_every = fsync_every
+
+        (self.directory / IMAGES_DIR).mkdir(parents=True, exist_ok=True)
+        _truncate_torn_record(self.directory / MESSAGES_FILE)
+        self._file = open(self.directory / MESSAGES_FILE, "a", encoding="utf-8")
+        self._queue: Queue = Queue()
+        self._unsynced_records = 0
+        self._unsynced_images: list[Path] = []
+        self._last_sync = monotonic()
+        self._thread = Thread(target=self._run, name="run-journal", daemon=True)
+        self._thread.start()
+
+    def __enter__(self) -> "RunJournal":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def append(self, message: "BetaMessageParam") -> None:
+        """Queue a message to be journaled.
+
+        The message structure is copied right away, because perform_action
+        later prunes images from messages in place.
+        """
+        self._queue.put(_snapshot(message))
+
+    def flush(self, timeout_s: float = 10.0) -> None:
+        """Block until everything appended so far is on disk, for at most
+        ``timeout_s``. Raises a RuntimeError if the writer thread has stopped,
+        as nothing appended would then be written."""
+        if not self._thread.is_alive():
+            raise RuntimeError("The journal's writer has stopped")
+        done = Event()
+        self._queue.put(done)
+        deadline = monotonic() + timeout_s
+        while not done.wait(timeout=min(max(deadline - monotonic(), 0), 0.1)):
+            if not self._thread.is_alive():
+                raise RuntimeError("The journal's writer stopped before flushing")
+            if monotonic() >= deadline:
+                LOGGER.warning(f"Journal not flushed within {timeout_s} s")
+                return
+
+    def close(self) -> None:
+        if self._thread.is_alive():
+            self._queue.put(_CLOSE)
+            self._thread.join()
+        self._file.close()
+
+    def _run(self) -> None:
+        while True:
+            timeout = max(self._last_sync + self.fsync_interval_s - monotonic(), 0)
+            try:
+                item = self._queue.get(
+                    timeout=timeout if self._unsynced_records else None
+                )
+            except Empty:
+                self._sync()
+                continue
+
+            if item is _CLOSE:
+                self._sync()
+                return
+            if isinstance(item, Event):
+                self._sync()
+                item.set()
+                continue
+
+            try:
+                self._write(item)
+            except (OSError, TypeError, ValueError) as e:
+                LOGGER.error(f"Failed to journal message: {e}")
+                continue
+
+            if (
+                self._unsynced_records >= self.fsync_every
+                or monotonic() - self._last_sync >= self.fsync_interval_s
+            ):
+                self._sync()
+
+    def _write(self, message: dict) -> None:
+        for block in _image_blocks(message):
+            source = block["source"]
+            if source.get("type") != "base64":
+                continue
+            data = source["data"]
+            digest = hashlib.sha256(data.encode("ascii")).hexdigest()
+            extension = _EXTENSIONS.get(source.get("media_type"), "png")
+            path = self.directory / IMAGES_DIR / f"{digest}.{extension}"
+            if not path.exists():
+                temporary = path.with_suffix(".tmp")
+                temporary.write_bytes(base64.b64decode(data))
+                os.replace(temporary, path)
+                self._unsynced_images.append(path)
+            block["source"] = {"type": "journal", "file": path.name}
+
+        self._file.write(json.dumps(message) + "\n")
+        self._unsynced_records += 1
+
+    def _sync(self) -> None:
+        try:
+            # Images first, so that a synced record never references a lost image
+            for path in self._unsynced_images:
+                with open(path, "rb") as image_file:
+                    os.fsync(image_file.fileno())
+            if self._unsynced_images:
+                _fsync_directory(self.directory / IMAGES_DIR)
+
+            self._file.flush()
+            os.fsync(self._file.fileno())
+        except OSError as e:
+            LOGGER.error(f"Failed to sync journal: {e}")
+
+        self._unsynced_images.clear()
+        self._unsynced_records = 0
+        self._last_sync = monotonic()
+
+    @staticmethod
+    def load_messages(
+        directory: str | Path, only_n_most_recent_images: int = RESUME_IMAGES
+    ) -> list["BetaMessageParam"]:
+        """Load the messages of a journal, ready to pass as ``previous_messages``.
+
+        Only ``only_n_most_recent_images`` of the most recent screenshots are
+        read back from disk and older ones are dropped, as perform_action would
+        prune them anyway; 0 reads them all. Records torn by a crash and a
+        trailing assistant message whose tools never ran are discarded.
+        """
+        directory = Path(directory)
+        messages = []
+        with open(directory / MESSAGES_FILE, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    messages.append(json.loads(line))
+                except json.JSONDecodeError:
+                    LOGGER.warning("Ignoring torn journal record")
+
+        # A resumed run journals its task as a user message of its own, right
+        # after the tool results that the loop merged it into
+        merged = []
+        for message in messages:
+            if merged and merged[-1]["role"] == message["role"] == "user":
+                merged[-1]["content"] = _blocks(merged[-1]) + _blocks(message)
+            else:
+                merged.append(message)
+        messages = merged
+
+        # The model will be asked again for actions that never ran
+        if messages and messages[-1]["role"] == "assistant":
+            content = messages[-1]["content"]
+            if any(block.get("type") == "tool_use" for block in content):
+                messages.pop()
+
+        references = [block for message in messages for block in _image_blocks(message)]
+        keep = (
+            len(references)
+            if only_n_most_recent_images <= 0
+            else only_n_most_recent_images
+        )
+        dropped = set(map(id, references[: max(len(references) - keep, 0)]))
+
+        for message in messages:
+            if not isinstance(message["content"], list):
+                continue
+            message["content"] = [
+                item for item in message["content"] if id(item) not in dropped
+            ]
+            for item in message["content"]:
+                if isinstance(item, dict) and isinstance(item.get("content"), list):
+                    item["content"] = [
+                        block for block in item["content"] if id(block) not in dropped
+                    ]
+
+        for block in references:
+            if id(block) in dropped or block["source"].get("type") != "journal":
+                continue
+            path = directory / IMAGES_DIR / block["source"]["file"]
+            block["source"] = {
+                "type": "base64",
+                "media_type": _MEDIA_TYPES.get(path.suffix[1:], "image/png"),
+                "data": base64.b64encode(path.read_bytes()).decode("ascii"),
+            }
+
+        return messages
+
+
+def _snapshot(value):
+    """Copy the dicts and lists of a message, sharing the (immutable) leaves."""
+    if isinstance(value, dict):
+        return {key: _snapshot(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_snapshot(item) for item in value]
+    return value
+
+
+def _blocks(message: dict) -> list:
+    content = message["content"]
+    return [{"type": "text", "text": content}] if isinstance(content, str) else content
+
+
+def _image_blocks(message: dict) -> list[dict]:
+    """The image blocks of a message, including those inside tool results."""
+    blocks = []
+    content = message.get("content")
+    for item in content if isinstance(content, list) else ():
+        if not isinstance(item, dict):
+            continue
+        if item.get("type") == "image":
+            blocks.append(item)
+        elif isinstance(item.get("content"), list):
+            blocks.extend(
+                block
+                for block in item["content"]
+                if isinstance(block, dict) and block.get("type") == "image"
+            )
+    return blocks
+
+
+def _truncate_torn_record(path: Path) -> None:
+    """Cut a record left without its newline by a crash off the end of the
+    journal, so that the next record does not continue its line."""
+    try:
+        f = open(path, "rb+")
+    except FileNotFoundError:
+        return
+    with f:
+        end = size = f.seek(0, os.SEEK_END)
+        while end > 0:
+            start = max(end - 4096, 0)
+            f.seek(start)
+            newline = f.read(end - start).rfind(b"\n")
+            if newline >= 0:
+                end = start + newline + 1
+                break
+            end = start
+        if end < size:
+            LOGGER.warning(f"Truncating a torn record at the end of {path}")
+            f.truncate(end)
+
+
+def _fsync_directory(path: Path) -> None:
+    descriptor = os.open(path, os.O_RDONLY)
+    try:
+        os.fsync(descriptor)
+    finally:
+        os.close(descriptor)
@@ -0,0 +1,132 @@
+"""
+Compiles xdotool-style key combinations ("ctrl+shift+t", "Return", "cmd+l",
+"ctrl+a BackSpace") into the key events that perform them.
+"""
+
+from functools import cache, lru_cache
+
+from .keysym_lookup import load_keysym_map, text_to_keysyms
+from .tools.base_tool import ToolError
+
+KEY_DOWN = 1
+KEY_UP = 0
+
+# Shift, Control, Meta, Alt and Hyper, left and right. Super is not among them:
+# pressed alone, it opens the desktop's launcher.
+SILENT_MODIFIER_KEYSYMS = frozenset(
+    (0xFFE1, 0xFFE2, 0xFFE3, 0xFFE4, 0xFFE7, 0xFFE8, 0xFFE9, 0xFFEA, 0xFFED, 0xFFEE)
+)
+
+# Names the model commonly uses that are not X11 keysym names
+KEY_ALIASES = {
+    "control": "Control_L",
+    "cmd": "Super_L",
+    "command": "Super_L",
+    "super": "Super_L",
+    "win": "Super_L",
+    "windows": "Super_L",
+    "meta": "Super_L",
+    "option": "Alt_L",
+    "enter": "Return",
+    "esc": "Escape",
+    "del": "Delete",
+    "ins": "Insert",
+    "pageup": "Page_Up",
+    "pgup": "Page_Up",
+    "pagedown": "Page_Down",
+    "pgdn": "Page_Down",
+    "capslock": "Caps_Lock",
+    "arrowup": "Up",
+    "arrowdown": "Down",
+    "arrowleft": "Left",
+    "arrowright": "Right",
+}
+
+
+@cache
+def _case_insensitive_index() -> dict[str, int]:
+    """Lowercased keysym names, leaving out those that differ only by case
+    (such as "a" and "A", or "Eacute" and "eacute")."""
+    keysyms_by_name: dict[str, set[int]] = {}
+    for name, keysym in load_keysym_map().items():
+        keysyms_by_name.setdefault(name.lower(), set()).add(keysym)
+    return {
+        name: keysyms.pop()
+        for name, keysyms in keysyms_by_name.items()
+        if len(keysyms) == 1
+    }
+
+
+def keysym_of(name: str) -> int:
+    """Look up the keysym of a single key name, alias or character."""
+    keysym = load_keysym_map().get(name)
+    if keysym is not None:
+        return keysym
+
+    lower_name = name.lower()
+    keysym = _case_insensitive_index().get(
+        KEY_ALIASES.get(lower_name, lower_name).lower()
+    )
+    if keysym is not None:
+        return keysym
+
+    if len(name) == 1:
+        return text_to_keysyms(name)[0]
+
+    raise ToolError(f"Unknown key: '{name}'")
+
+
+def _split_chord(chord: str) -> list[str]:
+    """Split a chord such as "ctrl+shift+t" into key names.
+
+    A "+" that starts a key name is the plus key itself, as in "ctrl++" or "+".
+    """
+    names = []
+    position = 0
+    while position < len(chord):
+        if chord[position] == "+":
+            end = position + 1
+        else:
+            end = chord.find("+", position)
+            end = len(chord) if end == -1 else end
+        names.append(chord[position:end])
+
+        position = end
+        if position < len(chord):
+            # Skip the separator, which must be followed by another key
+            position += 1
+            if position == len(chord):
+                raise ToolError(f"Key combination '{chord}' ends with '+'")
+    return names
+
+
+@lru_cache(maxsize=512)
+def compile_key_combo(combo: str) -> tuple[tuple[int, int], ...]:
+    """Compile a key combination into (KEY_DOWN or KEY_UP, keysym) events.
+
+    Space-separated chords are performed one after the other, as with
+    ``xdotool key``. The keys of each chord are pressed in order and released
+    in reverse order. Raises a ToolError naming any unknown key, before any
+    event is sent.
+    """
+    chords = combo.split()
+    if not chords:
+        if combo == " ":
+            chords = ["space"]
+        else:
+            raise ToolError("No key given")
+
+    events = []
+    for chord in chords:
+        keysyms = [keysym_of(name) for name in _split_chord(chord)]
+        events.extend((KEY_DOWN, keysym) for keysym in keysyms)
+        events.extend((KEY_UP, keysym) for keysym in reversed(keysyms))
+    return tuple(events)
+
+
+def is_modifier_only(combo: str) -> bool:
+    """Whether a key combination presses nothing but modifiers that, by
+    themselves, change nothing on screen."""
+    return all(
+        keysym in SILENT_MODIFIER_KEYSYMS for _, keysym in compile_key_combo(combo)
+    )
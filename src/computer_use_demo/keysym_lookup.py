@@ -1,2138 +1,92 @@
-KEYSYM_MAP = {
-    "VoidSymbol": 16777215,
-    "BackSpace": 65288,
-    "Tab": 65289,
-    "Linefeed": 65290,
-    "Clear": 65291,
-    "Return": 65293,
-    "Pause": 65299,
-    "Scroll_Lock": 65300,
-    "Sys_Req": 65301,
-    "Escape": 65307,
-    "Delete": 65535,
-    "Multi_key": 65312,
-    "Codeinput": 65335,
-    "SingleCandidate": 65340,
-    "MultipleCandidate": 65341,
-    "PreviousCandidate": 65342,
-    "Kanji": 65313,
-    "Muhenkan": 65314,
-    "Henkan_Mode": 65315,
-    "Henkan": 65315,
-    "Romaji": 65316,
-    "Hiragana": 65317,
-    "Katakana": 65318,
-    "Hiragana_Katakana": 65319,
-    "Zenkaku": 65320,
-    "Hankaku": 65321,
-    "Zenkaku_Hankaku": 65322,
-    "Touroku": 65323,
-    "Massyo": 65324,
-    "Kana_Lock": 65325,
-    "Kana_Shift": 65326,
-    "Eisu_Shift": 65327,
-    "Eisu_toggle": 65328,
-    "Kanji_Bangou": 65335,
-    "Zen_Koho": 65341,
-    "Mae_Koho": 65342,
-    "Home": 65360,
-    "Left": 65361,
-    "Up": 65362,
-    "Right": 65363,
-    "Down": 65364,
-    "Prior": 65365,
-    "Page_Up": 65365,
-    "Next": 65366,
-    "Page_Down": 65366,
-    "End": 65367,
-    "Begin": 65368,
-    "Select": 65376,
-    "Print": 65377,
-    "Execute": 65378,
-    "Insert": 65379,
-    "Undo": 65381,
-    "Redo": 65382,
-    "Menu": 65383,
-    "Find": 65384,
-    "Cancel": 65385,
-    "Help": 65386,
-    "Break": 65387,
-    "Mode_switch": 65406,
-    "script_switch": 65406,
-    "Num_Lock": 65407,
-    "KP_Space": 65408,
-    "KP_Tab": 65417,
-    "KP_Enter": 65421,
-    "KP_F1": 65425,
-    "KP_F2": 65426,
-    "KP_F3": 65427,
-    "KP_F4": 65428,
-    "KP_Home": 65429,
-    "KP_Left": 65430,
-    "KP_Up": 65431,
-    "KP_Right": 65432,
-    "KP_Down": 65433,
-    "KP_Prior": 65434,
-    "KP_Page_Up": 65434,
-    "KP_Next": 65435,
-    "KP_Page_Down": 65435,
-    "KP_End": 65436,
-    "KP_Begin": 65437,
-    "KP_Insert": 65438,
-    "KP_Delete": 65439,
-    "KP_Equal": 65469,
-    "KP_Multiply": 65450,
-    "KP_Add": 65451,
-    "KP_Separator": 65452,
-    "KP_Subtract": 65453,
-    "KP_Decimal": 65454,
-    "KP_Divide": 65455,
-    "KP_0": 65456,
-    "KP_1": 65457,
-    "KP_2": 65458,
-    "KP_3": 65459,
-    "KP_4": 65460,
-    "KP_5": 65461,
-    "KP_6": 65462,
-    "KP_7": 65463,
-    "KP_8": 65464,
-    "KP_9": 65465,
-    "F1": 65470,
-    "F2": 65471,
-    "F3": 65472,
-    "F4": 65473,
-    "F5": 65474,
-    "F6": 65475,
-    "F7": 65476,
-    "F8": 65477,
-    "F9": 65478,
-    "F10": 65479,
-    "F11": 65480,
-    "L1": 65480,
-    "F12": 65481,
-    "L2": 65481,
-    "F13": 65482,
-    "L3": 65482,
-    "F14": 65483,
-    "L4": 65483,
-    "F15": 65484,
-    "L5": 65484,
-    "F16": 65485,
-    "L6": 65485,
-    "F17": 65486,
-    "L7": 65486,
-    "F18": 65487,
-    "L8": 65487,
-    "F19": 65488,
-    "L9": 65488,
-    "F20": 65489,
-    "L10": 65489,
-    "F21": 65490,
-    "R1": 65490,
-    "F22": 65491,
-    "R2": 65491,
-    "F23": 65492,
-    "R3": 65492,
-    "F24": 65493,
-    "R4": 65493,
-    "F25": 65494,
-    "R5": 65494,
-    "F26": 65495,
-    "R6": 65495,
-    "F27": 65496,
-    "R7": 65496,
-    "F28": 65497,
-    "R8": 65497,
-    "F29": 65498,
-    "R9": 65498,
-    "F30": 65499,
-    "R10": 65499,
-    "F31": 65500,
-    "R11": 65500,
-    "F32": 65501,
-    "R12": 65501,
-    "F33": 65502,
-    "R13": 65502,
-    "F34": 65503,
-    "R14": 65503,
-    "F35": 65504,
-    "R15": 65504,
-    "shift": 65505,
-    "Shift_L": 65505,
-    "Shift_R": 65506,
-    "ctrl": 65507,
-    "Control_L": 65507,
-    "Control_R": 65508,
-    "Caps_Lock": 65509,
-    "Shift_Lock": 65510,
-    "Meta_L": 65511,
-    "Meta_R": 65512,
-    "alt": 65513,
-    "Alt_L": 65513,
-    "Alt_R": 65514,
-    "Super_L": 65515,
-    "Super_R": 65516,
-    "Hyper_L": 65517,
-    "Hyper_R": 65518,
-    "ISO_Lock": 65025,
-    "ISO_Level2_Latch": 65026,
-    "ISO_Level3_Shift": 65027,
-    "ISO_Level3_Latch": 65028,
-    "ISO_Level3_Lock": 65029,
-    "ISO_Level5_Shift": 65041,
-    "ISO_Level5_Latch": 65042,
-    "ISO_Level5_Lock": 65043,
-    "ISO_Group_Shift": 65406,
-    "ISO_Group_Latch": 65030,
-    "ISO_Group_Lock": 65031,
-    "ISO_Next_Group": 65032,
-    "ISO_Next_Group_Lock": 65033,
-    "ISO_Prev_Group": 65034,
-    "ISO_Prev_Group_Lock": 65035,
-    "ISO_First_Group": 65036,
-    "ISO_First_Group_Lock": 65037,
-    "ISO_Last_Group": 65038,
-    "ISO_Last_Group_Lock": 65039,
-    "ISO_Left_Tab": 65056,
-    "ISO_Move_Line_Up": 65057,
-    "ISO_Move_Line_Down": 65058,
-    "ISO_Partial_Line_Up": 65059,
-    "ISO_Partial_Line_Down": 65060,
-    "ISO_Partial_Space_Left": 65061,
-    "ISO_Partial_Space_Right": 65062,
-    "ISO_Set_Margin_Left": 65063,
-    "ISO_Set_Margin_Right": 65064,
-    "ISO_Release_Margin_Left": 65065,
-    "ISO_Release_Margin_Right": 65066,
-    "ISO_Release_Both_Margins": 65067,
-    "ISO_Fast_Cursor_Left": 65068,
-    "ISO_Fast_Cursor_Right": 65069,
-    "ISO_Fast_Cursor_Up": 65070,
-    "ISO_Fast_Cursor_Down": 65071,
-    "ISO_Continuous_Underline": 65072,
-    "ISO_Discontinuous_Underline": 65073,
-    "ISO_Emphasize": 65074,
-    "ISO_Center_Object": 65075,
-    "ISO_Enter": 65076,
-    "dead_grave": 65104,
-    "dead_acute": 65105,
-    "dead_circumflex": 65106,
-    "dead_tilde": 65107,
-    "dead_perispomeni": 65107,
-    "dead_macron": 65108,
-    "dead_breve": 65109,
-    "dead_abovedot": 65110,
-    "dead_diaeresis": 65111,
-    "dead_abovering": 65112,
-    "dead_doubleacute": 65113,
-    "dead_caron": 65114,
-    "dead_cedilla": 65115,
-    "dead_ogonek": 65116,
-    "dead_iota": 65117,
-    "dead_voiced_sound": 65118,
-    "dead_semivoiced_sound": 65119,
-    "dead_belowdot": 65120,
-    "dead_hook": 65121,
-    "dead_horn": 65122,
-    "dead_stroke": 65123,
-    "dead_abovecomma": 65124,
-    "dead_psili": 65124,
-    "dead_abovereversedcomma": 65125,
-    "dead_dasia": 65125,
-    "dead_doublegrave": 65126,
-    "dead_belowring": 65127,
-    "dead_belowmacron": 65128,
-    "dead_belowcircumflex": 65129,
-    "dead_belowtilde": 65130,
-    "dead_belowbreve": 65131,
-    "dead_belowdiaeresis": 65132,
-    "dead_invertedbreve": 65133,
-    "dead_belowcomma": 65134,
-    "dead_currency": 65135,
-    "dead_lowline": 65168,
-    "dead_aboveverticalline": 65169,
-    "dead_belowverticalline": 65170,
-    "dead_longsolidusoverlay": 65171,
-    "dead_a": 65152,
-    "dead_A": 65153,
-    "dead_e": 65154,
-    "dead_E": 65155,
-    "dead_i": 65156,
-    "dead_I": 65157,
-    "dead_o": 65158,
-    "dead_O": 65159,
-    "dead_u": 65160,
-    "dead_U": 65161,
-    "dead_small_schwa": 65162,
-    "dead_capital_schwa": 65163,
-    "dead_greek": 65164,
-    "First_Virtual_Screen": 65232,
-    "Prev_Virtual_Screen": 65233,
-    "Next_Virtual_Screen": 65234,
-    "Last_Virtual_Screen": 65236,
-    "Terminate_Server": 65237,
-    "AccessX_Enable": 65136,
-    "AccessX_Feedback_Enable": 65137,
-    "RepeatKeys_Enable": 65138,
-    "SlowKeys_Enable": 65139,
-    "BounceKeys_Enable": 65140,
-    "StickyKeys_Enable": 65141,
-    "MouseKeys_Enable": 65142,
-    "MouseKeys_Accel_Enable": 65143,
-    "Overlay1_Enable": 65144,
-    "Overlay2_Enable": 65145,
-    "AudibleBell_Enable": 65146,
-    "Pointer_Left": 65248,
-    "Pointer_Right": 65249,
-    "Pointer_Up": 65250,
-    "Pointer_Down": 65251,
-    "Pointer_UpLeft": 65252,
-    "Pointer_UpRight": 65253,
-    "Pointer_DownLeft": 65254,
-    "Pointer_DownRight": 65255,
-    "Pointer_Button_Dflt": 65256,
-    "Pointer_Button1": 65257,
-    "Pointer_Button2": 65258,
-    "Pointer_Button3": 65259,
-    "Pointer_Button4": 65260,
-    "Pointer_Button5": 65261,
-    "Pointer_DblClick_Dflt": 65262,
-    "Pointer_DblClick1": 65263,
-    "Pointer_DblClick2": 65264,
-    "Pointer_DblClick3": 65265,
-    "Pointer_DblClick4": 65266,
-    "Pointer_DblClick5": 65267,
-    "Pointer_Drag_Dflt": 65268,
-    "Pointer_Drag1": 65269,
-    "Pointer_Drag2": 65270,
-    "Pointer_Drag3": 65271,
-    "Pointer_Drag4": 65272,
-    "Pointer_Drag5": 65277,
-    "Pointer_EnableKeys": 65273,
-    "Pointer_Accelerate": 65274,
-    "Pointer_DfltBtnNext": 65275,
-    "Pointer_DfltBtnPrev": 65276,
-    "ch": 65184,
-    "Ch": 65185,
-    "CH": 65186,
-    "c_h": 65187,
-    "C_h": 65188,
-    "C_H": 65189,
-    "3270_Duplicate": 64769,
-    "3270_FieldMark": 64770,
-    "3270_Right2": 64771,
-    "3270_Left2": 64772,
-    "3270_BackTab": 64773,
-    "3270_EraseEOF": 64774,
-    "3270_EraseInput": 64775,
-    "3270_Reset": 64776,
-    "3270_Quit": 64777,
-    "3270_PA1": 64778,
-    "3270_PA2": 64779,
-    "3270_PA3": 64780,
-    "3270_Test": 64781,
-    "3270_Attn": 64782,
-    "3270_CursorBlink": 64783,
-    "3270_AltCursor": 64784,
-    "3270_KeyClick": 64785,
-    "3270_Jump": 64786,
-    "3270_Ident": 64787,
-    "3270_Rule": 64788,
-    "3270_Copy": 64789,
-    "3270_Play": 64790,
-    "3270_Setup": 64791,
-    "3270_Record": 64792,
-    "3270_ChangeScreen": 64793,
-    "3270_DeleteWord": 64794,
-    "3270_ExSelect": 64795,
-    "3270_CursorSelect": 64796,
-    "3270_PrintScreen": 64797,
-    "3270_Enter": 64798,
-    " ": 32,
-    "space": 32,
-    "!": 33,
-    "exclam": 33,
-    '"': 34,
-    "quotedbl": 34,
-    "#": 35,
-    "numbersign": 35,
-    "$": 36,
-    "dollar": 36,
-    "%": 37,
-    "percent": 37,
-    "&": 38,
-    "ampersand": 38,
-    "'": 39,
-    "apostrophe": 39,
-    "'": 39,
-    "quoteright": 39,
-    "(": 40,
-    "parenleft": 40,
-    ")": 41,
-    "parenright": 41,
-    "*": 42,
-    "asterisk": 42,
-    "+": 43,
-    "plus": 43,
-    ",": 44,
-    "comma": 44,
-    "-": 45,
-    "minus": 45,
-    ".": 46,
-    "period": 46,
-    "/": 47,
-    "slash": 47,
-    "0": 48,
-    "1": 49,
-    "2": 50,
-    "3": 51,
-    "4": 52,
-    "5": 53,
-    "6": 54,
-    "7": 55,
-    "8": 56,
-    "9": 57,
-    ":": 58,
-    "colon": 58,
-    ";": 59,
-    "semicolon": 59,
-    "<": 60,
-    "less": 60,
-    "=": 61,
-    "equal": 61,
-    ">": 62,
-    "greater": 62,
-    "?": 63,
-    "question": 63,
-    "@": 64,
-    "at": 64,
-    "A": 65,
-    "B": 66,
-    "C": 67,
-    "D": 68,
-    "E": 69,
-    "F": 70,
-    "G": 71,
-    "H": 72,
-    "I": 73,
-    "J": 74,
-    "K": 75,
-    "L": 76,
-    "M": 77,
-    "N": 78,
-    "O": 79,
-    "P": 80,
-    "Q": 81,
-    "R": 82,
-    "S": 83,
-    "T": 84,
-    "U": 85,
-    "V": 86,
-    "W": 87,
-    "X": 88,
-    "Y": 89,
-    "Z": 90,
-    "[": 91,
-    "bracketleft": 91,
-    "\\": 92,
-    "backslash": 92,
-    "]": 93,
-    "bracketright": 93,
-    "^": 94,
-    "asciicircum": 94,
-    "_": 95,
-    "underscore": 95,
-    "`": 96,
-    "grave": 96,
-    "quoteleft": 96,
-    "a": 97,
-    "b": 98,
-    "c": 99,
-    "d": 100,
-    "e": 101,
-    "f": 102,
-    "g": 103,
-    "h": 104,
-    "i": 105,
-    "j": 106,
-    "k": 107,
-    "l": 108,
-    "m": 109,
-    "n": 110,
-    "o": 111,
-    "p": 112,
-    "q": 113,
-    "r": 114,
-    "s": 115,
-    "t": 116,
-    "u": 117,
-    "v": 118,
-    "w": 119,
-    "x": 120,
-    "y": 121,
-    "z": 122,
-    "{": 123,
-    "braceleft": 123,
-    "|": 124,
-    "bar": 124,
-    "}": 125,
-    "braceright": 125,
-    "~": 126,
-    "asciitilde": 126,
-    "nobreakspace": 160,
-    "exclamdown": 161,
-    "cent": 162,
-    "sterling": 163,
-    "currency": 164,
-    "yen": 165,
-    "brokenbar": 166,
-    "section": 167,
-    "diaeresis": 168,
-    "copyright": 169,
-    "ordfeminine": 170,
-    "guillemotleft": 171,
-    "notsign": 172,
-    "hyphen": 173,
-    "registered": 174,
-    "macron": 175,
-    "degree": 176,
-    "plusminus": 177,
-    "twosuperior": 178,
-    "threesuperior": 179,
-    "acute": 180,
-    "mu": 181,
-    "paragraph": 182,
-    "periodcentered": 183,
-    "cedilla": 184,
-    "onesuperior": 185,
-    "masculine": 186,
-    "guillemotright": 187,
-    "onequarter": 188,
-    "onehalf": 189,
-    "threequarters": 190,
-    "questiondown": 191,
-    "Agrave": 192,
-    "Aacute": 193,
-    "Acircumflex": 194,
-    "Atilde": 195,
-    "Adiaeresis": 196,
-    "Aring": 197,
-    "AE": 198,
-    "Ccedilla": 199,
-    "Egrave": 200,
-    "Eacute": 201,
-    "Ecircumflex": 202,
-    "Ediaeresis": 203,
-    "Igrave": 204,
-    "Iacute": 205,
-    "Icircumflex": 206,
-    "Idiaeresis": 207,
-    "ETH": 208,
-    "Eth": 208,
-    "Ntilde": 209,
-    "Ograve": 210,
-    "Oacute": 211,
-    "Ocircumflex": 212,
-    "Otilde": 213,
-    "Odiaeresis": 214,
-    "multiply": 215,
-    "Oslash": 216,
-    "Ooblique": 216,
-    "Ugrave": 217,
-    "Uacute": 218,
-    "Ucircumflex": 219,
-    "Udiaeresis": 220,
-    "Yacute": 221,
-    "THORN": 222,
-    "Thorn": 222,
-    "ssharp": 223,
-    "agrave": 224,
-    "aacute": 225,
-    "acircumflex": 226,
-    "atilde": 227,
-    "adiaeresis": 228,
-    "aring": 229,
-    "ae": 230,
-    "ccedilla": 231,
-    "egrave": 232,
-    "eacute": 233,
-    "ecircumflex": 234,
-    "ediaeresis": 235,
-    "igrave": 236,
-    "iacute": 237,
-    "icircumflex": 238,
-    "idiaeresis": 239,
-    "eth": 240,
-    "ntilde": 241,
-    "ograve": 242,
-    "oacute": 243,
-    "ocircumflex": 244,
-    "otilde": 245,
-    "odiaeresis": 246,
-    "division": 247,
-    "oslash": 248,
-    "ooblique": 248,
-    "ugrave": 249,
-    "uacute": 250,
-    "ucircumflex": 251,
-    "udiaeresis": 252,
-    "yacute": 253,
-    "thorn": 254,
-    "ydiaeresis": 255,
-    "Aogonek": 417,
-    "breve": 418,
-    "Lstroke": 419,
-    "Lcaron": 421,
-    "Sacute": 422,
-    "Scaron": 425,
-    "Scedilla": 426,
-    "Tcaron": 427,
-    "Zacute": 428,
-    "Zcaron": 430,
-    "Zabovedot": 431,
-    "aogonek": 433,
-    "ogonek": 434,
-    "lstroke": 435,
-    "lcaron": 437,
-    "sacute": 438,
-    "caron": 439,
-    "scaron": 441,
-    "scedilla": 442,
-    "tcaron": 443,
-    "zacute": 444,
-    "doubleacute": 445,
-    "zcaron": 446,
-    "zabovedot": 447,
-    "Racute": 448,
-    "Abreve": 451,
-    "Lacute": 453,
-    "Cacute": 454,
-    "Ccaron": 456,
-    "Eogonek": 458,
-    "Ecaron": 460,
-    "Dcaron": 463,
-    "Dstroke": 464,
-    "Nacute": 465,
-    "Ncaron": 466,
-    "Odoubleacute": 469,
-    "Rcaron": 472,
-    "Uring": 473,
-    "Udoubleacute": 475,
-    "Tcedilla": 478,
-    "racute": 480,
-    "abreve": 483,
-    "lacute": 485,
-    "cacute": 486,
-    "ccaron": 488,
-    "eogonek": 490,
-    "ecaron": 492,
-    "dcaron": 495,
-    "dstroke": 496,
-    "nacute": 497,
-    "ncaron": 498,
-    "odoubleacute": 501,
-    "rcaron": 504,
-    "uring": 505,
-    "udoubleacute": 507,
-    "tcedilla": 510,
-    "abovedot": 511,
-    "Hstroke": 673,
-    "Hcircumflex": 678,
-    "Iabovedot": 681,
-    "Gbreve": 683,
-    "Jcircumflex": 684,
-    "hstroke": 689,
-    "hcircumflex": 694,
-    "idotless": 697,
-    "gbreve": 699,
-    "jcircumflex": 700,
-    "Cabovedot": 709,
-    "Ccircumflex": 710,
-    "Gabovedot": 725,
-    "Gcircumflex": 728,
-    "Ubreve": 733,
-    "Scircumflex": 734,
-    "cabovedot": 741,
-    "ccircumflex": 742,
-    "gabovedot": 757,
-    "gcircumflex": 760,
-    "ubreve": 765,
-    "scircumflex": 766,
-    "kra": 930,
-    "kappa": 930,
-    "Rcedilla": 931,
-    "Itilde": 933,
-    "Lcedilla": 934,
-    "Emacron": 938,
-    "Gcedilla": 939,
-    "Tslash": 940,
-    "rcedilla": 947,
-    "itilde": 949,
-    "lcedilla": 950,
-    "emacron": 954,
-    "gcedilla": 955,
-    "tslash": 956,
-    "ENG": 957,
-    "eng": 959,
-    "Amacron": 960,
-    "Iogonek": 967,
-    "Eabovedot": 972,
-    "Imacron": 975,
-    "Ncedilla": 977,
-    "Omacron": 978,
-    "Kcedilla": 979,
-    "Uogonek": 985,
-    "Utilde": 989,
-    "Umacron": 990,
-    "amacron": 992,
-    "iogonek": 999,
-    "eabovedot": 1004,
-    "imacron": 1007,
-    "ncedilla": 1009,
-    "omacron": 1010,
-    "kcedilla": 1011,
-    "uogonek": 1017,
-    "utilde": 1021,
-    "umacron": 1022,
-    "Wcircumflex": 16777588,
-    "wcircumflex": 16777589,
-    "Ycircumflex": 16777590,
-    "ycircumflex": 16777591,
-    "Babovedot": 16784898,
-    "babovedot": 16784899,
-    "Dabovedot": 16784906,
-    "dabovedot": 16784907,
-    "Fabovedot": 16784926,
-    "fabovedot": 16784927,
-    "Mabovedot": 16784960,
-    "mabovedot": 16784961,
-    "Pabovedot": 16784982,
-    "pabovedot": 16784983,
-    "Sabovedot": 16784992,
-    "sabovedot": 16784993,
-    "Tabovedot": 16785002,
-    "tabovedot": 16785003,
-    "Wgrave": 16785024,
-    "wgrave": 16785025,
-    "Wacute": 16785026,
-    "wacute": 16785027,
-    "Wdiaeresis": 16785028,
-    "wdiaeresis": 16785029,
-    "Ygrave": 16785138,
-    "ygrave": 16785139,
-    "OE": 5052,
-    "oe": 5053,
-    "Ydiaeresis": 5054,
-    "overline": 1150,
-    "kana_fullstop": 1185,
-    "kana_openingbracket": 1186,
-    "kana_closingbracket": 1187,
-    "kana_comma": 1188,
-    "kana_conjunctive": 1189,
-    "kana_middledot": 1189,
-    "kana_WO": 1190,
-    "kana_a": 1191,
-    "kana_i": 1192,
-    "kana_u": 1193,
-    "kana_e": 1194,
-    "kana_o": 1195,
-    "kana_ya": 1196,
-    "kana_yu": 1197,
-    "kana_yo": 1198,
-    "kana_tsu": 1199,
-    "kana_tu": 1199,
-    "prolongedsound": 1200,
-    "kana_A": 1201,
-    "kana_I": 1202,
-    "kana_U": 1203,
-    "kana_E": 1204,
-    "kana_O": 1205,
-    "kana_KA": 1206,
-    "kana_KI": 1207,
-    "kana_KU": 1208,
-    "kana_KE": 1209,
-    "kana_KO": 1210,
-    "kana_SA": 1211,
-    "kana_SHI": 1212,
-    "kana_SU": 1213,
-    "kana_SE": 1214,
-    "kana_SO": 1215,
-    "kana_TA": 1216,
-    "kana_CHI": 1217,
-    "kana_TI": 1217,
-    "kana_TSU": 1218,
-    "kana_TU": 1218,
-    "kana_TE": 1219,
-    "kana_TO": 1220,
-    "kana_NA": 1221,
-    "kana_NI": 1222,
-    "kana_NU": 1223,
-    "kana_NE": 1224,
-    "kana_NO": 1225,
-    "kana_HA": 1226,
-    "kana_HI": 1227,
-    "kana_FU": 1228,
-    "kana_HU": 1228,
-    "kana_HE": 1229,
-    "kana_HO": 1230,
-    "kana_MA": 1231,
-    "kana_MI": 1232,
-    "kana_MU": 1233,
-    "kana_ME": 1234,
-    "kana_MO": 1235,
-    "kana_YA": 1236,
-    "kana_YU": 1237,
-    "kana_YO": 1238,
-    "kana_RA": 1239,
-    "kana_RI": 1240,
-    "kana_RU": 1241,
-    "kana_RE": 1242,
-    "kana_RO": 1243,
-    "kana_WA": 1244,
-    "kana_N": 1245,
-    "voicedsound": 1246,
-    "semivoicedsound": 1247,
-    "kana_switch": 65406,
-    "Farsi_0": 16778992,
-    "Farsi_1": 16778993,
-    "Farsi_2": 16778994,
-    "Farsi_3": 16778995,
-    "Farsi_4": 16778996,
-    "Farsi_5": 16778997,
-    "Farsi_6": 16778998,
-    "Farsi_7": 16778999,
-    "Farsi_8": 16779000,
-    "Farsi_9": 16779001,
-    "Arabic_percent": 16778858,
-    "Arabic_superscript_alef": 16778864,
-    "Arabic_tteh": 16778873,
-    "Arabic_peh": 16778878,
-    "Arabic_tcheh": 16778886,
-    "Arabic_ddal": 16778888,
-    "Arabic_rreh": 16778897,
-    "Arabic_comma": 1452,
-    "Arabic_fullstop": 16778964,
-    "Arabic_0": 16778848,
-    "Arabic_1": 16778849,
-    "Arabic_2": 16778850,
-    "Arabic_3": 16778851,
-    "Arabic_4": 16778852,
-    "Arabic_5": 16778853,
-    "Arabic_6": 16778854,
-    "Arabic_7": 16778855,
-    "Arabic_8": 16778856,
-    "Arabic_9": 16778857,
-    "Arabic_semicolon": 1467,
-    "Arabic_question_mark": 1471,
-    "Arabic_hamza": 1473,
-    "Arabic_maddaonalef": 1474,
-    "Arabic_hamzaonalef": 1475,
-    "Arabic_hamzaonwaw": 1476,
-    "Arabic_hamzaunderalef": 1477,
-    "Arabic_hamzaonyeh": 1478,
-    "Arabic_alef": 1479,
-    "Arabic_beh": 1480,
-    "Arabic_tehmarbuta": 1481,
-    "Arabic_teh": 1482,
-    "Arabic_theh": 1483,
-    "Arabic_jeem": 1484,
-    "Arabic_hah": 1485,
-    "Arabic_khah": 1486,
-    "Arabic_dal": 1487,
-    "Arabic_thal": 1488,
-    "Arabic_ra": 1489,
-    "Arabic_zain": 1490,
-    "Arabic_seen": 1491,
-    "Arabic_sheen": 1492,
-    "Arabic_sad": 1493,
-    "Arabic_dad": 1494,
-    "Arabic_tah": 1495,
-    "Arabic_zah": 1496,
-    "Arabic_ain": 1497,
-    "Arabic_ghain": 1498,
-    "Arabic_tatweel": 1504,
-    "Arabic_feh": 1505,
-    "Arabic_qaf": 1506,
-    "Arabic_kaf": 1507,
-    "Arabic_lam": 1508,
-    "Arabic_meem": 1509,
-    "Arabic_noon": 1510,
-    "Arabic_ha": 1511,
-    "Arabic_heh": 1511,
-    "Arabic_waw": 1512,
-    "Arabic_alefmaksura": 1513,
-    "Arabic_yeh": 1514,
-    "Arabic_fathatan": 1515,
-    "Arabic_dammatan": 1516,
-    "Arabic_kasratan": 1517,
-    "Arabic_fatha": 1518,
-    "Arabic_damma": 1519,
-    "Arabic_kasra": 1520,
-    "Arabic_shadda": 1521,
-    "Arabic_sukun": 1522,
-    "Arabic_madda_above": 16778835,
-    "Arabic_hamza_above": 16778836,
-    "Arabic_hamza_below": 16778837,
-    "Arabic_jeh": 16778904,
-    "Arabic_veh": 16778916,
-    "Arabic_keheh": 16778921,
-    "Arabic_gaf": 16778927,
-    "Arabic_noon_ghunna": 16778938,
-    "Arabic_heh_doachashmee": 16778942,
-    "Farsi_yeh": 16778956,
-    "Arabic_farsi_yeh": 16778956,
-    "Arabic_yeh_baree": 16778962,
-    "Arabic_heh_goal": 16778945,
-    "Arabic_switch": 65406,
-    "Cyrillic_GHE_bar": 16778386,
-    "Cyrillic_ghe_bar": 16778387,
-    "Cyrillic_ZHE_descender": 16778390,
-    "Cyrillic_zhe_descender": 16778391,
-    "Cyrillic_KA_descender": 16778394,
-    "Cyrillic_ka_descender": 16778395,
-    "Cyrillic_KA_vertstroke": 16778396,
-    "Cyrillic_ka_vertstroke": 16778397,
-    "Cyrillic_EN_descender": 16778402,
-    "Cyrillic_en_descender": 16778403,
-    "Cyrillic_U_straight": 16778414,
-    "Cyrillic_u_straight": 16778415,
-    "Cyrillic_U_straight_bar": 16778416,
-    "Cyrillic_u_straight_bar": 16778417,
-    "Cyrillic_HA_descender": 16778418,
-    "Cyrillic_ha_descender": 16778419,
-    "Cyrillic_CHE_descender": 16778422,
-    "Cyrillic_che_descender": 16778423,
-    "Cyrillic_CHE_vertstroke": 16778424,
-    "Cyrillic_che_vertstroke": 16778425,
-    "Cyrillic_SHHA": 16778426,
-    "Cyrillic_shha": 16778427,
-    "Cyrillic_SCHWA": 16778456,
-    "Cyrillic_schwa": 16778457,
-    "Cyrillic_I_macron": 16778466,
-    "Cyrillic_i_macron": 16778467,
-    "Cyrillic_O_bar": 16778472,
-    "Cyrillic_o_bar": 16778473,
-    "Cyrillic_U_macron": 16778478,
-    "Cyrillic_u_macron": 16778479,
-    "Serbian_dje": 1697,
-    "Macedonia_gje": 1698,
-    "Cyrillic_io": 1699,
-    "Ukrainian_ie": 1700,
-    "Ukranian_je": 1700,
-    "Macedonia_dse": 1701,
-    "Ukrainian_i": 1702,
-    "Ukranian_i": 1702,
-    "Ukrainian_yi": 1703,
-    "Ukranian_yi": 1703,
-    "Cyrillic_je": 1704,
-    "Serbian_je": 1704,
-    "Cyrillic_lje": 1705,
-    "Serbian_lje": 1705,
-    "Cyrillic_nje": 1706,
-    "Serbian_nje": 1706,
-    "Serbian_tshe": 1707,
-    "Macedonia_kje": 1708,
-    "Ukrainian_ghe_with_upturn": 1709,
-    "Byelorussian_shortu": 1710,
-    "Cyrillic_dzhe": 1711,
-    "Serbian_dze": 1711,
-    "numerosign": 1712,
-    "Serbian_DJE": 1713,
-    "Macedonia_GJE": 1714,
-    "Cyrillic_IO": 1715,
-    "Ukrainian_IE": 1716,
-    "Ukranian_JE": 1716,
-    "Macedonia_DSE": 1717,
-    "Ukrainian_I": 1718,
-    "Ukranian_I": 1718,
-    "Ukrainian_YI": 1719,
-    "Ukranian_YI": 1719,
-    "Cyrillic_JE": 1720,
-    "Serbian_JE": 1720,
-    "Cyrillic_LJE": 1721,
-    "Serbian_LJE": 1721,
-    "Cyrillic_NJE": 1722,
-    "Serbian_NJE": 1722,
-    "Serbian_TSHE": 1723,
-    "Macedonia_KJE": 1724,
-    "Ukrainian_GHE_WITH_UPTURN": 1725,
-    "Byelorussian_SHORTU": 1726,
-    "Cyrillic_DZHE": 1727,
-    "Serbian_DZE": 1727,
-    "Cyrillic_yu": 1728,
-    "Cyrillic_a": 1729,
-    "Cyrillic_be": 1730,
-    "Cyrillic_tse": 1731,
-    "Cyrillic_de": 1732,
-    "Cyrillic_ie": 1733,
-    "Cyrillic_ef": 1734,
-    "Cyrillic_ghe": 1735,
-    "Cyrillic_ha": 1736,
-    "Cyrillic_i": 1737,
-    "Cyrillic_shorti": 1738,
-    "Cyrillic_ka": 1739,
-    "Cyrillic_el": 1740,
-    "Cyrillic_em": 1741,
-    "Cyrillic_en": 1742,
-    "Cyrillic_o": 1743,
-    "Cyrillic_pe": 1744,
-    "Cyrillic_ya": 1745,
-    "Cyrillic_er": 1746,
-    "Cyrillic_es": 1747,
-    "Cyrillic_te": 1748,
-    "Cyrillic_u": 1749,
-    "Cyrillic_zhe": 1750,
-    "Cyrillic_ve": 1751,
-    "Cyrillic_softsign": 1752,
-    "Cyrillic_yeru": 1753,
-    "Cyrillic_ze": 1754,
-    "Cyrillic_sha": 1755,
-    "Cyrillic_e": 1756,
-    "Cyrillic_shcha": 1757,
-    "Cyrillic_che": 1758,
-    "Cyrillic_hardsign": 1759,
-    "Cyrillic_YU": 1760,
-    "Cyrillic_A": 1761,
-    "Cyrillic_BE": 1762,
-    "Cyrillic_TSE": 1763,
-    "Cyrillic_DE": 1764,
-    "Cyrillic_IE": 1765,
-    "Cyrillic_EF": 1766,
-    "Cyrillic_GHE": 1767,
-    "Cyrillic_HA": 1768,
-    "Cyrillic_I": 1769,
-    "Cyrillic_SHORTI": 1770,
-    "Cyrillic_KA": 1771,
-    "Cyrillic_EL": 1772,
-    "Cyrillic_EM": 1773,
-    "Cyrillic_EN": 1774,
-    "Cyrillic_O": 1775,
-    "Cyrillic_PE": 1776,
-    "Cyrillic_YA": 1777,
-    "Cyrillic_ER": 1778,
-    "Cyrillic_ES": 1779,
-    "Cyrillic_TE": 1780,
-    "Cyrillic_U": 1781,
-    "Cyrillic_ZHE": 1782,
-    "Cyrillic_VE": 1783,
-    "Cyrillic_SOFTSIGN": 1784,
-    "Cyrillic_YERU": 1785,
-    "Cyrillic_ZE": 1786,
-    "Cyrillic_SHA": 1787,
-    "Cyrillic_E": 1788,
-    "Cyrillic_SHCHA": 1789,
-    "Cyrillic_CHE": 1790,
-    "Cyrillic_HARDSIGN": 1791,
-    "Greek_ALPHAaccent": 1953,
-    "Greek_EPSILONaccent": 1954,
-    "Greek_ETAaccent": 1955,
-    "Greek_IOTAaccent": 1956,
-    "Greek_IOTAdieresis": 1957,
-    "Greek_IOTAdiaeresis": 1957,
-    "Greek_OMICRONaccent": 1959,
-    "Greek_UPSILONaccent": 1960,
-    "Greek_UPSILONdieresis": 1961,
-    "Greek_OMEGAaccent": 1963,
-    "Greek_accentdieresis": 1966,
-    "Greek_horizbar": 1967,
-    "Greek_alphaaccent": 1969,
-    "Greek_epsilonaccent": 1970,
-    "Greek_etaaccent": 1971,
-    "Greek_iotaaccent": 1972,
-    "Greek_iotadieresis": 1973,
-    "Greek_iotaaccentdieresis": 1974,
-    "Greek_omicronaccent": 1975,
-    "Greek_upsilonaccent": 1976,
-    "Greek_upsilondieresis": 1977,
-    "Greek_upsilonaccentdieresis": 1978,
-    "Greek_omegaaccent": 1979,
-    "Greek_ALPHA": 1985,
-    "Greek_BETA": 1986,
-    "Greek_GAMMA": 1987,
-    "Greek_DELTA": 1988,
-    "Greek_EPSILON": 1989,
-    "Greek_ZETA": 1990,
-    "Greek_ETA": 1991,
-    "Greek_THETA": 1992,
-    "Greek_IOTA": 1993,
-    "Greek_KAPPA": 1994,
-    "Greek_LAMDA": 1995,
-    "Greek_LAMBDA": 1995,
-    "Greek_MU": 1996,
-    "Greek_NU": 1997,
-    "Greek_XI": 1998,
-    "Greek_OMICRON": 1999,
-    "Greek_PI": 2000,
-    "Greek_RHO": 2001,
-    "Greek_SIGMA": 2002,
-    "Greek_TAU": 2004,
-    "Greek_UPSILON": 2005,
-    "Greek_PHI": 2006,
-    "Greek_CHI": 2007,
-    "Greek_PSI": 2008,
-    "Greek_OMEGA": 2009,
-    "Greek_alpha": 2017,
-    "Greek_beta": 2018,
-    "Greek_gamma": 2019,
-    "Greek_delta": 2020,
-    "Greek_epsilon": 2021,
-    "Greek_zeta": 2022,
-    "Greek_eta": 2023,
-    "Greek_theta": 2024,
-    "Greek_iota": 2025,
-    "Greek_kappa": 2026,
-    "Greek_lamda": 2027,
-    "Greek_lambda": 2027,
-    "Greek_mu": 2028,
-    "Greek_nu": 2029,
-    "Greek_xi": 2030,
-    "Greek_omicron": 2031,
-    "Greek_pi": 2032,
-    "Greek_rho": 2033,
-    "Greek_sigma": 2034,
-    "Greek_finalsmallsigma": 2035,
-    "Greek_tau": 2036,
-    "Greek_upsilon": 2037,
-    "Greek_phi": 2038,
-    "Greek_chi": 2039,
-    "Greek_psi": 2040,
-    "Greek_omega": 2041,
-    "Greek_switch": 65406,
-    "leftradical": 2209,
-    "topleftradical": 2210,
-    "horizconnector": 2211,
-    "topintegral": 2212,
-    "botintegral": 2213,
-    "vertconnector": 2214,
-    "topleftsqbracket": 2215,
-    "botleftsqbracket": 2216,
-    "toprightsqbracket": 2217,
-    "botrightsqbracket": 2218,
-    "topleftparens": 2219,
-    "botleftparens": 2220,
-    "toprightparens": 2221,
-    "botrightparens": 2222,
-    "leftmiddlecurlybrace": 2223,
-    "rightmiddlecurlybrace": 2224,
-    "topleftsummation": 2225,
-    "botleftsummation": 2226,
-    "topvertsummationconnector": 2227,
-    "botvertsummationconnector": 2228,
-    "toprightsummation": 2229,
-    "botrightsummation": 2230,
-    "rightmiddlesummation": 2231,
-    "lessthanequal": 2236,
-    "notequal": 2237,
-    "greaterthanequal": 2238,
-    "integral": 2239,
-    "therefore": 2240,
-    "variation": 2241,
-    "infinity": 2242,
-    "nabla": 2245,
-    "approximate": 2248,
-    "similarequal": 2249,
-    "ifonlyif": 2253,
-    "implies": 2254,
-    "identical": 2255,
-    "radical": 2262,
-    "includedin": 2266,
-    "includes": 2267,
-    "intersection": 2268,
-    "union": 2269,
-    "logicaland": 2270,
-    "logicalor": 2271,
-    "partialderivative": 2287,
-    "function": 2294,
-    "leftarrow": 2299,
-    "uparrow": 2300,
-    "rightarrow": 2301,
-    "downarrow": 2302,
-    "blank": 2527,
-    "soliddiamond": 2528,
-    "checkerboard": 2529,
-    "ht": 2530,
-    "ff": 2531,
-    "cr": 2532,
-    "lf": 2533,
-    "nl": 2536,
-    "vt": 2537,
-    "lowrightcorner": 2538,
-    "uprightcorner": 2539,
-    "upleftcorner": 2540,
-    "lowleftcorner": 2541,
-    "crossinglines": 2542,
-    "horizlinescan1": 2543,
-    "horizlinescan3": 2544,
-    "horizlinescan5": 2545,
-    "horizlinescan7": 2546,
-    "horizlinescan9": 2547,
-    "leftt": 2548,
-    "rightt": 2549,
-    "bott": 2550,
-    "topt": 2551,
-    "vertbar": 2552,
-    "emspace": 2721,
-    "enspace": 2722,
-    "em3space": 2723,
-    "em4space": 2724,
-    "digitspace": 2725,
-    "punctspace": 2726,
-    "thinspace": 2727,
-    "hairspace": 2728,
-    "emdash": 2729,
-    "endash": 2730,
-    "signifblank": 2732,
-    "ellipsis": 2734,
-    "doubbaselinedot": 2735,
-    "onethird": 2736,
-    "twothirds": 2737,
-    "onefifth": 2738,
-    "twofifths": 2739,
-    "threefifths": 2740,
-    "fourfifths": 2741,
-    "onesixth": 2742,
-    "fivesixths": 2743,
-    "careof": 2744,
-    "figdash": 2747,
-    "leftanglebracket": 2748,
-    "decimalpoint": 2749,
-    "rightanglebracket": 2750,
-    "marker": 2751,
-    "oneeighth": 2755,
-    "threeeighths": 2756,
-    "fiveeighths": 2757,
-    "seveneighths": 2758,
-    "trademark": 2761,
-    "signaturemark": 2762,
-    "trademarkincircle": 2763,
-    "leftopentriangle": 2764,
-    "rightopentriangle": 2765,
-    "emopencircle": 2766,
-    "emopenrectangle": 2767,
-    "leftsinglequotemark": 2768,
-    "rightsinglequotemark": 2769,
-    "leftdoublequotemark": 2770,
-    "rightdoublequotemark": 2771,
-    "prescription": 2772,
-    "permille": 2773,
-    "minutes": 2774,
-    "seconds": 2775,
-    "latincross": 2777,
-    "hexagram": 2778,
-    "filledrectbullet": 2779,
-    "filledlefttribullet": 2780,
-    "filledrighttribullet": 2781,
-    "emfilledcircle": 2782,
-    "emfilledrect": 2783,
-    "enopencircbullet": 2784,
-    "enopensquarebullet": 2785,
-    "openrectbullet": 2786,
-    "opentribulletup": 2787,
-    "opentribulletdown": 2788,
-    "openstar": 2789,
-    "enfilledcircbullet": 2790,
-    "enfilledsqbullet": 2791,
-    "filledtribulletup": 2792,
-    "filledtribulletdown": 2793,
-    "leftpointer": 2794,
-    "rightpointer": 2795,
-    "club": 2796,
-    "diamond": 2797,
-    "heart": 2798,
-    "maltesecross": 2800,
-    "dagger": 2801,
-    "doubledagger": 2802,
-    "checkmark": 2803,
-    "ballotcross": 2804,
-    "musicalsharp": 2805,
-    "musicalflat": 2806,
-    "malesymbol": 2807,
-    "femalesymbol": 2808,
-    "telephone": 2809,
-    "telephonerecorder": 2810,
-    "phonographcopyright": 2811,
-    "caret": 2812,
-    "singlelowquotemark": 2813,
-    "doublelowquotemark": 2814,
-    "cursor": 2815,
-    "leftcaret": 2979,
-    "rightcaret": 2982,
-    "downcaret": 2984,
-    "upcaret": 2985,
-    "overbar": 3008,
-    "downtack": 3010,
-    "upshoe": 3011,
-    "downstile": 3012,
-    "underbar": 3014,
-    "jot": 3018,
-    "quad": 3020,
-    "uptack": 3022,
-    "circle": 3023,
-    "upstile": 3027,
-    "downshoe": 3030,
-    "rightshoe": 3032,
-    "leftshoe": 3034,
-    "lefttack": 3036,
-    "righttack": 3068,
-    "hebrew_doublelowline": 3295,
-    "hebrew_aleph": 3296,
-    "hebrew_bet": 3297,
-    "hebrew_beth": 3297,
-    "hebrew_gimel": 3298,
-    "hebrew_gimmel": 3298,
-    "hebrew_dalet": 3299,
-    "hebrew_daleth": 3299,
-    "hebrew_he": 3300,
-    "hebrew_waw": 3301,
-    "hebrew_zain": 3302,
-    "hebrew_zayin": 3302,
-    "hebrew_chet": 3303,
-    "hebrew_het": 3303,
-    "hebrew_tet": 3304,
-    "hebrew_teth": 3304,
-    "hebrew_yod": 3305,
-    "hebrew_finalkaph": 3306,
-    "hebrew_kaph": 3307,
-    "hebrew_lamed": 3308,
-    "hebrew_finalmem": 3309,
-    "hebrew_mem": 3310,
-    "hebrew_finalnun": 3311,
-    "hebrew_nun": 3312,
-    "hebrew_samech": 3313,
-    "hebrew_samekh": 3313,
-    "hebrew_ayin": 3314,
-    "hebrew_finalpe": 3315,
-    "hebrew_pe": 3316,
-    "hebrew_finalzade": 3317,
-    "hebrew_finalzadi": 3317,
-    "hebrew_zade": 3318,
-    "hebrew_zadi": 3318,
-    "hebrew_qoph": 3319,
-    "hebrew_kuf": 3319,
-    "hebrew_resh": 3320,
-    "hebrew_shin": 3321,
-    "hebrew_taw": 3322,
-    "hebrew_taf": 3322,
-    "Hebrew_switch": 65406,
-    "Thai_kokai": 3489,
-    "Thai_khokhai": 3490,
-    "Thai_khokhuat": 3491,
-    "Thai_khokhwai": 3492,
-    "Thai_khokhon": 3493,
-    "Thai_khorakhang": 3494,
-    "Thai_ngongu": 3495,
-    "Thai_chochan": 3496,
-    "Thai_choching": 3497,
-    "Thai_chochang": 3498,
-    "Thai_soso": 3499,
-    "Thai_chochoe": 3500,
-    "Thai_yoying": 3501,
-    "Thai_dochada": 3502,
-    "Thai_topatak": 3503,
-    "Thai_thothan": 3504,
-    "Thai_thonangmontho": 3505,
-    "Thai_thophuthao": 3506,
-    "Thai_nonen": 3507,
-    "Thai_dodek": 3508,
-    "Thai_totao": 3509,
-    "Thai_thothung": 3510,
-    "Thai_thothahan": 3511,
-    "Thai_thothong": 3512,
-    "Thai_nonu": 3513,
-    "Thai_bobaimai": 3514,
-    "Thai_popla": 3515,
-    "Thai_phophung": 3516,
-    "Thai_fofa": 3517,
-    "Thai_phophan": 3518,
-    "Thai_fofan": 3519,
-    "Thai_phosamphao": 3520,
-    "Thai_moma": 3521,
-    "Thai_yoyak": 3522,
-    "Thai_rorua": 3523,
-    "Thai_ru": 3524,
-    "Thai_loling": 3525,
-    "Thai_lu": 3526,
-    "Thai_wowaen": 3527,
-    "Thai_sosala": 3528,
-    "Thai_sorusi": 3529,
-    "Thai_sosua": 3530,
-    "Thai_hohip": 3531,
-    "Thai_lochula": 3532,
-    "Thai_oang": 3533,
-    "Thai_honokhuk": 3534,
-    "Thai_paiyannoi": 3535,
-    "Thai_saraa": 3536,
-    "Thai_maihanakat": 3537,
-    "Thai_saraaa": 3538,
-    "Thai_saraam": 3539,
-    "Thai_sarai": 3540,
-    "Thai_saraii": 3541,
-    "Thai_saraue": 3542,
-    "Thai_sarauee": 3543,
-    "Thai_sarau": 3544,
-    "Thai_sarauu": 3545,
-    "Thai_phinthu": 3546,
-    "Thai_maihanakat_maitho": 3550,
-    "Thai_baht": 3551,
-    "Thai_sarae": 3552,
-    "Thai_saraae": 3553,
-    "Thai_sarao": 3554,
-    "Thai_saraaimaimuan": 3555,
-    "Thai_saraaimaimalai": 3556,
-    "Thai_lakkhangyao": 3557,
-    "Thai_maiyamok": 3558,
-    "Thai_maitaikhu": 3559,
-    "Thai_maiek": 3560,
-    "Thai_maitho": 3561,
-    "Thai_maitri": 3562,
-    "Thai_maichattawa": 3563,
-    "Thai_thanthakhat": 3564,
-    "Thai_nikhahit": 3565,
-    "Thai_leksun": 3568,
-    "Thai_leknung": 3569,
-    "Thai_leksong": 3570,
-    "Thai_leksam": 3571,
-    "Thai_leksi": 3572,
-    "Thai_lekha": 3573,
-    "Thai_lekhok": 3574,
-    "Thai_lekchet": 3575,
-    "Thai_lekpaet": 3576,
-    "Thai_lekkao": 3577,
-    "Hangul": 65329,
-    "Hangul_Start": 65330,
-    "Hangul_End": 65331,
-    "Hangul_Hanja": 65332,
-    "Hangul_Jamo": 65333,
-    "Hangul_Romaja": 65334,
-    "Hangul_Codeinput": 65335,
-    "Hangul_Jeonja": 65336,
-    "Hangul_Banja": 65337,
-    "Hangul_PreHanja": 65338,
-    "Hangul_PostHanja": 65339,
-    "Hangul_SingleCandidate": 65340,
-    "Hangul_MultipleCandidate": 65341,
-    "Hangul_PreviousCandidate": 65342,
-    "Hangul_Special": 65343,
-    "Hangul_switch": 65406,
-    "Hangul_Kiyeog": 3745,
-    "Hangul_SsangKiyeog": 3746,
-    "Hangul_KiyeogSios": 3747,
-    "Hangul_Nieun": 3748,
-    "Hangul_NieunJieuj": 3749,
-    "Hangul_NieunHieuh": 3750,
-    "Hangul_Dikeud": 3751,
-    "Hangul_SsangDikeud": 3752,
-    "Hangul_Rieul": 3753,
-    "Hangul_RieulKiyeog": 3754,
-    "Hangul_RieulMieum": 3755,
-    "Hangul_RieulPieub": 3756,
-    "Hangul_RieulSios": 3757,
-    "Hangul_RieulTieut": 3758,
-    "Hangul_RieulPhieuf": 3759,
-    "Hangul_RieulHieuh": 3760,
-    "Hangul_Mieum": 3761,
-    "Hangul_Pieub": 3762,
-    "Hangul_SsangPieub": 3763,
-    "Hangul_PieubSios": 3764,
-    "Hangul_Sios": 3765,
-    "Hangul_SsangSios": 3766,
-    "Hangul_Ieung": 3767,
-    "Hangul_Jieuj": 3768,
-    "Hangul_SsangJieuj": 3769,
-    "Hangul_Cieuc": 3770,
-    "Hangul_Khieuq": 3771,
-    "Hangul_Tieut": 3772,
-    "Hangul_Phieuf": 3773,
-    "Hangul_Hieuh": 3774,
-    "Hangul_A": 3775,
-    "Hangul_AE": 3776,
-    "Hangul_YA": 3777,
-    "Hangul_YAE": 3778,
-    "Hangul_EO": 3779,
-    "Hangul_E": 3780,
-    "Hangul_YEO": 3781,
-    "Hangul_YE": 3782,
-    "Hangul_O": 3783,
-    "Hangul_WA": 3784,
-    "Hangul_WAE": 3785,
-    "Hangul_OE": 3786,
-    "Hangul_YO": 3787,
-    "Hangul_U": 3788,
-    "Hangul_WEO": 3789,
-    "Hangul_WE": 3790,
-    "Hangul_WI": 3791,
-    "Hangul_YU": 3792,
-    "Hangul_EU": 3793,
-    "Hangul_YI": 3794,
-    "Hangul_I": 3795,
-    "Hangul_J_Kiyeog": 3796,
-    "Hangul_J_SsangKiyeog": 3797,
-    "Hangul_J_KiyeogSios": 3798,
-    "Hangul_J_Nieun": 3799,
-    "Hangul_J_NieunJieuj": 3800,
-    "Hangul_J_NieunHieuh": 3801,
-    "Hangul_J_Dikeud": 3802,
-    "Hangul_J_Rieul": 3803,
-    "Hangul_J_RieulKiyeog": 3804,
-    "Hangul_J_RieulMieum": 3805,
-    "Hangul_J_RieulPieub": 3806,
-    "Hangul_J_RieulSios": 3807,
-    "Hangul_J_RieulTieut": 3808,
-    "Hangul_J_RieulPhieuf": 3809,
-    "Hangul_J_RieulHieuh": 3810,
-    "Hangul_J_Mieum": 3811,
-    "Hangul_J_Pieub": 3812,
-    "Hangul_J_PieubSios": 3813,
-    "Hangul_J_Sios": 3814,
-    "Hangul_J_SsangSios": 3815,
-    "Hangul_J_Ieung": 3816,
-    "Hangul_J_Jieuj": 3817,
-    "Hangul_J_Cieuc": 3818,
-    "Hangul_J_Khieuq": 3819,
-    "Hangul_J_Tieut": 3820,
-    "Hangul_J_Phieuf": 3821,
-    "Hangul_J_Hieuh": 3822,
-    "Hangul_RieulYeorinHieuh": 3823,
-    "Hangul_SunkyeongeumMieum": 3824,
-    "Hangul_SunkyeongeumPieub": 3825,
-    "Hangul_PanSios": 3826,
-    "Hangul_KkogjiDalrinIeung": 3827,
-    "Hangul_SunkyeongeumPhieuf": 3828,
-    "Hangul_YeorinHieuh": 3829,
-    "Hangul_AraeA": 3830,
-    "Hangul_AraeAE": 3831,
-    "Hangul_J_PanSios": 3832,
-    "Hangul_J_KkogjiDalrinIeung": 3833,
-    "Hangul_J_YeorinHieuh": 3834,
-    "Korean_Won": 3839,
-    "Armenian_ligature_ew": 16778631,
-    "Armenian_full_stop": 16778633,
-    "Armenian_verjaket": 16778633,
-    "Armenian_separation_mark": 16778589,
-    "Armenian_but": 16778589,
-    "Armenian_hyphen": 16778634,
-    "Armenian_yentamna": 16778634,
-    "Armenian_exclam": 16778588,
-    "Armenian_amanak": 16778588,
-    "Armenian_accent": 16778587,
-    "Armenian_shesht": 16778587,
-    "Armenian_question": 16778590,
-    "Armenian_paruyk": 16778590,
-    "Armenian_AYB": 16778545,
-    "Armenian_ayb": 16778593,
-    "Armenian_BEN": 16778546,
-    "Armenian_ben": 16778594,
-    "Armenian_GIM": 16778547,
-    "Armenian_gim": 16778595,
-    "Armenian_DA": 16778548,
-    "Armenian_da": 16778596,
-    "Armenian_YECH": 16778549,
-    "Armenian_yech": 16778597,
-    "Armenian_ZA": 16778550,
-    "Armenian_za": 16778598,
-    "Armenian_E": 16778551,
-    "Armenian_e": 16778599,
-    "Armenian_AT": 16778552,
-    "Armenian_at": 16778600,
-    "Armenian_TO": 16778553,
-    "Armenian_to": 16778601,
-    "Armenian_ZHE": 16778554,
-    "Armenian_zhe": 16778602,
-    "Armenian_INI": 16778555,
-    "Armenian_ini": 16778603,
-    "Armenian_LYUN": 16778556,
-    "Armenian_lyun": 16778604,
-    "Armenian_KHE": 16778557,
-    "Armenian_khe": 16778605,
-    "Armenian_TSA": 16778558,
-    "Armenian_tsa": 16778606,
-    "Armenian_KEN": 16778559,
-    "Armenian_ken": 16778607,
-    "Armenian_HO": 16778560,
-    "Armenian_ho": 16778608,
-    "Armenian_DZA": 16778561,
-    "Armenian_dza": 16778609,
-    "Armenian_GHAT": 16778562,
-    "Armenian_ghat": 16778610,
-    "Armenian_TCHE": 16778563,
-    "Armenian_tche": 16778611,
-    "Armenian_MEN": 16778564,
-    "Armenian_men": 16778612,
-    "Armenian_HI": 16778565,
-    "Armenian_hi": 16778613,
-    "Armenian_NU": 16778566,
-    "Armenian_nu": 16778614,
-    "Armenian_SHA": 16778567,
-    "Armenian_sha": 16778615,
-    "Armenian_VO": 16778568,
-    "Armenian_vo": 16778616,
-    "Armenian_CHA": 16778569,
-    "Armenian_cha": 16778617,
-    "Armenian_PE": 16778570,
-    "Armenian_pe": 16778618,
-    "Armenian_JE": 16778571,
-    "Armenian_je": 16778619,
-    "Armenian_RA": 16778572,
-    "Armenian_ra": 16778620,
-    "Armenian_SE": 16778573,
-    "Armenian_se": 16778621,
-    "Armenian_VEV": 16778574,
-    "Armenian_vev": 16778622,
-    "Armenian_TYUN": 16778575,
-    "Armenian_tyun": 16778623,
-    "Armenian_RE": 16778576,
-    "Armenian_re": 16778624,
-    "Armenian_TSO": 16778577,
-    "Armenian_tso": 16778625,
-    "Armenian_VYUN": 16778578,
-    "Armenian_vyun": 16778626,
-    "Armenian_PYUR": 16778579,
-    "Armenian_pyur": 16778627,
-    "Armenian_KE": 16778580,
-    "Armenian_ke": 16778628,
-    "Armenian_O": 16778581,
-    "Armenian_o": 16778629,
-    "Armenian_FE": 16778582,
-    "Armenian_fe": 16778630,
-    "Armenian_apostrophe": 16778586,
-    "Georgian_an": 16781520,
-    "Georgian_ban": 16781521,
-    "Georgian_gan": 16781522,
-    "Georgian_don": 16781523,
-    "Georgian_en": 16781524,
-    "Georgian_vin": 16781525,
-    "Georgian_zen": 16781526,
-    "Georgian_tan": 16781527,
-    "Georgian_in": 16781528,
-    "Georgian_kan": 16781529,
-    "Georgian_las": 16781530,
-    "Georgian_man": 16781531,
-    "Georgian_nar": 16781532,
-    "Georgian_on": 16781533,
-    "Georgian_par": 16781534,
-    "Georgian_zhar": 16781535,
-    "Georgian_rae": 16781536,
-    "Georgian_san": 16781537,
-    "Georgian_tar": 16781538,
-    "Georgian_un": 16781539,
-    "Georgian_phar": 16781540,
-    "Georgian_khar": 16781541,
-    "Georgian_ghan": 16781542,
-    "Georgian_qar": 16781543,
-    "Georgian_shin": 16781544,
-    "Georgian_chin": 16781545,
-    "Georgian_can": 16781546,
-    "Georgian_jil": 16781547,
-    "Georgian_cil": 16781548,
-    "Georgian_char": 16781549,
-    "Georgian_xan": 16781550,
-    "Georgian_jhan": 16781551,
-    "Georgian_hae": 16781552,
-    "Georgian_he": 16781553,
-    "Georgian_hie": 16781554,
-    "Georgian_we": 16781555,
-    "Georgian_har": 16781556,
-    "Georgian_hoe": 16781557,
-    "Georgian_fi": 16781558,
-    "Xabovedot": 16785034,
-    "Ibreve": 16777516,
-    "Zstroke": 16777653,
-    "Gcaron": 16777702,
-    "Ocaron": 16777681,
-    "Obarred": 16777631,
-    "xabovedot": 16785035,
-    "ibreve": 16777517,
-    "zstroke": 16777654,
-    "gcaron": 16777703,
-    "ocaron": 16777682,
-    "obarred": 16777845,
-    "SCHWA": 16777615,
-    "schwa": 16777817,
-    "EZH": 16777655,
-    "ezh": 16777874,
-    "Lbelowdot": 16784950,
-    "lbelowdot": 16784951,
-    "Abelowdot": 16785056,
-    "abelowdot": 16785057,
-    "Ahook": 16785058,
-    "ahook": 16785059,
-    "Acircumflexacute": 16785060,
-    "acircumflexacute": 16785061,
-    "Acircumflexgrave": 16785062,
-    "acircumflexgrave": 16785063,
-    "Acircumflexhook": 16785064,
-    "acircumflexhook": 16785065,
-    "Acircumflextilde": 16785066,
-    "acircumflextilde": 16785067,
-    "Acircumflexbelowdot": 16785068,
-    "acircumflexbelowdot": 16785069,
-    "Abreveacute": 16785070,
-    "abreveacute": 16785071,
-    "Abrevegrave": 16785072,
-    "abrevegrave": 16785073,
-    "Abrevehook": 16785074,
-    "abrevehook": 16785075,
-    "Abrevetilde": 16785076,
-    "abrevetilde": 16785077,
-    "Abrevebelowdot": 16785078,
-    "abrevebelowdot": 16785079,
-    "Ebelowdot": 16785080,
-    "ebelowdot": 16785081,
-    "Ehook": 16785082,
-    "ehook": 16785083,
-    "Etilde": 16785084,
-    "etilde": 16785085,
-    "Ecircumflexacute": 16785086,
-    "ecircumflexacute": 16785087,
-    "Ecircumflexgrave": 16785088,
-    "ecircumflexgrave": 16785089,
-    "Ecircumflexhook": 16785090,
-    "ecircumflexhook": 16785091,
-    "Ecircumflextilde": 16785092,
-    "ecircumflextilde": 16785093,
-    "Ecircumflexbelowdot": 16785094,
-    "ecircumflexbelowdot": 16785095,
-    "Ihook": 16785096,
-    "ihook": 16785097,
-    "Ibelowdot": 16785098,
-    "ibelowdot": 16785099,
-    "Obelowdot": 16785100,
-    "obelowdot": 16785101,
-    "Ohook": 16785102,
-    "ohook": 16785103,
-    "Ocircumflexacute": 16785104,
-    "ocircumflexacute": 16785105,
-    "Ocircumflexgrave": 16785106,
-    "ocircumflexgrave": 16785107,
-    "Ocircumflexhook": 16785108,
-    "ocircumflexhook": 16785109,
-    "Ocircumflextilde": 16785110,
-    "ocircumflextilde": 16785111,
-    "Ocircumflexbelowdot": 16785112,
-    "ocircumflexbelowdot": 16785113,
-    "Ohornacute": 16785114,
-    "ohornacute": 16785115,
-    "Ohorngrave": 16785116,
-    "ohorngrave": 16785117,
-    "Ohornhook": 16785118,
-    "ohornhook": 16785119,
-    "Ohorntilde": 16785120,
-    "ohorntilde": 16785121,
-    "Ohornbelowdot": 16785122,
-    "ohornbelowdot": 16785123,
-    "Ubelowdot": 16785124,
-    "ubelowdot": 16785125,
-    "Uhook": 16785126,
-    "uhook": 16785127,
-    "Uhornacute": 16785128,
-    "uhornacute": 16785129,
-    "Uhorngrave": 16785130,
-    "uhorngrave": 16785131,
-    "Uhornhook": 16785132,
-    "uhornhook": 16785133,
-    "Uhorntilde": 16785134,
-    "uhorntilde": 16785135,
-    "Uhornbelowdot": 16785136,
-    "uhornbelowdot": 16785137,
-    "Ybelowdot": 16785140,
-    "ybelowdot": 16785141,
-    "Yhook": 16785142,
-    "yhook": 16785143,
-    "Ytilde": 16785144,
-    "ytilde": 16785145,
-    "Ohorn": 16777632,
-    "ohorn": 16777633,
-    "Uhorn": 16777647,
-    "uhorn": 16777648,
-    "EcuSign": 16785568,
-    "ColonSign": 16785569,
-    "CruzeiroSign": 16785570,
-    "FFrancSign": 16785571,
-    "LiraSign": 16785572,
-    "MillSign": 16785573,
-    "NairaSign": 16785574,
-    "PesetaSign": 16785575,
-    "RupeeSign": 16785576,
-    "WonSign": 16785577,
-    "NewSheqelSign": 16785578,
-    "DongSign": 16785579,
-    "EuroSign": 8364,
-    "zerosuperior": 16785520,
-    "foursuperior": 16785524,
-    "fivesuperior": 16785525,
-    "sixsuperior": 16785526,
-    "sevensuperior": 16785527,
-    "eightsuperior": 16785528,
-    "ninesuperior": 16785529,
-    "zerosubscript": 16785536,
-    "onesubscript": 16785537,
-    "twosubscript": 16785538,
-    "threesubscript": 16785539,
-    "foursubscript": 16785540,
-    "fivesubscript": 16785541,
-    "sixsubscript": 16785542,
-    "sevensubscript": 16785543,
-    "eightsubscript": 16785544,
-    "ninesubscript": 16785545,
-    "partdifferential": 16785922,
-    "emptyset": 16785925,
-    "elementof": 16785928,
-    "notelementof": 16785929,
-    "containsas": 16785931,
-    "squareroot": 16785946,
-    "cuberoot": 16785947,
-    "fourthroot": 16785948,
-    "dintegral": 16785964,
-    "tintegral": 16785965,
-    "because": 16785973,
-    "approxeq": 16785992,
-    "notapproxeq": 16785991,
-    "notidentical": 16786018,
-    "stricteq": 16786019,
-    "braille_dot_1": 65521,
-    "braille_dot_2": 65522,
-    "braille_dot_3": 65523,
-    "braille_dot_4": 65524,
-    "braille_dot_5": 65525,
-    "braille_dot_6": 65526,
-    "braille_dot_7": 65527,
-    "braille_dot_8": 65528,
-    "braille_dot_9": 65529,
-    "braille_dot_10": 65530,
-    "braille_blank": 16787456,
-    "braille_dots_1": 16787457,
-    "braille_dots_2": 16787458,
-    "braille_dots_12": 16787459,
-    "braille_dots_3": 16787460,
-    "braille_dots_13": 16787461,
-    "braille_dots_23": 16787462,
-    "braille_dots_123": 16787463,
-    "braille_dots_4": 16787464,
-    "braille_dots_14": 16787465,
-    "braille_dots_24": 16787466,
-    "braille_dots_124": 16787467,
-    "braille_dots_34": 16787468,
-    "braille_dots_134": 16787469,
-    "braille_dots_234": 16787470,
-    "braille_dots_1234": 16787471,
-    "braille_dots_5": 16787472,
-    "braille_dots_15": 16787473,
-    "braille_dots_25": 16787474,
-    "braille_dots_125": 16787475,
-    "braille_dots_35": 16787476,
-    "braille_dots_135": 16787477,
-    "braille_dots_235": 16787478,
-    "braille_dots_1235": 16787479,
-    "braille_dots_45": 16787480,
-    "braille_dots_145": 16787481,
-    "braille_dots_245": 16787482,
-    "braille_dots_1245": 16787483,
-    "braille_dots_345": 16787484,
-    "braille_dots_1345": 16787485,
-    "braille_dots_2345": 16787486,
-    "braille_dots_12345": 16787487,
-    "braille_dots_6": 16787488,
-    "braille_dots_16": 16787489,
-    "braille_dots_26": 16787490,
-    "braille_dots_126": 16787491,
-    "braille_dots_36": 16787492,
-    "braille_dots_136": 16787493,
-    "braille_dots_236": 16787494,
-    "braille_dots_1236": 16787495,
-    "braille_dots_46": 16787496,
-    "braille_dots_146": 16787497,
-    "braille_dots_246": 16787498,
-    "braille_dots_1246": 16787499,
-    "braille_dots_346": 16787500,
-    "braille_dots_1346": 16787501,
-    "braille_dots_2346": 16787502,
-    "braille_dots_12346": 16787503,
-    "braille_dots_56": 16787504,
-    "braille_dots_156": 16787505,
-    "braille_dots_256": 16787506,
-    "braille_dots_1256": 16787507,
-    "braille_dots_356": 16787508,
-    "braille_dots_1356": 16787509,
-    "braille_dots_2356": 16787510,
-    "braille_dots_12356": 16787511,
-    "braille_dots_456": 16787512,
-    "braille_dots_1456": 16787513,
-    "braille_dots_2456": 16787514,
-    "braille_dots_12456": 16787515,
-    "braille_dots_3456": 16787516,
-    "braille_dots_13456": 16787517,
-    "braille_dots_23456": 16787518,
-    "braille_dots_123456": 16787519,
-    "braille_dots_7": 16787520,
-    "braille_dots_17": 16787521,
-    "braille_dots_27": 16787522,
-    "braille_dots_127": 16787523,
-    "braille_dots_37": 16787524,
-    "braille_dots_137": 16787525,
-    "braille_dots_237": 16787526,
-    "braille_dots_1237": 16787527,
-    "braille_dots_47": 16787528,
-    "braille_dots_147": 16787529,
-    "braille_dots_247": 16787530,
-    "braille_dots_1247": 16787531,
-    "braille_dots_347": 16787532,
-    "braille_dots_1347": 16787533,
-    "braille_dots_2347": 16787534,
-    "braille_dots_12347": 16787535,
-    "braille_dots_57": 16787536,
-    "braille_dots_157": 16787537,
-    "braille_dots_257": 16787538,
-    "braille_dots_1257": 16787539,
-    "braille_dots_357": 16787540,
-    "braille_dots_1357": 16787541,
-    "braille_dots_2357": 16787542,
-    "braille_dots_12357": 16787543,
-    "braille_dots_457": 16787544,
-    "braille_dots_1457": 16787545,
-    "braille_dots_2457": 16787546,
-    "braille_dots_12457": 16787547,
-    "braille_dots_3457": 16787548,
-    "braille_dots_13457": 16787549,
-    "braille_dots_23457": 16787550,
-    "braille_dots_123457": 16787551,
-    "braille_dots_67": 16787552,
-    "braille_dots_167": 16787553,
-    "braille_dots_267": 16787554,
-    "braille_dots_1267": 16787555,
-    "braille_dots_367": 16787556,
-    "braille_dots_1367": 16787557,
-    "braille_dots_2367": 16787558,
-    "braille_dots_12367": 16787559,
-    "braille_dots_467": 16787560,
-    "braille_dots_1467": 16787561,
-    "braille_dots_2467": 16787562,
-    "braille_dots_12467": 16787563,
-    "braille_dots_3467": 16787564,
-    "braille_dots_13467": 16787565,
-    "braille_dots_23467": 16787566,
-    "braille_dots_123467": 16787567,
-    "braille_dots_567": 16787568,
-    "braille_dots_1567": 16787569,
-    "braille_dots_2567": 16787570,
-    "braille_dots_12567": 16787571,
-    "braille_dots_3567": 16787572,
-    "braille_dots_13567": 16787573,
-    "braille_dots_23567": 16787574,
-    "braille_dots_123567": 16787575,
-    "braille_dots_4567": 16787576,
-    "braille_dots_14567": 16787577,
-    "braille_dots_24567": 16787578,
-    "braille_dots_124567": 16787579,
-    "braille_dots_34567": 16787580,
-    "braille_dots_134567": 16787581,
-    "braille_dots_234567": 16787582,
-    "braille_dots_1234567": 16787583,
-    "braille_dots_8": 16787584,
-    "braille_dots_18": 16787585,
-    "braille_dots_28": 16787586,
-    "braille_dots_128": 16787587,
-    "braille_dots_38": 16787588,
-    "braille_dots_138": 16787589,
-    "braille_dots_238": 16787590,
-    "braille_dots_1238": 16787591,
-    "braille_dots_48": 16787592,
-    "braille_dots_148": 16787593,
-    "braille_dots_248": 16787594,
-    "braille_dots_1248": 16787595,
-    "braille_dots_348": 16787596,
-    "braille_dots_1348": 16787597,
-    "braille_dots_2348": 16787598,
-    "braille_dots_12348": 16787599,
-    "braille_dots_58": 16787600,
-    "braille_dots_158": 16787601,
-    "braille_dots_258": 16787602,
-    "braille_dots_1258": 16787603,
-    "braille_dots_358": 16787604,
-    "braille_dots_1358": 16787605,
-    "braille_dots_2358": 16787606,
-    "braille_dots_12358": 16787607,
-    "braille_dots_458": 16787608,
-    "braille_dots_1458": 16787609,
-    "braille_dots_2458": 16787610,
-    "braille_dots_12458": 16787611,
-    "braille_dots_3458": 16787612,
-    "braille_dots_13458": 16787613,
-    "braille_dots_23458": 16787614,
-    "braille_dots_123458": 16787615,
-    "braille_dots_68": 16787616,
-    "braille_dots_168": 16787617,
-    "braille_dots_268": 16787618,
-    "braille_dots_1268": 16787619,
-    "braille_dots_368": 16787620,
-    "braille_dots_1368": 16787621,
-    "braille_dots_2368": 16787622,
-    "braille_dots_12368": 16787623,
-    "braille_dots_468": 16787624,
-    "braille_dots_1468": 16787625,
-    "braille_dots_2468": 16787626,
-    "braille_dots_12468": 16787627,
-    "braille_dots_3468": 16787628,
-    "braille_dots_13468": 16787629,
-    "braille_dots_23468": 16787630,
-    "braille_dots_123468": 16787631,
-    "braille_dots_568": 16787632,
-    "braille_dots_1568": 16787633,
-    "braille_dots_2568": 16787634,
-    "braille_dots_12568": 16787635,
-    "braille_dots_3568": 16787636,
-    "braille_dots_13568": 16787637,
-    "braille_dots_23568": 16787638,
-    "braille_dots_123568": 16787639,
-    "braille_dots_4568": 16787640,
-    "braille_dots_14568": 16787641,
-    "braille_dots_24568": 16787642,
-    "braille_dots_124568": 16787643,
-    "braille_dots_34568": 16787644,
-    "braille_dots_134568": 16787645,
-    "braille_dots_234568": 16787646,
-    "braille_dots_1234568": 16787647,
-    "braille_dots_78": 16787648,
-    "braille_dots_178": 16787649,
-    "braille_dots_278": 16787650,
-    "braille_dots_1278": 16787651,
-    "braille_dots_378": 16787652,
-    "braille_dots_1378": 16787653,
-    "braille_dots_2378": 16787654,
-    "braille_dots_12378": 16787655,
-    "braille_dots_478": 16787656,
-    "braille_dots_1478": 16787657,
-    "braille_dots_2478": 16787658,
-    "braille_dots_12478": 16787659,
-    "braille_dots_3478": 16787660,
-    "braille_dots_13478": 16787661,
-    "braille_dots_23478": 16787662,
-    "braille_dots_123478": 16787663,
-    "braille_dots_578": 16787664,
-    "braille_dots_1578": 16787665,
-    "braille_dots_2578": 16787666,
-    "braille_dots_12578": 16787667,
-    "braille_dots_3578": 16787668,
-    "braille_dots_13578": 16787669,
-    "braille_dots_23578": 16787670,
-    "braille_dots_123578": 16787671,
-    "braille_dots_4578": 16787672,
-    "braille_dots_14578": 16787673,
-    "braille_dots_24578": 16787674,
-    "braille_dots_124578": 16787675,
-    "braille_dots_34578": 16787676,
-    "braille_dots_134578": 16787677,
-    "braille_dots_234578": 16787678,
-    "braille_dots_1234578": 16787679,
-    "braille_dots_678": 16787680,
-    "braille_dots_1678": 16787681,
-    "braille_dots_2678": 16787682,
-    "braille_dots_12678": 16787683,
-    "braille_dots_3678": 16787684,
-    "braille_dots_13678": 16787685,
-    "braille_dots_23678": 16787686,
-    "braille_dots_123678": 16787687,
-    "braille_dots_4678": 16787688,
-    "braille_dots_14678": 16787689,
-    "braille_dots_24678": 16787690,
-    "braille_dots_124678": 16787691,
-    "braille_dots_34678": 16787692,
-    "braille_dots_134678": 16787693,
-    "braille_dots_234678": 16787694,
-    "braille_dots_1234678": 16787695,
-    "braille_dots_5678": 16787696,
-    "braille_dots_15678": 16787697,
-    "braille_dots_25678": 16787698,
-    "braille_dots_125678": 16787699,
-    "braille_dots_35678": 16787700,
-    "braille_dots_135678": 16787701,
-    "braille_dots_235678": 16787702,
-    "braille_dots_1235678": 16787703,
-    "braille_dots_45678": 16787704,
-    "braille_dots_145678": 16787705,
-    "braille_dots_245678": 16787706,
-    "braille_dots_1245678": 16787707,
-    "braille_dots_345678": 16787708,
-    "braille_dots_1345678": 16787709,
-    "braille_dots_2345678": 16787710,
-    "braille_dots_12345678": 16787711,
-    "Sinh_ng": 16780674,
-    "Sinh_h2": 16780675,
-    "Sinh_a": 16780677,
-    "Sinh_aa": 16780678,
-    "Sinh_ae": 16780679,
-    "Sinh_aee": 16780680,
-    "Sinh_i": 16780681,
-    "Sinh_ii": 16780682,
-    "Sinh_u": 16780683,
-    "Sinh_uu": 16780684,
-    "Sinh_ri": 16780685,
-    "Sinh_rii": 16780686,
-    "Sinh_lu": 16780687,
-    "Sinh_luu": 16780688,
-    "Sinh_e": 16780689,
-    "Sinh_ee": 16780690,
-    "Sinh_ai": 16780691,
-    "Sinh_o": 16780692,
-    "Sinh_oo": 16780693,
-    "Sinh_au": 16780694,
-    "Sinh_ka": 16780698,
-    "Sinh_kha": 16780699,
-    "Sinh_ga": 16780700,
-    "Sinh_gha": 16780701,
-    "Sinh_ng2": 16780702,
-    "Sinh_nga": 16780703,
-    "Sinh_ca": 16780704,
-    "Sinh_cha": 16780705,
-    "Sinh_ja": 16780706,
-    "Sinh_jha": 16780707,
-    "Sinh_nya": 16780708,
-    "Sinh_jnya": 16780709,
-    "Sinh_nja": 16780710,
-    "Sinh_tta": 16780711,
-    "Sinh_ttha": 16780712,
-    "Sinh_dda": 16780713,
-    "Sinh_ddha": 16780714,
-    "Sinh_nna": 16780715,
-    "Sinh_ndda": 16780716,
-    "Sinh_tha": 16780717,
-    "Sinh_thha": 16780718,
-    "Sinh_dha": 16780719,
-    "Sinh_dhha": 16780720,
-    "Sinh_na": 16780721,
-    "Sinh_ndha": 16780723,
-    "Sinh_pa": 16780724,
-    "Sinh_pha": 16780725,
-    "Sinh_ba": 16780726,
-    "Sinh_bha": 16780727,
-    "Sinh_ma": 16780728,
-    "Sinh_mba": 16780729,
-    "Sinh_ya": 16780730,
-    "Sinh_ra": 16780731,
-    "Sinh_la": 16780733,
-    "Sinh_va": 16780736,
-    "Sinh_sha": 16780737,
-    "Sinh_ssha": 16780738,
-    "Sinh_sa": 16780739,
-    "Sinh_ha": 16780740,
-    "Sinh_lla": 16780741,
-    "Sinh_fa": 16780742,
-    "Sinh_al": 16780746,
-    "Sinh_aa2": 16780751,
-    "Sinh_ae2": 16780752,
-    "Sinh_aee2": 16780753,
-    "Sinh_i2": 16780754,
-    "Sinh_ii2": 16780755,
-    "Sinh_u2": 16780756,
-    "Sinh_uu2": 16780758,
-    "Sinh_ru2": 16780760,
-    "Sinh_e2": 16780761,
-    "Sinh_ee2": 16780762,
-    "Sinh_ai2": 16780763,
-    "Sinh_o2": 16780764,
-    "Sinh_oo2": 16780765,
-    "Sinh_au2": 16780766,
-    "Sinh_lu2": 16780767,
-    "Sinh_ruu2": 16780786,
-    "Sinh_luu2": 16780787,
-    "Sinh_kunddaliya": 16780788,
-}
+"""
+X11 keysyms, as sent in Guacamole key events.
+
+The names of the keysyms are stored in ``keysyms.bin`` and only loaded when a
+key is first looked up by name: a little-endian uint32 count, that many uint32
+keysyms, then the key names sorted and separated by newlines, in the same order.
+``KEYSYM_MAP`` (name to keysym) is built from it on first access.
+"""
+
+from array import array
+from functools import cache
+import os
+import sys
+
+from .tools.base_tool import ToolError
+
+KEYSYM_TABLE = os.path.join(os.path.dirname(__file__), "keysyms.bin")
+
+# X11 maps Unicode characters without a legacy keysym to 0x1000000 + codepoint.
+UNICODE_KEYSYM_OFFSET = 0x1000000
+
+XK_BACKSPACE = 0xFF08
+XK_TAB = 0xFF09
+XK_RETURN = 0xFF0D
+XK_ESCAPE = 0xFF1B
+XK_DELETE = 0xFFFF
+
+# Legacy keysyms of the first 256 codepoints: printable Latin-1 characters map to
+# their own codepoint and control characters to the key that produces them.
+_LATIN1_KEYSYMS = [UNICODE_KEYSYM_OFFSET + codepoint for codepoint in range(256)]
+for _codepoint in [*range(0x20, 0x7F), *range(0xA0, 0x100)]:
+    _LATIN1_KEYSYMS[_codepoint] = _codepoint
+for _char, _keysym in {
+    "\b": XK_BACKSPACE,
+    "\t": XK_TAB,
+    "\n": XK_RETURN,
+    "\r": XK_RETURN,
+    "\x1b": XK_ESCAPE,
+    "\x7f": XK_DELETE,
+}.items():
+    _LATIN1_KEYSYMS[ord(_char)] = _keysym
+
+
+def text_to_keysyms(text: str) -> array:
+    """Translate text into the keysyms that type it, one per character. A
+    Windows line break types a single Return."""
+    try:
+        codepoints = array("I", text.replace("\r\n", "\n").encode("utf-32-le"))
+    except UnicodeEncodeError as e:
+        raise ToolError(f"Cannot type {text[e.start:e.end]!r}: {e.reason}") from e
+    return array(
+        "I",
+        [
+            (
+                _LATIN1_KEYSYMS[codepoint]
+                if codepoint < 256
+                else UNICODE_KEYSYM_OFFSET + codepoint
+            )
+            for codepoint in codepoints
+        ],
+    )
+
+
+@cache
+def load_keysym_map() -> dict[str, int]:
+    """Read the keysym table from ``keysyms.bin``."""
+    with open(KEYSYM_TABLE, "rb") as f:
+        data = f.read()
+    count = int.from_bytes(data[:4], "little")
+    keysyms = array("I", data[4 : 4 + 4 * count])
+    if sys.byteorder != "little":
+        keysyms.byteswap()
+    names = data[4 + 4 * count :].decode("ascii").split("\n")
+    return dict(zip(names, keysyms))
+
+
+def save_keysym_map(keysym_map: dict[str, int], path: str = KEYSYM_TABLE) -> None:
+    """Write a keysym table in the format read by ``load_keysym_map``."""
+    names = sorted(keysym_map)
+    keysyms = array("I", [keysym_map[name] for name in names])
+    if sys.byteorder != "little":
+        keysyms.byteswap()
+    with open(path, "wb") as f:
+        f.write(len(names).to_bytes(4, "little"))
+        f.write(keysyms.tobytes())
+        f.write("\n".join(names).encode("ascii"))
+
+
+def __getattr__(name: str):
+    if name == "KEYSYM_MAP":
+        return load_keysym_map()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -3,7 +3,7 @@ Agentic sampling loop that calls the Anthropic API and local implementation of
 anthropic-defined computer use tools.
 """
 
-from typing import Callable
+from typing import TYPE_CHECKING, Callable
 from anthropic import (
     AnthropicBedrock,
     APIError,
@@ -17,12 +17,21 @@ from anthropic.types.beta import (
     BetaTextBlockParam,
     BetaToolResultBlockParam,
 )
-from time import sleep
+from time import monotonic, sleep
+from uuid import uuid4
 
 from .tools import ToolBox, ToolResult
 from .system_prompt import SYSTEM_PROMPT
+from .usage import ModelPrice, RunBudget, RunUsage, StopReason
 import logging
 
+# Only needed by runs that use them; imaging and frame_archive load NumPy and Pillow
+if TYPE_CHECKING:
+    from .frame_archive import FrameArchive
+    from .journal import RunJournal
+    from .replay_cache import TrajectoryCache
+    from .screenshot_dedup import ScreenshotDeduplicator
+
 LOGGER = logging.getLogger(__name__)
 
 COMPUTER_USE_BETA_FLAG = "computer-use-2024-10-22"
@@ -40,6 +49,13 @@ def perform_action(
     only_n_most_recent_images: int = 0,
     previous_messages: list[BetaMessageParam] | None = None,
     on_new_message_callback: Callable | None = None,
+    turn_delay_ms: int = 1500,
+    trajectory_cache: "TrajectoryCache | None" = None,
+    budget: RunBudget | None = None,
+    usage: RunUsage | None = None,
+    journal: "RunJournal | None" = None,
+    screenshot_deduplicator: "ScreenshotDeduplicator | None" = None,
+    frame_archive: "FrameArchive | None" = None,
 ):
     """Perform an arbitrary action on a computer using the Anthropic API.
 
@@ -63,21 +79,91 @@ def perform_action(
         The previous messages to use as context for the API call.
     on_new_message_callback : Callable, optional
         A callback function to call when a new message is received.
+    turn_delay_ms : int, optional
+        How long to wait after running tools before sending the next request.
+        Load tests against simulated executors can set this to 0.
+    trajectory_cache : TrajectoryCache, optional
+        A cache of actions chosen on earlier runs of the same task. Cached
+        actions are replayed while the screen matches, and the model's choices
+        are recorded into it. Not used when resuming with ``previous_messages``.
+    budget : RunBudget, optional
+        Limits on tokens, estimated cost, turns and wall-clock time. The run
+        stops before the next API call once a limit is reached.
+    usage : RunUsage, optional
+        Accumulates the tokens, images and time used by the run. Pass one in to
+        read it afterwards; its ``stop_reason`` says why the run ended, which
+        is also logged with a summary of the usage.
+    journal : RunJournal, optional
+        Journals every new message to disk, so that the run can be resumed
+        after a crash by passing ``RunJournal.load_messages(...)`` as
+        ``previous_messages``.
+    screenshot_deduplicator : ScreenshotDeduplicator, optional
+        Replaces screenshots that repeat one still in the history with a text
+        reference to it.
+    frame_archive : FrameArchive, optional
+        Archives every screenshot returned by a tool, with the turn it was
+        taken in, even those later pruned from the messages.
     """
+    # Raised by WatchdogExecutor, which only some runs use
+    from .executors.watchdog import CircuitOpenError
+
     messages = previous_messages or []
+    resumed = bool(messages)
+    if usage is None:
+        usage = RunUsage()
+    if usage.price is None:
+        usage.price = ModelPrice.for_model(model)
 
     if not on_new_message_callback:
         on_new_message_callback = lambda _: None
+    if journal is not None:
+        on_new_message_callback = _journaled(on_new_message_callback, journal)
     system = BetaTextBlockParam(type="text", text=SYSTEM_PROMPT + system_prompt_suffix)
 
     initial_message = {
         "role": "user",
         "content": [BetaTextBlockParam(type="text", text=action_description)],
     }
-    messages.append(initial_message)
+    if messages and messages[-1]["role"] == "user":
+        # Resuming after tool results: user turns must alternate with assistant ones
+        messages[-1] = _merged(messages[-1], initial_message)
+    else:
+        messages.append(initial_message)
     on_new_message_callback(initial_message)
 
+    # Perceptual hash of the screen as the model last saw it, and the number
+    # of actions taken so far
+    screen_hash, step = None, 0
+    if resumed and trajectory_cache is not None:
+        # Partway through the task, so its steps do not line up with the cache's
+        LOGGER.info("Not replaying or recording cached actions on a resumed run")
+        trajectory_cache = None
+    if trajectory_cache is not None:
+        fingerprint = trajectory_cache.fingerprint(
+            action_description, toolbox.to_params()
+        )
+        try:
+            screen_hash, step = replay_cached_actions(
+                trajectory_cache=trajectory_cache,
+                fingerprint=fingerprint,
+                toolbox=toolbox,
+                messages=messages,
+                on_new_message_callback=on_new_message_callback,
+                usage=usage,
+                screenshot_deduplicator=screenshot_deduplicator,
+                frame_archive=frame_archive,
+            )
+        except CircuitOpenError as e:
+            LOGGER.error(f"Stopping run: {e}")
+            _stopped(usage, "executor_unavailable")
+            return messages
+
     while True:
+        if budget is not None and (stop_reason := budget.exceeded_by(usage)):
+            LOGGER.warning(f"Stopping run, {stop_reason} reached")
+            _stopped(usage, stop_reason)
+            return messages
+
         # Prune images to only keep the most recent N images
         if only_n_most_recent_images > 0:
             filter_to_n_most_recent_images(
@@ -85,8 +171,11 @@ def perform_action(
                 only_n_most_recent_images,
                 min_removal_threshold=only_n_most_recent_images,
             )
+        if screenshot_deduplicator is not None:
+            screenshot_deduplicator.deduplicate(messages)
 
         # Send messages to the API
+        request_start = monotonic()
         try:
             response = anthropic_client.beta.messages.create(
                 max_tokens=max_tokens,
@@ -98,31 +187,186 @@ def perform_action(
             )
         except (APIError, APIStatusError, APIResponseValidationError) as e:
             LOGGER.error(f"API error: {e}")
+            _stopped(usage, "api_error")
             return messages
 
+        model_latency = monotonic() - request_start
+        usage.add_response(response.usage)
+
         response_params = response_to_params(response)
         message = {"role": "assistant", "content": response_params}
         messages.append(message)
         on_new_message_callback(message)
 
         # Run tools locally, if needed
+        tool_uses = [block for block in response_params if block["type"] == "tool_use"]
         tool_result: list[BetaToolResultBlockParam] = []
-        for content_block in response_params:
-            if content_block["type"] == "tool_use":
-                tool_name = content_block["name"]
-                tool_input = content_block["input"]
+        for content_block in tool_uses:
+            tool_name = content_block["name"]
+            tool_input = content_block["input"]
+            try:
                 result = toolbox.run(name=tool_name, tool_input=tool_input)
-                result = make_api_tool_result(result, content_block["id"])
-                tool_result.append(result)
+            except CircuitOpenError as e:
+                # Raised by WatchdogExecutor once the executor keeps failing
+                LOGGER.error(f"Stopping run: {e}")
+                _stopped(usage, "executor_unavailable")
+                return messages
+            result_hash = (
+                screen_hash_of(result)
+                if trajectory_cache is not None or screenshot_deduplicator is not None
+                else None
+            )
+            if screenshot_deduplicator is not None:
+                screenshot_deduplicator.add(content_block["id"], result_hash)
+
+            if trajectory_cache is not None:
+                if screen_hash is not None and not result.error:
+                    trajectory_cache.record(
+                        fingerprint,
+                        step,
+                        screen_hash,
+                        tool_name,
+                        tool_input,
+                        model_latency_s=model_latency / len(tool_uses),
+                    )
+                # A result without a screenshot leaves the screen as last seen
+                if result_hash is not None or result.error:
+                    screen_hash = result_hash
+                step += 1
+
+            if result.base64_image:
+                usage.add_image(result.base64_image)
+                _archive(frame_archive, result, usage.turns)
+            result = make_api_tool_result(result, content_block["id"])
+            tool_result.append(result)
 
         # No tool results means that the assistant believes it has finished the task
         if not tool_result:
+            _stopped(usage, "end_turn")
             return messages
 
         message = {"role": "user", "content": tool_result}
         messages.append(message)
         on_new_message_callback(message)
-        sleep(1.5)
+        if turn_delay_ms:
+            sleep(turn_delay_ms / 1000)
+
+
+def _stopped(usage: RunUsage, stop_reason: StopReason) -> None:
+    usage.stop_reason = stop_reason
+    LOGGER.info(f"Run ended ({stop_reason}): {usage.summary()}")
+
+
+def _merged(first: BetaMessageParam, second: BetaMessageParam) -> BetaMessageParam:
+    """Two messages of the same role as one."""
+
+    def blocks(message):
+        content = message["content"]
+        if isinstance(content, str):
+            return [BetaTextBlockParam(type="text", text=content)]
+        return list(content)
+
+    return {"role": first["role"], "content": blocks(first) + blocks(second)}
+
+
+def _archive(
+    frame_archive: "FrameArchive | None", result: ToolResult, turn: int
+) -> None:
+    """Archive a tool result's screenshot as captured, if it has one."""
+    if frame_archive is not None and result.base64_image:
+        frame_archive.append(result.captured_image or result.base64_image, turn=turn)
+
+
+def _journaled(callback: Callable, journal: "RunJournal") -> Callable:
+    def on_new_message(message: BetaMessageParam):
+        journal.append(message)
+        callback(message)
+
+    return on_new_message
+
+
+def replay_cached_actions(
+    *,
+    trajectory_cache: "TrajectoryCache",
+    fingerprint: str,
+    toolbox: ToolBox,
+    messages: list[BetaMessageParam],
+    on_new_message_callback: Callable,
+    usage: RunUsage,
+    screenshot_deduplicator: "ScreenshotDeduplicator | None" = None,
+    frame_archive: "FrameArchive | None" = None,
+) -> tuple[int | None, int]:
+    """
+    Replays cached actions for as long as the current screen matches the cache,
+    appending them to the messages as if the model had chosen them. Returns the
+    perceptual hash of the screen after the last replayed action (None if it is
+    unknown) and the number of actions replayed. Screenshots go to
+    ``screenshot_deduplicator`` and ``frame_archive`` as in perform_action, and
+    the one taken to look up the first action is archived too.
+    """
+    if "computer" not in toolbox.tool_map:
+        return None, 0
+
+    result = toolbox.run(name="computer", tool_input={"action": "screenshot"})
+    screen_hash = screen_hash_of(result)
+    _archive(frame_archive, result, usage.turns)
+    replayed = 0
+
+    while screen_hash is not None:
+        cached = trajectory_cache.lookup(fingerprint, replayed, screen_hash)
+        if cached is None:
+            break
+        replayed += 1
+
+        tool_use_id = f"toolu_replay_{uuid4().hex[:24]}"
+        message = {
+            "role": "assistant",
+            "content": [
+                {
+                    "type": "tool_use",
+                    "id": tool_use_id,
+                    "name": cached.tool_name,
+                    "input": cached.tool_input,
+                }
+            ],
+        }
+        messages.append(message)
+        on_new_message_callback(message)
+
+        result = toolbox.run(name=cached.tool_name, tool_input=cached.tool_input)
+        result_hash = screen_hash_of(result)
+        if screenshot_deduplicator is not None:
+            screenshot_deduplicator.add(tool_use_id, result_hash)
+        if result.base64_image:
+            usage.add_image(result.base64_image)
+            _archive(frame_archive, result, usage.turns)
+        message = {
+            "role": "user",
+            "content": [make_api_tool_result(result, tool_use_id)],
+        }
+        messages.append(message)
+        on_new_message_callback(message)
+
+        if result.error:
+            screen_hash = None
+        elif result_hash is not None:
+            screen_hash = result_hash
+
+    if replayed:
+        LOGGER.info(f"Replayed {replayed} cached actions")
+    return screen_hash, replayed
+
+
+def screen_hash_of(result: ToolResult) -> int | None:
+    """The perceptual hash of a tool result's screenshot, as captured, if it
+    has one."""
+    if result.screen_hash is not None:
+        return result.screen_hash
+    if not result.base64_image:
+        return None
+    from .imaging import perceptual_hash
+
+    return perceptual_hash(result.base64_image)
 
 
 def filter_to_n_most_recent_images(
@@ -209,13 +453,18 @@ def make_api_tool_result(
 
     tool_result = []
 
+    if result.output:
+        tool_result.append({"type": "text", "text": result_text + result.output})
+
     if result.base64_image:
+        from .imaging import media_type_of
+
         tool_result.append(
             {
                 "type": "image",
                 "source": {
                     "type": "base64",
-                    "media_type": "image/png",
+                    "media_type": media_type_of(result.base64_image),
                     "data": result.base64_image,
                 },
             }
@@ -0,0 +1,154 @@
+"""
+A cache of the actions the model chose on previously seen screens.
+
+Many tasks start with the same steps (open the browser, dismiss a wizard, go to
+a URL). The cache records, per task, which action the model took at each step
+of a run and on which screen (identified by its perceptual hash), so that later
+runs can replay those actions without a model round-trip for as long as the
+screen keeps matching.
+"""
+
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+import hashlib
+import json
+import logging
+
+from .imaging import hamming_distance
+
+LOGGER = logging.getLogger(__name__)
+
+
+@dataclass
+class CachedAction:
+    """The action the model chose at ``step`` when it saw ``screen_hash``."""
+
+    step: int
+    screen_hash: int
+    tool_name: str
+    tool_input: dict
+    model_latency_s: float = 0.0
+
+
+@dataclass
+class ReplayStats:
+    """Counters describing how much work the cache saved."""
+
+    lookups: int = 0
+    hits: int = 0
+    recorded: int = 0
+    time_saved_s: float = 0.0
+
+    @property
+    def misses(self) -> int:
+        return self.lookups - self.hits
+
+    @property
+    def hit_rate(self) -> float:
+        return self.hits / self.lookups if self.lookups else 0.0
+
+    def summary(self) -> str:
+        return (
+            f"{self.hits}/{self.lookups} replay cache hits ({self.hit_rate:.0%}), "
+            f"{self.recorded} actions recorded, "
+            f"~{self.time_saved_s:.1f}s of model time saved"
+        )
+
+
+@dataclass
+class TrajectoryCache:
+    """Maps (task fingerprint, step, screen hash) to the action the model chose.
+
+    The step (the number of actions taken so far in the run) tells apart
+    screens that look the same, such as those before and after a mouse move,
+    so that a trajectory is replayed in order. Screens match when their
+    perceptual hashes are at most ``max_distance`` bits apart, which tolerates
+    small changes such as a clock ticking. The cache is persisted as JSON at
+    ``path`` by ``save``, if a path is given.
+    """
+
+    path: Path | None = None
+    max_distance: int = 3
+    entries: dict[str, list[CachedAction]] = field(default_factory=dict)
+    stats: ReplayStats = field(default_factory=ReplayStats)
+
+    @classmethod
+    def load(cls, path: str | Path, **kwargs) -> "TrajectoryCache":
+        """Load a cache from ``path``, or start an empty one if it does not exist."""
+        path = Path(path)
+        cache = cls(path=path, **kwargs)
+        if path.exists():
+            raw = json.loads(path.read_text())
+            cache.entries = {
+                fingerprint: [CachedAction(**entry) for entry in entries]
+                for fingerprint, entries in raw.items()
+            }
+        return cache
+
+    def save(self) -> None:
+        if self.path is None:
+            return
+        raw = {
+            fingerprint: [asdict(entry) for entry in entries]
+            for fingerprint, entries in self.entries.items()
+        }
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.path.write_text(json.dumps(raw))
+
+    @staticmethod
+    def fingerprint(action_description: str, tools: list | None = None) -> str:
+        """Identify a task by its (whitespace- and case-normalized) description.
+
+        The tool definitions are included so that a cache recorded with, for
+        example, another screen size is never replayed.
+        """
+        normalized = " ".join(action_description.lower().split())
+        payload = json.dumps([normalized, tools or []], sort_keys=True)
+        return hashlib.sha256(payload.encode()).hexdigest()
+
+    def lookup(
+        self, fingerprint: str, step: int, screen_hash: int
+    ) -> CachedAction | None:
+        """Find the action recorded for the closest matching screen, if any."""
+        self.stats.lookups += 1
+
+        best, best_distance = None, self.max_distance + 1
+        for entry in self.entries.get(fingerprint, ()):
+            if entry.step != step:
+                continue
+            distance = hamming_distance(entry.screen_hash, screen_hash)
+            if distance < best_distance:
+                best, best_distance = entry, distance
+
+        if best is not None:
+            self.stats.hits += 1
+            self.stats.time_saved_s += best.model_latency_s
+        return best
+
+    def record(
+        self,
+        fingerprint: str,
+        step: int,
+        screen_hash: int,
+        tool_name: str,
+        tool_input: dict,
+        model_latency_s: float = 0.0,
+    ) -> None:
+        """Remember the action taken on a screen, replacing any earlier choice."""
+        entries = self.entries.setdefault(fingerprint, [])
+        entries[:] = [
+            entry
+            for entry in entries
+            if entry.step != step
+            or hamming_distance(entry.screen_hash, screen_hash) > self.max_distance
+        ]
+        entries.append(
+            CachedAction(
+                step=step,
+                screen_hash=screen_hash,
+                tool_name=tool_name,
+                tool_input=tool_input,
+                model_latency_s=model_latency_s,
+            )
+        )
+        self.stats.recorded += 1
@@ -0,0 +1,140 @@
+"""
+Replaces screenshots that repeat an earlier screenshot still in the history with
+a short text reference to it, so that runs that wait on an unchanging screen do
+not re-send the same image on every turn.
+"""
+
+from dataclasses import dataclass, field
+import logging
+
+from .imaging import hamming_distance
+
+LOGGER = logging.getLogger(__name__)
+
+REFERENCE_PREFIX = "Screenshot omitted:"
+
+
+@dataclass
+class DedupStats:
+    replaced: int = 0
+    restored: int = 0
+    bytes_saved: int = 0
+
+    def summary(self) -> str:
+        return (
+            f"{self.replaced} repeated screenshots replaced by references "
+            f"(~{self.bytes_saved / 1e6:.1f} MB), {self.restored} restored"
+        )
+
+
+@dataclass
+class ScreenshotDeduplicator:
+    """Deduplicates the screenshots of tool results across the message history.
+
+    The perceptual hash of each screenshot is registered with ``add`` when it
+    is captured, so ``deduplicate`` never decodes an image. Screenshots match
+    when their hashes are at most ``max_distance`` bits apart. The default of 0
+    only matches screens that look the same down to the hash's resolution:
+    small changes, such as a checkbox being ticked, may not change the hash
+    at all, so raise it with care.
+
+    A repeat is only ever replaced by a reference to an earlier screenshot that
+    is still in the history. If pruning later removes that screenshot, the
+    repeat is re-pointed to another match or gets its image back.
+    """
+
+    max_distance: int = 0
+    hashes: dict[str, int] = field(default_factory=dict)
+    # Tool use id of a replaced screenshot -> the image block it replaced
+    replaced_images: dict[str, dict] = field(default_factory=dict)
+    stats: DedupStats = field(default_factory=DedupStats)
+
+    def add(self, tool_use_id: str, screen_hash: int | None) -> None:
+        """Register the hash of the screenshot returned for a tool use."""
+        if screen_hash is not None:
+            self.hashes[tool_use_id] = screen_hash
+
+    def deduplicate(self, messages: list) -> None:
+        """Replace repeated screenshots in ``messages``, in place."""
+        # (tool use id, hash) of the tool results whose screenshot is present
+        present: list[tuple[str, int]] = []
+
+        for tool_result in _tool_results(messages):
+            tool_use_id = tool_result.get("tool_use_id")
+            screen_hash = self.hashes.get(tool_use_id)
+            if screen_hash is None:
+                continue
+
+            content = tool_result["content"]
+            image_index = _index_of_image(content)
+            reference_index = (
+                _index_of_reference(content)
+                if tool_use_id in self.replaced_images
+                else -1
+            )
+            if image_index < 0 and reference_index < 0:
+                continue  # Pruned
+
+            match = self._match(present, screen_hash)
+            if image_index >= 0:
+                if match is None:
+                    present.append((tool_use_id, screen_hash))
+                    continue
+                image = content[image_index]
+                content[image_index] = _reference(match)
+                self.replaced_images[tool_use_id] = image
+                self.stats.replaced += 1
+                self.stats.bytes_saved += len(image["source"].get("data", "")) * 3 // 4
+            elif match is not None:
+                content[reference_index] = _reference(match)
+            else:
+                # The screenshot this one referred to has been pruned
+                content[reference_index] = self.replaced_images.pop(tool_use_id)
+                present.append((tool_use_id, screen_hash))
+                self.stats.restored += 1
+
+    def _match(self, present: list[tuple[str, int]], screen_hash: int) -> str | None:
+        for tool_use_id, other_hash in reversed(present):
+            if hamming_distance(screen_hash, other_hash) <= self.max_distance:
+                return tool_use_id
+        return None
+
+
+def _tool_results(messages: list) -> list[dict]:
+    return [
+        item
+        for message in messages
+        if isinstance(message.get("content"), list)
+        for item in message["content"]
+        if isinstance(item, dict)
+        and item.get("type") == "tool_result"
+        and isinstance(item.get("content"), list)
+    ]
+
+
+def _index_of_image(content: list) -> int:
+    for index, block in enumerate(content):
+        if isinstance(block, dict) and block.get("type") == "image":
+            return index
+    return -1
+
+
+def _index_of_reference(content: list) -> int:
+    for index, block in enumerate(content):
+        if (
+            isinstance(block, dict)
+            and block.get("type") == "text"
+            and block.get("text", "").startswith(REFERENCE_PREFIX)
+        ):
+            return index
+    return -1
+
+
+def _reference(tool_use_id: str) -> dict:
+    return {
+        "type": "text",
+        "text": (
+            f"{REFERENCE_PREFIX} the screen looks the same as in the screenshot "
+            f"returned for tool use {tool_use_id}."
+        ),
+    }
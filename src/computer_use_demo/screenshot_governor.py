@@ -0,0 +1,205 @@
+"""
+Picks the encoding and quality of each screenshot sent to the model, so that a
+run spends image bytes where they matter: on screens the model has not seen,
+after actions that aim at small targets, and while the budget is comfortable.
+
+Screenshots keep the size they were captured at. The model picks coordinates in
+the display geometry ComputerTool declares, whatever the size of the image, so
+the governor never changes what a coordinate points at. What it saves is the
+bytes sent with each request and kept in the history. Zoom still shows a region
+in full detail.
+"""
+
+from collections import deque
+from dataclasses import dataclass, field
+import logging
+
+from .imaging import hamming_distance, reencode
+from .usage import RunBudget, RunUsage
+
+LOGGER = logging.getLogger(__name__)
+
+# Actions after which the model is likely to aim at a small target next, such
+# as an item of the menu a click opened, which a reduced screenshot would make
+# it aim at less precisely
+FINE_ACTIONS = frozenset(
+    {
+        "mouse_move",
+        "left_click",
+        "left_click_drag",
+        "right_click",
+        "middle_click",
+        "double_click",
+    }
+)
+# Actions that navigate or enter text, after which an overview is usually enough
+COARSE_ACTIONS = frozenset({"key", "type"})
+
+
+@dataclass(frozen=True)
+class ScreenshotLevel:
+    name: str
+    # png, jpeg or webp, or None to keep the captured encoding
+    format: str | None
+    # For jpeg and webp
+    quality: int | None = None
+
+
+FULL = ScreenshotLevel("full", None)
+REDUCED = ScreenshotLevel("reduced", "jpeg", 85)
+ECONOMY = ScreenshotLevel("economy", "jpeg", 60)
+DEFAULT_LEVELS = (FULL, REDUCED, ECONOMY)
+
+
+@dataclass(frozen=True)
+class GovernorDecision:
+    action: str
+    level: ScreenshotLevel
+    # Of the run's budget, None without limits
+    budget_remaining: float | None
+    # Of the recent screenshots that changed, None until there are two
+    change_rate: float | None
+    reasons: tuple[str, ...]
+
+    def describe(self) -> str:
+        budget = (
+            "unlimited"
+            if self.budget_remaining is None
+            else f"{self.budget_remaining:.0%}"
+        )
+        change_rate = "n/a" if self.change_rate is None else f"{self.change_rate:.2f}"
+        return (
+            f"action={self.action} level={self.level.name} "
+            f"format={self.level.format} quality={self.level.quality} "
+            f"budget_remaining={budget} "
+            f"change_rate={change_rate} reasons={','.join(self.reasons) or 'none'}"
+        )
+
+
+@dataclass
+class GovernorStats:
+    levels: dict[str, int] = field(default_factory=dict)
+    # Screenshots sent as captured, at the full level or as re-encoding would
+    # not have made them smaller
+    kept: int = 0
+    bytes_in: int = 0
+    bytes_out: int = 0
+
+    def summary(self) -> str:
+        screenshots = sum(self.levels.values())
+        if not screenshots:
+            return "No screenshots governed"
+        levels = ", ".join(f"{count} {name}" for name, count in self.levels.items())
+        return (
+            f"{screenshots} screenshots governed ({levels}, {self.kept} kept "
+            f"as captured): {self.bytes_out / 1e6:.1f} MB sent of "
+            f"{self.bytes_in / 1e6:.1f} MB"
+        )
+
+
+@dataclass
+class ScreenshotGovernor:
+    """Chooses a ScreenshotLevel of ``levels``, from the most to the least
+    detailed, for each screenshot, and re-encodes the screenshot at it, unless
+    that would make it larger.
+
+    Starting from the most detailed level, each of these steps down one level:
+
+    - the action was in COARSE_ACTIONS;
+    - at most ``static_change_rate`` of the last ``change_window`` screenshots
+      differed from the one before by more than ``change_distance`` bits of
+      their perceptual hashes, so the model has mostly seen the screen already;
+    - less than ``low_budget`` of ``budget`` remains given ``usage``, and
+      another one below ``critical_budget``.
+
+    After an action in FINE_ACTIONS, screenshots stay at the most detailed
+    level, or the next one once the budget is critical, as the next action is
+    likely to be chosen from them. Every decision is logged at INFO, as one
+    line of key=value pairs to tune these thresholds with.
+    """
+
+    budget: RunBudget | None = None
+    usage: RunUsage | None = None
+    levels: tuple[ScreenshotLevel, ...] = DEFAULT_LEVELS
+    low_budget: float = 0.5
+    critical_budget: float = 0.2
+    static_change_rate: float = 0.25
+    change_window: int = 8
+    change_distance: int = 4
+    stats: GovernorStats = field(default_factory=GovernorStats)
+
+    def __post_init__(self):
+        if not self.levels:
+            raise ValueError("At least one screenshot level is needed")
+        self._last_hash: int | None = None
+        self._changes: deque[bool] = deque(maxlen=self.change_window)
+
+    def apply(
+        self, action: str, base64_image: str, screen_hash: int
+    ) -> tuple[str, GovernorDecision]:
+        """The screenshot taken after ``action``, re-encoded at the chosen level
+        if that makes it smaller, and the decision. ``screen_hash`` is the
+        screenshot's perceptual hash."""
+        decision = self.decide(action, screen_hash)
+        LOGGER.info(f"Screenshot governor: {decision.describe()}")
+
+        level = decision.level
+        image = (
+            base64_image
+            if level.format is None
+            else reencode(base64_image, level.format, level.quality)
+        )
+        self.stats.levels[level.name] = self.stats.levels.get(level.name, 0) + 1
+        self.stats.kept += image is base64_image
+        self.stats.bytes_in += len(base64_image) * 3 // 4
+        self.stats.bytes_out += len(image) * 3 // 4
+        return image, decision
+
+    def decide(self, action: str, screen_hash: int) -> GovernorDecision:
+        """The level for the screenshot taken after ``action``, given its
+        perceptual hash. Records the screenshot in the change history, so call
+        it once per screenshot."""
+        change_rate = self._record_change(screen_hash)
+        budget_remaining = (
+            self.budget.remaining_fraction(self.usage)
+            if self.budget is not None and self.usage is not None
+            else None
+        )
+
+        step, reasons = 0, []
+        if action in COARSE_ACTIONS:
+            step += 1
+            reasons.append("coarse_action")
+        if change_rate is not None and change_rate <= self.static_change_rate:
+            step += 1
+            reasons.append("static_screen")
+        critical = (
+            budget_remaining is not None and budget_remaining < self.critical_budget
+        )
+        if critical:
+            step += 2
+            reasons.append("critical_budget")
+        elif budget_remaining is not None and budget_remaining < self.low_budget:
+            step += 1
+            reasons.append("low_budget")
+        if action in FINE_ACTIONS and step > int(critical):
+            step = int(critical)
+            reasons.append("fine_action")
+
+        return GovernorDecision(
+            action=action,
+            level=self.levels[min(step, len(self.levels) - 1)],
+            budget_remaining=budget_remaining,
+            change_rate=change_rate,
+            reasons=tuple(reasons),
+        )
+
+    def _record_change(self, screen_hash: int) -> float | None:
+        if self._last_hash is not None:
+            self._changes.append(
+                hamming_distance(screen_hash, self._last_hash) > self.change_distance
+            )
+        self._last_hash = screen_hash
+        if not self._changes:
+            return None
+        return sum(self._changes) / len(self._changes)
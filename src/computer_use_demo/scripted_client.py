@@ -0,0 +1,314 @@
+"""
+A stand-in for the Anthropic client that replays scripted or recorded responses,
+so that perform_action can be load tested offline without calling Bedrock.
+"""
+
+from itertools import count
+from threading import Lock
+from types import SimpleNamespace
+from typing import Any, Callable, Iterable
+import base64
+import io
+import json
+import logging
+import math
+import random
+import struct
+import time
+
+import httpx
+from anthropic import InternalServerError, RateLimitError
+from anthropic.types.beta import BetaMessage
+
+LOGGER = logging.getLogger(__name__)
+
+# Rough token accounting, close enough to the real API for load testing:
+# text costs about one token per four characters, an image costs
+# (width * height) / 750 tokens and the computer tool definition adds a fixed
+# number of tokens to every request.
+CHARS_PER_TOKEN = 4
+IMAGE_PIXELS_PER_TOKEN = 750
+IMAGE_FALLBACK_TOKENS = 1600
+TOOL_DEFINITION_TOKENS = 683
+TOOL_SYSTEM_PROMPT_TOKENS = 466
+
+# Backoff constants of the Anthropic SDK, used when emulating its retries
+INITIAL_RETRY_DELAY = 0.5
+MAX_RETRY_DELAY = 8.0
+
+ScriptStep = list[dict] | BetaMessage | Callable[[list[dict]], list[dict]]
+
+
+def tool_use_script(
+    actions: Iterable[dict], tool_name: str = "computer", final_text: str = "Done."
+) -> list[ScriptStep]:
+    """Build a script that calls a tool once per turn with each of ``actions``."""
+    script: list[ScriptStep] = [
+        [{"type": "tool_use", "name": tool_name, "input": action}] for action in actions
+    ]
+    script.append([{"type": "text", "text": final_text}])
+    return script
+
+
+class ScriptedAnthropicClient:
+    """Drop-in replacement for ``AnthropicBedrock`` as used by ``perform_action``.
+
+    Each call to ``client.beta.messages.create(...)`` returns the next step of
+    the script as a ``BetaMessage``. A step is either a list of content block
+    dicts (``tool_use`` blocks get an id if they have none), a ``BetaMessage``
+    or a callable that receives the request messages and returns content
+    blocks. Once the script is exhausted the client answers with a plain text
+    message, which ends the loop, unless ``repeat`` is set.
+
+    Scripted responses carry a ``usage`` estimated from the request (recorded
+    ``BetaMessage`` steps keep their own), and the client can optionally sleep
+    to simulate latency and raise the same throttling errors as the real API.
+    With ``max_retries`` it retries those errors internally using the SDK's
+    backoff, like the real client does.
+    Estimating usage walks the whole history, so load tests that only measure
+    the loop can turn it off with ``estimate_usage=False``.
+
+    The client is thread-safe; the script is shared between all callers.
+    """
+
+    def __init__(
+        self,
+        script: Iterable[ScriptStep],
+        *,
+        repeat: bool = False,
+        latency_s: float | Callable[[int], float] = 0.0,
+        latency_jitter_s: float = 0.0,
+        throttle_probability: float = 0.0,
+        throttle_status_code: int = 429,
+        max_retries: int = 0,
+        estimate_usage: bool = True,
+        seed: int | None = 0,
+    ):
+        self.script = list(script)
+        self.repeat = repeat
+        self.latency_s = latency_s
+        self.latency_jitter_s = latency_jitter_s
+        self.throttle_probability = throttle_probability
+        self.throttle_status_code = throttle_status_code
+        self.max_retries = max_retries
+        self.estimate_usage = estimate_usage
+        self.stats = {
+            "requests": 0,
+            "responses": 0,
+            "throttled": 0,
+            "retries": 0,
+            "input_tokens": 0,
+            "output_tokens": 0,
+            "latency_s": 0.0,
+        }
+
+        self.beta = SimpleNamespace(messages=SimpleNamespace(create=self.create))
+
+        self._random = random.Random(seed)
+        self._lock = Lock()
+        self._position = 0
+        self._ids = count()
+
+    @classmethod
+    def from_recording(cls, path: str, **kwargs) -> "ScriptedAnthropicClient":
+        """Replay the assistant messages recorded in a JSONL file.
+
+        Each line is a message (``{"role": ..., "content": [...]}``), such as
+        those passed to ``on_new_message_callback``, or a serialized
+        ``BetaMessage``. Lines from other roles are skipped.
+        """
+        script = []
+        with open(path) as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                record = json.loads(line)
+                if record.get("role") != "assistant":
+                    continue
+                if record.get("type") == "message":
+                    script.append(BetaMessage.model_validate(record))
+                else:
+                    script.append(record["content"])
+        return cls(script, **kwargs)
+
+    def create(
+        self, *, messages: list[dict], model: str, system=None, tools=None, **kwargs
+    ) -> BetaMessage:
+        """Mimics ``beta.messages.create``. Unused keyword arguments are ignored."""
+        retries_taken = 0
+        while True:
+            try:
+                return self._create(messages, model, system, tools)
+            except (RateLimitError, InternalServerError):
+                if retries_taken >= self.max_retries:
+                    raise
+                delay = min(INITIAL_RETRY_DELAY * 2.0**retries_taken, MAX_RETRY_DELAY)
+                with self._lock:
+                    self.stats["retries"] += 1
+                    delay *= 1 - 0.25 * self._random.random()
+                time.sleep(delay)
+                retries_taken += 1
+
+    def _create(self, messages, model, system, tools) -> BetaMessage:
+        with self._lock:
+            request_number = self.stats["requests"]
+            self.stats["requests"] += 1
+            latency = self._next_latency(request_number)
+            throttled = self._random.random() < self.throttle_probability
+
+        if latency > 0:
+            time.sleep(latency)
+
+        if throttled:
+            with self._lock:
+                self.stats["throttled"] += 1
+                self.stats["latency_s"] += latency
+            raise self._throttling_error()
+
+        with self._lock:
+            step = self._next_step()
+            message_number = next(self._ids)
+
+        if isinstance(step, BetaMessage):
+            # Recorded messages keep the usage that the real API reported
+            message = step
+        else:
+            content = step(messages) if callable(step) else step
+            message = self._build_message(
+                content,
+                model,
+                message_number,
+                input_tokens=(
+                    estimate_request_tokens(messages, system, tools)
+                    if self.estimate_usage
+                    else 0
+                ),
+            )
+
+        input_tokens = message.usage.input_tokens
+        output_tokens = message.usage.output_tokens
+
+        with self._lock:
+            self.stats["responses"] += 1
+            self.stats["input_tokens"] += input_tokens
+            self.stats["output_tokens"] += output_tokens
+            self.stats["latency_s"] += latency
+
+        return message
+
+    def _next_latency(self, request_number: int) -> float:
+        latency = (
+            self.latency_s(request_number)
+            if callable(self.latency_s)
+            else self.latency_s
+        )
+        if self.latency_jitter_s:
+            latency += self._random.uniform(
+                -self.latency_jitter_s, self.latency_jitter_s
+            )
+        return max(latency, 0.0)
+
+    def _next_step(self) -> ScriptStep:
+        if self._position >= len(self.script):
+            if not self.repeat or not self.script:
+                return [{"type": "text", "text": "Script finished."}]
+            self._position = 0
+
+        step = self.script[self._position]
+        self._position += 1
+        return step
+
+    def _build_message(
+        self, content: list[dict], model: str, message_number: int, input_tokens: int
+    ) -> BetaMessage:
+        blocks = []
+        for block_number, block in enumerate(content):
+            block = dict(block)
+            if block["type"] == "tool_use":
+                block.setdefault("id", f"toolu_{message_number:012d}{block_number:04d}")
+            blocks.append(block)
+
+        uses_tools = any(block["type"] == "tool_use" for block in blocks)
+        return BetaMessage.model_validate(
+            {
+                "id": f"msg_{message_number:020d}",
+                "type": "message",
+                "role": "assistant",
+                "model": model,
+                "content": blocks,
+                "stop_reason": "tool_use" if uses_tools else "end_turn",
+                "stop_sequence": None,
+                "usage": {
+                    "input_tokens": input_tokens,
+                    "output_tokens": estimate_content_tokens(blocks),
+                    "cache_creation_input_tokens": 0,
+                    "cache_read_input_tokens": 0,
+                },
+            }
+        )
+
+    def _throttling_error(self) -> Exception:
+        request = httpx.Request("POST", "https://scripted.invalid/v1/messages")
+        response = httpx.Response(self.throttle_status_code, request=request)
+        error_class = (
+            RateLimitError if self.throttle_status_code == 429 else InternalServerError
+        )
+        return error_class(
+            "Simulated throttling by ScriptedAnthropicClient",
+            response=response,
+            body=None,
+        )
+
+
+def estimate_request_tokens(messages: list[dict], system=None, tools=None) -> int:
+    """Estimate the input tokens of a request the way the API would bill them."""
+    tokens = estimate_content_tokens(system or [])
+    if tools:
+        tokens += TOOL_SYSTEM_PROMPT_TOKENS + TOOL_DEFINITION_TOKENS * len(tools)
+    for message in messages:
+        tokens += estimate_content_tokens(message.get("content", []))
+    return tokens
+
+
+def estimate_content_tokens(content: Any) -> int:
+    """Estimate the tokens of a message content (a string or a list of blocks)."""
+    if isinstance(content, str):
+        return math.ceil(len(content) / CHARS_PER_TOKEN)
+
+    tokens = 0
+    for block in content:
+        if not isinstance(block, dict):
+            continue
+        match block.get("type"):
+            case "text":
+                tokens += estimate_content_tokens(block.get("text", ""))
+            case "image":
+                tokens += estimate_image_tokens(block.get("source", {}).get("data", ""))
+            case "tool_use":
+                tokens += estimate_content_tokens(str(block.get("input", {})))
+            case "tool_result":
+                tokens += estimate_content_tokens(block.get("content", []))
+    return tokens
+
+
+def estimate_image_tokens(base64_image: str) -> int:
+    """Estimate image tokens from the dimensions in a base64 image's header."""
+    try:
+        header = base64.b64decode(base64_image[:32])
+    except ValueError:
+        return IMAGE_FALLBACK_TOKENS
+
+    if header[:8] == b"\x89PNG\r\n\x1a\n":
+        if len(header) < 24:
+            return IMAGE_FALLBACK_TOKENS
+        width, height = struct.unpack(">II", header[16:24])
+    else:
+        # JPEG and WebP keep their dimensions further in, so let Pillow find them
+        from PIL import Image, UnidentifiedImageError
+
+        try:
+            with Image.open(io.BytesIO(base64.b64decode(base64_image))) as image:
+                width, height = image.size
+        except (ValueError, UnidentifiedImageError):
+            return IMAGE_FALLBACK_TOKENS
+    return math.ceil(width * height / IMAGE_PIXELS_PER_TOKEN)
@@ -18,3 +18,11 @@ SYSTEM_PROMPT = f"""<SYSTEM_CAPABILITY>
 <IMPORTANT>
 * When using browsers, if a startup wizard appears, IGNORE IT.  Do not even click "skip this step".  Instead, click on the address bar where it says "Search or enter address", and enter the appropriate search term or URL there.
 </IMPORTANT>"""
+
+# Describes the zoom action that ComputerTool supports beyond the computer tool's
+# documented actions
+ZOOM_SYSTEM_PROMPT = """
+
+<ZOOM>
+* To read small text or inspect details, use the computer tool with action "zoom" and a "region" of [x1, y1, x2, y2] screen coordinates (top-left and bottom-right corners). It returns only that region, at a higher resolution than a screenshot, and does not change the screen. Prefer it over zooming in the user interface.
+</ZOOM>"""
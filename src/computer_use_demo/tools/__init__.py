@@ -1,10 +1,31 @@
-from .base_tool import CLIResult, ToolResult
-from .toolbox import ToolBox
-from .computer import ComputerTool
-
-__ALL__ = [
-    CLIResult,
-    ComputerTool,
-    ToolBox,
-    ToolResult,
+from importlib import import_module
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .base_tool import CLIResult, ToolResult
+    from .toolbox import ToolBox
+    from .computer import ComputerTool
+
+__all__ = [
+    "CLIResult",
+    "ComputerTool",
+    "ToolBox",
+    "ToolResult",
 ]
+
+# The tools are imported on first use, so that importing a single module of the
+# package (such as base_tool) does not import all of them
+_MODULES = {
+    "CLIResult": ".base_tool",
+    "ToolResult": ".base_tool",
+    "ToolBox": ".toolbox",
+    "ComputerTool": ".computer",
+}
+
+
+def __getattr__(name: str):
+    if name not in _MODULES:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(_MODULES[name], __name__), name)
+    globals()[name] = value
+    return value
@@ -1,8 +1,9 @@
 from abc import ABCMeta, abstractmethod
 from dataclasses import dataclass, fields, replace
-from typing import Any
+from typing import TYPE_CHECKING, Any
 
-from anthropic.types.beta import BetaToolUnionParam
+if TYPE_CHECKING:
+    from anthropic.types.beta import BetaToolUnionParam
 
 
 class BaseAnthropicTool(metaclass=ABCMeta):
@@ -16,7 +17,7 @@ class BaseAnthropicTool(metaclass=ABCMeta):
     @abstractmethod
     def to_params(
         self,
-    ) -> BetaToolUnionParam:
+    ) -> "BetaToolUnionParam":
         raise NotImplementedError
 
 
@@ -24,9 +25,14 @@ class BaseAnthropicTool(metaclass=ABCMeta):
 class ToolResult:
     """Represents the result of a tool execution."""
 
+    output: str | None = None
     error: str | None = None
     base64_image: str | None = None
     system: str | None = None
+    # The screenshot as captured, when base64_image was re-encoded from it, and
+    # its perceptual hash, when the tool already computed it
+    captured_image: str | None = None
+    screen_hash: int | None = None
 
     def __bool__(self):
         return any(getattr(self, field.name) for field in fields(self))
@@ -42,9 +48,14 @@ class ToolResult:
             return field or other_field
 
         return ToolResult(
+            output=combine_fields(self.output, other.output),
             base64_image=combine_fields(self.base64_image, other.base64_image, False),
             system=combine_fields(self.system, other.system),
             error=combine_fields(self.error, other.error),
+            captured_image=combine_fields(
+                self.captured_image, other.captured_image, False
+            ),
+            screen_hash=combine_fields(self.screen_hash, other.screen_hash, False),
         )
 
     def replace(self, **kwargs):
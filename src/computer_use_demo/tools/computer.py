@@ -1,9 +1,13 @@
-from typing import Literal, TypedDict
-
-from anthropic.types.beta import BetaToolComputerUse20241022Param
+from typing import TYPE_CHECKING, Literal, TypedDict
 
 from .base_tool import BaseAnthropicTool, ToolError, ToolResult
 from ..executors.executor_base import ComputerUseExecutor
+from ..key_combo import is_modifier_only
+
+if TYPE_CHECKING:
+    from anthropic.types.beta import BetaToolComputerUse20241022Param
+
+    from ..screenshot_governor import ScreenshotGovernor
 
 
 Action = Literal[
@@ -17,8 +21,33 @@ Action = Literal[
     "double_click",
     "screenshot",
     "cursor_position",
+    "zoom",
 ]
 
+# Whether the result of an action carries a screenshot of the screen after it:
+# always, never, or unless the action cannot have changed the screen (a key
+# combination of modifiers only, such as "shift")
+SCREENSHOT_ALWAYS = "always"
+SCREENSHOT_NEVER = "never"
+SCREENSHOT_IF_VISIBLE = "if_visible"
+SCREENSHOT_POLICIES = (SCREENSHOT_ALWAYS, SCREENSHOT_NEVER, SCREENSHOT_IF_VISIBLE)
+
+DEFAULT_SCREENSHOT_POLICY: dict[str, str] = {
+    "key": SCREENSHOT_IF_VISIBLE,
+    "type": SCREENSHOT_ALWAYS,
+    "mouse_move": SCREENSHOT_NEVER,
+    "left_click": SCREENSHOT_ALWAYS,
+    "left_click_drag": SCREENSHOT_ALWAYS,
+    "right_click": SCREENSHOT_ALWAYS,
+    "middle_click": SCREENSHOT_ALWAYS,
+    "double_click": SCREENSHOT_ALWAYS,
+    "screenshot": SCREENSHOT_ALWAYS,
+    "cursor_position": SCREENSHOT_NEVER,
+}
+
+# The text result of an action that returns neither text nor a screenshot
+NO_SCREENSHOT_OUTPUT = "Done. Take a screenshot to see the result."
+
 
 class ComputerToolOptions(TypedDict):
     display_height_px: int
@@ -57,11 +86,35 @@ class ComputerTool(BaseAnthropicTool):
         screen_width: int,
         screen_height: int,
         executor: ComputerUseExecutor,
+        zoom_max_pixels: int | None = None,
+        screenshot_policy: dict[str, str] | None = None,
+        governor: "ScreenshotGovernor | None" = None,
     ):
+        """``screenshot_policy`` overrides DEFAULT_SCREENSHOT_POLICY for some
+        actions, such as {"mouse_move": SCREENSHOT_ALWAYS} to see hover
+        effects. Zoom always returns its own image, with at most
+        ``zoom_max_pixels``, or as many as a screenshot if it is None.
+
+        ``governor`` picks the encoding and quality of each screenshot;
+        without it, screenshots are sent as captured. Screenshots keep their
+        size either way, and the model's coordinates stay in the declared
+        display geometry. Zoomed images are not governed, so the model can
+        always get the details it needs."""
         super().__init__()
         self.width = screen_width
         self.height = screen_height
         self.executor = executor
+        self.zoom_max_pixels = zoom_max_pixels
+        self.screenshot_policy = dict(DEFAULT_SCREENSHOT_POLICY)
+        for action, policy in (screenshot_policy or {}).items():
+            if action not in DEFAULT_SCREENSHOT_POLICY:
+                raise ValueError(f"No screenshot policy applies to action '{action}'")
+            if policy not in SCREENSHOT_POLICIES:
+                raise ValueError(f"Unknown screenshot policy '{policy}' for '{action}'")
+            self.screenshot_policy[action] = policy
+        self.governor = governor
+        # The last screenshot as captured, to measure the zoom budget by
+        self._last_screenshot: str | None = None
         self.display_num = None  # Not used
 
     def __call__(
@@ -70,10 +123,12 @@ class ComputerTool(BaseAnthropicTool):
         action: Action,
         text: str | None = None,
         coordinate: tuple[int, int] | None = None,
+        region: list[int] | None = None,
         **kwargs,
     ):
-        self.executor.validate_action(action, text, coordinate)
+        self.executor.validate_action(action, text, coordinate, region)
 
+        output = None
         match action:
             case "mouse_move":
                 self.executor.mouse_move(*coordinate)
@@ -92,13 +147,64 @@ class ComputerTool(BaseAnthropicTool):
             case "double_click":
                 self.executor.double_click()
             case "cursor_position":
-                self.executor.cursor_position()
+                x, y = self.executor.cursor_position()
+                output = f"X={x},Y={y}"
+            case "zoom":
+                return ToolResult(base64_image=self.zoom(*region))
             case "screenshot":
-                pass  # Screenshot will always be taken after the action
+                pass  # The screenshot policy of "screenshot" takes it
             case _:
                 raise ToolError(f"Could not execute invalid action: {action}")
 
-        return ToolResult(base64_image=self.executor.screenshot())
-
-    def to_params(self) -> BetaToolComputerUse20241022Param:
+        if not self.takes_screenshot(action, text):
+            return ToolResult(output=output or NO_SCREENSHOT_OUTPUT)
+        image = self._last_screenshot = self.executor.screenshot()
+        if self.governor is None:
+            return ToolResult(output=output, base64_image=image)
+
+        from ..imaging import perceptual_hash
+
+        # Hashed once, as captured, for the governor and then the loop
+        screen_hash = perceptual_hash(image)
+        governed, _ = self.governor.apply(action, image, screen_hash)
+        return ToolResult(
+            output=output,
+            base64_image=governed,
+            captured_image=image,
+            screen_hash=screen_hash,
+        )
+
+    def takes_screenshot(self, action: Action, text: str | None = None) -> bool:
+        """Whether the result of an action carries a screenshot."""
+        policy = self.screenshot_policy.get(action, SCREENSHOT_ALWAYS)
+        if policy == SCREENSHOT_IF_VISIBLE:
+            return not (action == "key" and is_modifier_only(text))
+        return policy == SCREENSHOT_ALWAYS
+
+    def zoom(self, x1: int, y1: int, x2: int, y2: int) -> str:
+        """An image of a region of the screen, at the highest resolution available,
+        scaled to the zoom budget. The region is in the declared screen
+        geometry, which the executor maps onto its native resolution."""
+        # Imported here, as NumPy and Pillow are slow to import and only zoom needs them
+        from ..imaging import crop, fit_to_pixel_budget, image_size
+
+        x2, y2 = min(x2, self.width), min(y2, self.height)
+        if x1 >= x2 or y1 >= y2:
+            raise ToolError("Region is outside of the screen")
+
+        region = (x1 / self.width, y1 / self.height, x2 / self.width, y2 / self.height)
+        image = self.executor.zoom(*region)
+        if image is None:
+            self._last_screenshot = self.executor.screenshot()
+            image = crop(self._last_screenshot, *region)
+
+        max_pixels = self.zoom_max_pixels
+        if max_pixels is None:
+            if self._last_screenshot is None:
+                self._last_screenshot = self.executor.screenshot()
+            width, height = image_size(self._last_screenshot)
+            max_pixels = width * height
+        return fit_to_pixel_budget(image, max_pixels)
+
+    def to_params(self) -> "BetaToolComputerUse20241022Param":
         return {"name": self.name, "type": self.api_type, **self.options}
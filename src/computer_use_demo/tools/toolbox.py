@@ -1,8 +1,6 @@
 """Collection classes for managing multiple tools."""
 
-from typing import Any
-
-from anthropic.types.beta import BetaToolUnionParam
+from typing import TYPE_CHECKING, Any
 
 from .base_tool import (
     BaseAnthropicTool,
@@ -11,6 +9,9 @@ from .base_tool import (
     ToolResult,
 )
 
+if TYPE_CHECKING:
+    from anthropic.types.beta import BetaToolUnionParam
+
 
 class ToolBox:
     """A collection of anthropic-defined tools."""
@@ -21,7 +22,7 @@ class ToolBox:
 
     def to_params(
         self,
-    ) -> list[BetaToolUnionParam]:
+    ) -> list["BetaToolUnionParam"]:
         return [tool.to_params() for tool in self.tools]
 
     def run(self, *, name: str, tool_input: dict[str, Any]) -> ToolResult:
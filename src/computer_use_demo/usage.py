@@ -0,0 +1,154 @@
+"""
+Token, cost and time accounting for a run of perform_action, and the budgets
+that can stop a run early.
+"""
+
+from dataclasses import dataclass, field
+from time import monotonic
+from typing import Literal
+
+StopReason = Literal[
+    "end_turn",
+    "api_error",
+    "max_total_tokens",
+    "max_cost_usd",
+    "max_turns",
+    "max_wall_clock_s",
+    "executor_unavailable",
+]
+
+
+@dataclass(frozen=True)
+class ModelPrice:
+    """Prices in USD per million tokens."""
+
+    input: float
+    output: float
+    cache_write: float
+    cache_read: float
+
+    @classmethod
+    def for_model(cls, model: str) -> "ModelPrice":
+        """Look up the price of a model by family, defaulting to Sonnet."""
+        for family, price in MODEL_PRICES.items():
+            if family in model.lower():
+                return price
+        return MODEL_PRICES["sonnet"]
+
+
+MODEL_PRICES = {
+    "haiku": ModelPrice(input=0.80, output=4.00, cache_write=1.00, cache_read=0.08),
+    "sonnet": ModelPrice(input=3.00, output=15.00, cache_write=3.75, cache_read=0.30),
+    "opus": ModelPrice(input=15.00, output=75.00, cache_write=18.75, cache_read=1.50),
+}
+
+
+@dataclass
+class RunUsage:
+    """Accumulated usage of a run, filled in by perform_action.
+
+    After the run, ``stop_reason`` says why it ended.
+    """
+
+    price: ModelPrice | None = None
+    input_tokens: int = 0
+    output_tokens: int = 0
+    cache_creation_input_tokens: int = 0
+    cache_read_input_tokens: int = 0
+    images: int = 0
+    image_bytes: int = 0
+    turns: int = 0
+    started_at: float = field(default_factory=monotonic)
+    stop_reason: StopReason | None = None
+
+    @property
+    def total_tokens(self) -> int:
+        return (
+            self.input_tokens
+            + self.output_tokens
+            + self.cache_creation_input_tokens
+            + self.cache_read_input_tokens
+        )
+
+    @property
+    def cost_usd(self) -> float:
+        """Estimated cost of the run so far."""
+        price = self.price or MODEL_PRICES["sonnet"]
+        return (
+            self.input_tokens * price.input
+            + self.output_tokens * price.output
+            + self.cache_creation_input_tokens * price.cache_write
+            + self.cache_read_input_tokens * price.cache_read
+        ) / 1_000_000
+
+    @property
+    def elapsed_s(self) -> float:
+        return monotonic() - self.started_at
+
+    def add_response(self, usage) -> None:
+        """Add the ``usage`` of an API response."""
+        self.turns += 1
+        self.input_tokens += usage.input_tokens
+        self.output_tokens += usage.output_tokens
+        self.cache_creation_input_tokens += usage.cache_creation_input_tokens or 0
+        self.cache_read_input_tokens += usage.cache_read_input_tokens or 0
+
+    def add_image(self, base64_image: str) -> None:
+        """Count a screenshot added to the conversation."""
+        self.images += 1
+        self.image_bytes += len(base64_image) * 3 // 4
+
+    def summary(self) -> str:
+        return (
+            f"{self.turns} turns, {self.input_tokens} input / "
+            f"{self.output_tokens} output / "
+            f"{self.cache_creation_input_tokens} cache write / "
+            f"{self.cache_read_input_tokens} cache read tokens, "
+            f"{self.images} images ({self.image_bytes / 1e6:.1f} MB), "
+            f"~${self.cost_usd:.2f} in {self.elapsed_s:.0f}s"
+        )
+
+
+@dataclass
+class RunBudget:
+    """Limits after which perform_action stops a run. None means unlimited."""
+
+    max_total_tokens: int | None = None
+    max_cost_usd: float | None = None
+    max_turns: int | None = None
+    max_wall_clock_s: float | None = None
+
+    def exceeded_by(self, usage: RunUsage) -> StopReason | None:
+        """The first limit that ``usage`` has reached, if any."""
+        if (
+            self.max_total_tokens is not None
+            and usage.total_tokens >= self.max_total_tokens
+        ):
+            return "max_total_tokens"
+        if self.max_cost_usd is not None and usage.cost_usd >= self.max_cost_usd:
+            return "max_cost_usd"
+        if self.max_turns is not None and usage.turns >= self.max_turns:
+            return "max_turns"
+        if (
+            self.max_wall_clock_s is not None
+            and usage.elapsed_s >= self.max_wall_clock_s
+        ):
+            return "max_wall_clock_s"
+        return None
+
+    def remaining_fraction(self, usage: RunUsage) -> float | None:
+        """How much of the most used limit is left, from 1 (untouched) to 0, or
+        None if there are no limits."""
+        used = [
+            spent / limit
+            for spent, limit in (
+                (usage.total_tokens, self.max_total_tokens),
+                (usage.cost_usd, self.max_cost_usd),
+                (usage.turns, self.max_turns),
+                (usage.elapsed_s, self.max_wall_clock_s),
+            )
+            if limit
+        ]
+        if not used:
+            return None
+        return min(max(1 - max(used), 0.0), 1.0)
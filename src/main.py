@@ -1,15 +1,24 @@
 from selenium import webdriver
 from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.chrome.options import Options
 from webdriver_manager.chrome import ChromeDriverManager
 import time
 import os
 import logging
+import threading
 from computer_use_demo.loop import perform_action
 from anthropic import AnthropicBedrock
 from computer_use_demo.tools.computer import ComputerTool
 from computer_use_demo.tools.toolbox import ToolBox
 from computer_use_demo.executors.guacamole_executor import GuacamoleExecutor
+from computer_use_demo.executors.watchdog import WatchdogExecutor
+from computer_use_demo.replay_cache import TrajectoryCache
+from computer_use_demo.usage import RunBudget, RunUsage
+from computer_use_demo.journal import MESSAGES_FILE, RunJournal
+from computer_use_demo.screenshot_dedup import ScreenshotDeduplicator
+from computer_use_demo.screenshot_governor import ScreenshotGovernor
+from computer_use_demo.frame_archive import FrameArchive
+from computer_use_demo.browser_profiles import chrome_options
+from computer_use_demo.system_prompt import ZOOM_SYSTEM_PROMPT
 from copy import deepcopy
 from sys import argv
 
@@ -19,6 +28,34 @@ LOGGER = logging.getLogger(__name__)
 GUAC_URL = argv[1]
 ACTION_DESCRIPTION = argv[2]
 MODEL = os.environ.get("COMPUTER_USE_MODEL", "claude-3-5-sonnet-latest")
+# Optional path of a JSON file caching the actions taken on previously seen screens
+REPLAY_CACHE_PATH = os.environ.get("COMPUTER_USE_REPLAY_CACHE")
+# Optional directory to journal the run to; an existing journal is resumed
+JOURNAL_DIR = os.environ.get("COMPUTER_USE_JOURNAL_DIR")
+# Optional directory to archive every screenshot of the run to
+FRAME_ARCHIVE_DIR = os.environ.get("COMPUTER_USE_FRAME_ARCHIVE_DIR")
+# Optional limits after which the run is stopped
+MAX_COST_USD = os.environ.get("COMPUTER_USE_MAX_COST_USD")
+MAX_TURNS = os.environ.get("COMPUTER_USE_MAX_TURNS")
+MAX_MINUTES = os.environ.get("COMPUTER_USE_MAX_MINUTES")
+# How many of the most recent screenshots are kept in the history, and read back
+# from the journal on resume (0 keeps them all)
+KEEP_IMAGES = int(os.environ.get("COMPUTER_USE_KEEP_IMAGES", "3"))
+# Optional length from which text is pasted through the remote clipboard with
+# ctrl+v rather than typed; only for remotes where ctrl+v pastes (not terminals)
+PASTE_MIN_LENGTH = os.environ.get("COMPUTER_USE_PASTE_MIN_LENGTH")
+# Set to 1 to capture the screen in the background while it changes
+BACKGROUND_CAPTURE = os.environ.get("COMPUTER_USE_BACKGROUND_CAPTURE") == "1"
+# How screenshots are captured: webdriver, cdp, canvas or screencast
+CAPTURE_ENGINE = os.environ.get("COMPUTER_USE_CAPTURE_ENGINE", "webdriver")
+# Chrome launch options: default, latency or low_memory (see browser_profiles.py)
+BROWSER_PROFILE = os.environ.get("COMPUTER_USE_BROWSER_PROFILE", "default")
+# Which actions return a screenshot, overriding ComputerTool's defaults, such as
+# "mouse_move=always,key=if_visible" (policies: always, never, if_visible)
+SCREENSHOT_POLICY = os.environ.get("COMPUTER_USE_SCREENSHOT_POLICY")
+# Set to 1 to send screenshots at a lower quality when the budget, the rate of
+# screen changes and the last action allow it
+SCREENSHOT_GOVERNOR = os.environ.get("COMPUTER_USE_SCREENSHOT_GOVERNOR") == "1"
 
 # XGA resolution (using halved values since screenshots double the resolution)
 SCREEN_WIDTH = 1024 // 2
@@ -38,15 +75,23 @@ def on_new_message_callback(message: dict):
     LOGGER.info(f"Received message: {msg_copy}")
 
 
-def main():
-    chrome_options = Options()
-    arg = f"--window-size={SCREEN_WIDTH},{SCREEN_HEIGHT + CHROME_HEADER}"
-    chrome_options.add_argument(arg)
-    chrome_options.add_argument("--headless")
-    service = Service(ChromeDriverManager().install())
-    driver = webdriver.Chrome(service=service, options=chrome_options)
-    anthropic_client = AnthropicBedrock()
+def parse_screenshot_policy(value: str) -> dict[str, str]:
+    """Parse COMPUTER_USE_SCREENSHOT_POLICY into ComputerTool's screenshot_policy."""
+    policy = {}
+    for entry in value.split(","):
+        action, separator, name = (part.strip() for part in entry.partition("="))
+        if not (action and separator and name):
+            raise ValueError(
+                f"Invalid entry {entry!r} in COMPUTER_USE_SCREENSHOT_POLICY, "
+                "expected action=policy, such as mouse_move=always"
+            )
+        policy[action] = name
+    return policy
 
+
+def start_executor(driver_path: str, options) -> GuacamoleExecutor:
+    """Launch a browser on the Guacamole URL and connect an executor to it."""
+    driver = webdriver.Chrome(service=Service(driver_path), options=options)
     try:
         # Navigate to the URL
         driver.get(GUAC_URL)
@@ -54,24 +99,124 @@ def main():
         # Wait for initial page load
         time.sleep(10)
 
+        return GuacamoleExecutor(
+            driver,
+            paste_min_length=int(PASTE_MIN_LENGTH) if PASTE_MIN_LENGTH else None,
+            background_capture=BACKGROUND_CAPTURE,
+            capture_engine=CAPTURE_ENGINE,
+        )
+    except Exception:
+        driver.quit()
+        raise
+
+
+def stop_executor(executor: GuacamoleExecutor):
+    executor.close()
+    if executor.capturer is not None:
+        LOGGER.info(executor.capturer.stats.summary())
+    executor.driver.quit()
+
+
+def main():
+    options = chrome_options(
+        BROWSER_PROFILE,
+        window_width=SCREEN_WIDTH,
+        window_height=SCREEN_HEIGHT + CHROME_HEADER,
+    )
+    driver_path = ChromeDriverManager().install()
+    anthropic_client = AnthropicBedrock()
+    trajectory_cache = (
+        TrajectoryCache.load(REPLAY_CACHE_PATH) if REPLAY_CACHE_PATH else None
+    )
+    budget = RunBudget(
+        max_cost_usd=float(MAX_COST_USD) if MAX_COST_USD else None,
+        max_turns=int(MAX_TURNS) if MAX_TURNS else None,
+        max_wall_clock_s=float(MAX_MINUTES) * 60 if MAX_MINUTES else None,
+    )
+    usage = RunUsage()
+    screenshot_policy = (
+        parse_screenshot_policy(SCREENSHOT_POLICY) if SCREENSHOT_POLICY else None
+    )
+    governor = (
+        ScreenshotGovernor(budget=budget, usage=usage) if SCREENSHOT_GOVERNOR else None
+    )
+    screenshot_deduplicator = ScreenshotDeduplicator()
+    frame_archive = FrameArchive(FRAME_ARCHIVE_DIR) if FRAME_ARCHIVE_DIR else None
+
+    action_description = ACTION_DESCRIPTION
+    previous_messages = None
+    journal = None
+    if JOURNAL_DIR:
+        if os.path.exists(os.path.join(JOURNAL_DIR, MESSAGES_FILE)):
+            previous_messages = RunJournal.load_messages(
+                JOURNAL_DIR, only_n_most_recent_images=KEEP_IMAGES
+            )
+            action_description = (
+                "The previous session was interrupted. Take a screenshot and "
+                f"continue with the task: {ACTION_DESCRIPTION}"
+            )
+            LOGGER.info(f"Resuming from {len(previous_messages)} journaled messages")
+        journal = RunJournal(JOURNAL_DIR)
+
+    def restart_executor(executor: GuacamoleExecutor) -> GuacamoleExecutor:
+        # The old browser may be hung, so don't wait for it to shut down
+        threading.Thread(target=stop_executor, args=(executor,), daemon=True).start()
+        return start_executor(driver_path, options)
+
+    watchdog = None
+    try:
+        startup_started_at = time.monotonic()
+        watchdog = WatchdogExecutor(
+            start_executor(driver_path, options), restart=restart_executor
+        )
+        # The run's time and wall-clock budget start once the browser is ready
+        usage.started_at = time.monotonic()
+        LOGGER.info(f"Executor started in {usage.started_at - startup_started_at:.0f}s")
         toolbox = ToolBox(
             ComputerTool(
                 screen_width=SCREEN_WIDTH,
                 screen_height=SCREEN_HEIGHT,
-                executor=GuacamoleExecutor(driver),
+                executor=watchdog,
+                screenshot_policy=screenshot_policy,
+                governor=governor,
             )
         )
 
         perform_action(
             anthropic_client=anthropic_client,
             model=MODEL,
-            action_description=ACTION_DESCRIPTION,
+            action_description=action_description,
             toolbox=toolbox,
+            system_prompt_suffix=ZOOM_SYSTEM_PROMPT,
+            only_n_most_recent_images=KEEP_IMAGES,
             on_new_message_callback=on_new_message_callback,
+            trajectory_cache=trajectory_cache,
+            budget=budget,
+            usage=usage,
+            previous_messages=previous_messages,
+            journal=journal,
+            screenshot_deduplicator=screenshot_deduplicator,
+            frame_archive=frame_archive,
         )
 
     finally:
-        driver.quit()
+        if watchdog is not None:
+            stop_executor(watchdog.executor)
+            LOGGER.info(watchdog.stats.summary())
+        if journal is not None:
+            journal.close()
+        if frame_archive is not None:
+            frame_archive.close()
+            LOGGER.info(frame_archive.stats.summary())
+        if usage.stop_reason is None:
+            # perform_action logs how the run ended, unless it raised
+            LOGGER.info(f"Run ended early: {usage.summary()}")
+        LOGGER.info(screenshot_deduplicator.stats.summary())
+        if governor is not None:
+            LOGGER.info(governor.stats.summary())
+        if trajectory_cache is not None:
+            trajectory_cache.save()
+            LOGGER.info(trajectory_cache.stats.summary())
 
 
 if __name__ == "__main__":